@@ -0,0 +1,106 @@
+"""Move mentor memory embeddings to a binary column
+
+Revision ID: a7d4c9e2b613
+Revises: f3a9d2c7b815
+Create Date: 2026-10-17 19:05:44.118230
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import context, op
+import numpy as np
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d4c9e2b613'
+down_revision: Union[str, Sequence[str], None] = 'f3a9d2c7b815'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+mentor_memories = sa.table(
+    'mentor_memories',
+    sa.column('id', sa.Integer),
+    sa.column('memory_value', sa.Text),
+    sa.column('embedding', sa.LargeBinary),
+    sa.column('embedding_dtype', sa.String),
+)
+
+
+def _batches(conn, *criteria):
+    """Rows matching `criteria` in id order, BATCH_SIZE at a time (keyset pagination)."""
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.select(
+                mentor_memories.c.id, mentor_memories.c.memory_value,
+                mentor_memories.c.embedding, mentor_memories.c.embedding_dtype
+            )
+            .where(mentor_memories.c.id > last_id, *criteria)
+            .order_by(mentor_memories.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _restore_json_embeddings(conn):
+    """Binary `embedding` -> JSON list inside memory_value (what the old code reads)."""
+    for rows in _batches(conn, mentor_memories.c.embedding.isnot(None)):
+        for row in rows:
+            try:
+                payload = json.loads(row.memory_value)
+            except (TypeError, ValueError):
+                continue
+            if row.embedding_dtype == 'int8':
+                scale = np.frombuffer(row.embedding, dtype=np.float32, count=1)[0]
+                vector = np.frombuffer(row.embedding, dtype=np.int8, offset=4) * scale
+            else:
+                vector = np.frombuffer(row.embedding, dtype=row.embedding_dtype or 'float32')
+            payload['embedding'] = vector.astype(np.float64).tolist()
+            conn.execute(
+                mentor_memories.update().where(mentor_memories.c.id == row.id)
+                .values(memory_value=json.dumps(payload))
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('mentor_memories', sa.Column('embedding', sa.LargeBinary(), nullable=True))
+    op.add_column('mentor_memories', sa.Column('embedding_dtype', sa.String(length=8), nullable=True))
+
+    if context.is_offline_mode():
+        # `alembic upgrade --sql` has no rows to convert: schema only
+        return
+
+    # JSON list inside memory_value -> float32 bytes in `embedding`
+    conn = op.get_bind()
+    for rows in _batches(conn, mentor_memories.c.memory_value.like('%"embedding"%')):
+        for row in rows:
+            try:
+                payload = json.loads(row.memory_value)
+            except (TypeError, ValueError):
+                continue
+            vector = payload.pop('embedding', None)
+            values = {'memory_value': json.dumps(payload)}
+            if vector:
+                values['embedding'] = np.asarray(vector, dtype=np.float32).tobytes()
+                values['embedding_dtype'] = 'float32'
+            conn.execute(
+                mentor_memories.update().where(mentor_memories.c.id == row.id).values(**values)
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not context.is_offline_mode():
+        _restore_json_embeddings(op.get_bind())
+
+    op.drop_column('mentor_memories', 'embedding_dtype')
+    op.drop_column('mentor_memories', 'embedding')
+
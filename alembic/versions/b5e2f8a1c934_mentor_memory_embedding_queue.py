@@ -0,0 +1,38 @@
+"""Track pending mentor memory embeddings
+
+Revision ID: b5e2f8a1c934
+Revises: a7d4c9e2b613
+Create Date: 2026-10-17 20:11:02.774519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e2f8a1c934'
+down_revision: Union[str, Sequence[str], None] = 'a7d4c9e2b613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('mentor_memories', sa.Column('embedding_status', sa.String(length=10), nullable=True))
+    op.add_column('mentor_memories', sa.Column(
+        'embedding_attempts', sa.Integer(), nullable=False, server_default='0'
+    ))
+    op.add_column('mentor_memories', sa.Column('embed_after', sa.DateTime(), nullable=True))
+    op.create_index(
+        op.f('ix_mentor_memories_embedding_status'), 'mentor_memories', ['embedding_status'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_mentor_memories_embedding_status'), table_name='mentor_memories')
+    op.drop_column('mentor_memories', 'embed_after')
+    op.drop_column('mentor_memories', 'embedding_attempts')
+    op.drop_column('mentor_memories', 'embedding_status')
@@ -0,0 +1,48 @@
+"""Add latest_risk projection table
+
+Revision ID: c3f1e8a2d4b7
+Revises: a294b06baf5d
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1e8a2d4b7'
+down_revision: Union[str, Sequence[str], None] = 'a294b06baf5d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('latest_risk',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('snapshot_id', sa.Integer(), nullable=True),
+    sa.Column('risk_score', sa.Integer(), nullable=False),
+    sa.Column('risk_level', sa.String(length=10), nullable=True),
+    sa.Column('recorded_at', sa.DateTime(), nullable=True),
+    sa.Column('company', sa.String(length=100), nullable=True),
+    sa.Column('region', sa.String(length=50), nullable=True),
+    sa.Column('organization', sa.String(length=100), nullable=True),
+    sa.Column('team', sa.String(length=100), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_latest_risk_team', 'latest_risk', ['team'], unique=False)
+    op.create_index('ix_latest_risk_org_team', 'latest_risk', ['organization', 'team'], unique=False)
+    op.create_index('ix_latest_risk_company_region', 'latest_risk', ['company', 'region'], unique=False)
+    # Populate with: python -m app.jobs.backfill_latest_risk
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_latest_risk_company_region', table_name='latest_risk')
+    op.drop_index('ix_latest_risk_org_team', table_name='latest_risk')
+    op.drop_index('ix_latest_risk_team', table_name='latest_risk')
+    op.drop_table('latest_risk')
@@ -0,0 +1,40 @@
+"""De-duplicate mentor memories
+
+Revision ID: c8e1a4f6d327
+Revises: b5e2f8a1c934
+Create Date: 2026-10-17 22:04:51.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e1a4f6d327'
+down_revision: Union[str, Sequence[str], None] = 'b5e2f8a1c934'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # content_hash of existing rows is filled in by app.jobs.compact_memories,
+    # in batches, rather than in this migration
+    op.add_column('mentor_memories', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('mentor_memories', sa.Column(
+        'repeat_count', sa.Integer(), nullable=False, server_default='1'
+    ))
+    op.add_column('mentor_memories', sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+    op.create_index(
+        'ix_mentor_memories_user_hash', 'mentor_memories', ['user_id', 'content_hash'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_mentor_memories_user_hash', table_name='mentor_memories')
+    op.drop_column('mentor_memories', 'last_seen_at')
+    op.drop_column('mentor_memories', 'repeat_count')
+    op.drop_column('mentor_memories', 'content_hash')
@@ -0,0 +1,36 @@
+"""Add job_checkpoints table
+
+Revision ID: d52a7c9e1f03
+Revises: c3f1e8a2d4b7
+Create Date: 2026-10-17 14:40:12.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd52a7c9e1f03'
+down_revision: Union[str, Sequence[str], None] = 'c3f1e8a2d4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('job_checkpoints',
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('cursor', sa.Integer(), nullable=False),
+    sa.Column('processed', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('job_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('job_checkpoints')
@@ -0,0 +1,43 @@
+"""Add github_repo_states table
+
+Revision ID: e8f14b6a9c20
+Revises: d52a7c9e1f03
+Create Date: 2026-10-17 16:05:41.902117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8f14b6a9c20'
+down_revision: Union[str, Sequence[str], None] = 'd52a7c9e1f03'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('github_repo_states',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('repo_full_name', sa.String(length=255), nullable=False),
+    sa.Column('pushed_at', sa.String(length=30), nullable=True),
+    sa.Column('languages', sa.JSON(), nullable=True),
+    sa.Column('frameworks', sa.JSON(), nullable=True),
+    sa.Column('deps_pushed_at', sa.String(length=30), nullable=True),
+    sa.Column('dependency_skills', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'repo_full_name', name='uq_github_repo_state_user_repo')
+    )
+    op.create_index(op.f('ix_github_repo_states_user_id'), 'github_repo_states', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_github_repo_states_user_id'), table_name='github_repo_states')
+    op.drop_table('github_repo_states')
@@ -0,0 +1,57 @@
+"""Add harvest_jobs queue table
+
+Revision ID: f3a9d2c7b815
+Revises: e8f14b6a9c20
+Create Date: 2026-10-17 17:22:08.534901
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9d2c7b815'
+down_revision: Union[str, Sequence[str], None] = 'e8f14b6a9c20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('harvest_jobs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=50), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('dedupe_key', sa.String(length=150), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_after', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_harvest_jobs_user_id'), 'harvest_jobs', ['user_id'], unique=False)
+    op.create_index('ix_harvest_jobs_claim', 'harvest_jobs', ['status', 'priority', 'run_after'], unique=False)
+    op.create_index(
+        'uq_harvest_jobs_queued_dedupe', 'harvest_jobs', ['dedupe_key'], unique=True,
+        postgresql_where=sa.text("status = 'queued'"),
+        sqlite_where=sa.text("status = 'queued'")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_harvest_jobs_queued_dedupe', table_name='harvest_jobs')
+    op.drop_index('ix_harvest_jobs_claim', table_name='harvest_jobs')
+    op.drop_index(op.f('ix_harvest_jobs_user_id'), table_name='harvest_jobs')
+    op.drop_table('harvest_jobs')
@@ -82,6 +82,118 @@ class Settings(BaseSettings):
     # Monitoring (Sentry)
     SENTRY_DSN: Optional[str] = None
 
+    # Performance
+    # Worker threads shared by all concurrent CareerEngine.analyze stages
+    ANALYZE_STAGE_WORKERS: int = 4
+    # Max age of an in-memory cohort percentile array before a full reload
+    # (covers writes made by other processes)
+    PERCENTILE_INDEX_TTL_SECONDS: int = 300
+    # Same, for the per-team aggregates behind the team health metrics
+    TEAM_AGGREGATE_TTL_SECONDS: int = 300
+    # TensorFlow/SHAP/MLflow are imported on first use. Enable to import them
+    # in a background thread after startup instead (more idle RSS per worker,
+    # no first-request import latency)
+    ML_WARMUP_ENABLED: bool = False
+    ML_WARMUP_DELAY_SECONDS: float = 10.0
+    # Shared outbound HTTP pool (app/core/http_client.py)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    # Requires the optional `h2` package; falls back to HTTP/1.1 without it
+    HTTP2_ENABLED: bool = False
+    HTTP_TIMEOUT_SECONDS: float = 10.0
+    # Per-host overrides of HTTP_TIMEOUT_SECONDS
+    HTTP_HOST_TIMEOUTS: dict = {
+        "api.github.com": 15.0,
+        "raw.githubusercontent.com": 30.0,
+        "api.linkedin.com": 10.0
+    }
+    # Conditional-request (ETag) cache for GitHub API GETs (app/services/github_cache.py)
+    GITHUB_CACHE_ENABLED: bool = True
+    GITHUB_CACHE_PATH: str = "github_cache.db"
+    GITHUB_CACHE_MAX_ENTRIES: int = 20000
+    GITHUB_CACHE_MAX_BYTES: int = 100 * 1024 * 1024
+    # Harvest scheduler (app/services/harvest_scheduler.py): concurrent requests
+    # per (token, host) while the rate-limit budget is healthy
+    HARVEST_MAX_CONCURRENCY_PER_HOST: int = 8
+    HARVEST_MAX_RETRIES: int = 3
+    # Share of X-RateLimit-Limit kept for interactive requests: background
+    # harvests wait for the reset once fewer calls than this are left. The
+    # header counts every process's calls on the token, so the workers back
+    # off before the app's interactive calls run dry.
+    HARVEST_BACKGROUND_RESERVE: float = 0.1
+    # GitHub harvest backend: "rest" (per-repo calls) or "graphql" (repos,
+    # languages and dependency files in one paginated query)
+    GITHUB_HARVEST_BACKEND: str = "rest"
+    GITHUB_GRAPHQL_MAX_REPOS: int = 20
+    GITHUB_GRAPHQL_PAGE_SIZE: int = 50
+    # Dependency manifests are parsed while streaming and abandoned past this
+    # size (app/services/manifest_parsers.py)
+    DEPENDENCY_MANIFEST_MAX_BYTES: int = 512 * 1024
+    # Harvest job queue (app/services/job_queue.py) and its worker
+    # (python -m app.jobs.harvest_worker)
+    HARVEST_WORKER_CONCURRENCY: int = 4
+    # Without a dedicated worker process the app consumes the queue itself;
+    # set False where `python -m app.jobs.harvest_worker` runs (start.sh,
+    # docker-compose), so queued jobs always have a consumer
+    HARVEST_WORKER_EMBEDDED: bool = True
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_BACKOFF_BASE_SECONDS: float = 30.0
+    JOB_BACKOFF_MAX_SECONDS: float = 3600.0
+    # A running job not finished within this is assumed lost and re-queued
+    JOB_LEASE_SECONDS: int = 900
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    # Rolling re-harvest of every GitHub-connected user (app/services/fleet_refresh.py),
+    # run by every harvest worker (embedded or dedicated). With N dedicated
+    # workers, give each FLEET_REHARVEST_SHARD 0..N-1 and FLEET_REHARVEST_SHARDS=N;
+    # 0 shards disables it. Idle users (no commits in 30 days) are refreshed
+    # IDLE_MULTIPLIER times less often
+    FLEET_REHARVEST_SHARD: int = 0
+    FLEET_REHARVEST_SHARDS: int = 1
+    FLEET_REHARVEST_INTERVAL_SECONDS: float = 24 * 3600.0
+    FLEET_REHARVEST_IDLE_MULTIPLIER: float = 7.0
+    FLEET_REHARVEST_CYCLE_SECONDS: float = 300.0
+    # Fleet-wide GitHub requests per hour left to re-harvests, and the average
+    # cost of one (mostly incremental) sync used to turn it into a job count
+    FLEET_REHARVEST_GITHUB_REQUESTS_PER_HOUR: int = 20000
+    FLEET_REHARVEST_REQUESTS_PER_SYNC: int = 8
+    # Concurrent sync_profile calls for one user share a single harvest; one
+    # that finished less than this ago is reused instead of re-harvesting
+    SYNC_PROFILE_FRESHNESS_SECONDS: float = 30.0
+    # Max wait for another worker's sync of the same user (advisory lock)
+    SYNC_PROFILE_LOCK_TIMEOUT_SECONDS: float = 120.0
+    # Per-user memory-mapped vector index behind MentorEngine.recall_semantic
+    # (app/services/vector_index.py); shared by all workers of a host
+    MENTOR_VECTOR_INDEX_DIR: str = "vector_index"
+    # Storage of new mentor memory embeddings: "float32" (exact), "float16"
+    # (half the size) or "int8" (quarter, per-vector scale)
+    MENTOR_EMBEDDING_DTYPE: str = "float32"
+    # Background embedder of mentor memories (app/services/memory_embedder.py),
+    # started with the app; `python -m app.jobs.embed_memories` drains it by hand
+    MENTOR_EMBEDDER_ENABLED: bool = True
+    MENTOR_EMBED_BATCH_SIZE: int = 64
+    MENTOR_EMBED_POLL_SECONDS: float = 5.0
+    MENTOR_EMBED_MAX_ATTEMPTS: int = 6
+    MENTOR_EMBED_BACKOFF_BASE_SECONDS: float = 30.0
+    MENTOR_EMBED_BACKOFF_MAX_SECONDS: float = 3600.0
+    # A claimed batch not saved within this is picked up again
+    MENTOR_EMBED_LEASE_SECONDS: float = 120.0
+    # Content-addressed embedding cache (app/services/embedding_cache.py):
+    # per-process LRU in front of a SQLite file shared by the workers
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "embedding_cache.db"
+    EMBEDDING_CACHE_MEMORY_ENTRIES: int = 2048
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 100000
+    EMBEDDING_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    # A mentor memory stored again (same user, category, key and content)
+    # within this window bumps repeat_count / last_seen_at of the existing row
+    # instead of inserting another one; 0 disables it
+    MENTOR_MEMORY_DEDUPE_WINDOW_SECONDS: int = 24 * 3600
+    # Compaction of the remaining repeats (python -m app.jobs.compact_memories):
+    # rows touched per transaction, and the pause between transactions
+    MENTOR_COMPACTION_BATCH_SIZE: int = 500
+    MENTOR_COMPACTION_PAUSE_SECONDS: float = 0.05
+
     # Feature Flags
     FEATURES: dict = {
         "ENABLE_CHATBOT": True,
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _HostStats:
+    __slots__ = ("requests", "connections_opened", "tls_handshakes")
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+        }
+
+
+class HTTPClientPool:
+    """
+    Process-wide httpx.AsyncClient shared by every outbound caller.
+
+    One connection pool (bounded by `max_connections`, idle sockets kept for
+    `keepalive_expiry`) means repeated calls to api.github.com,
+    raw.githubusercontent.com, LinkedIn etc. reuse warm TLS connections
+    instead of handshaking per harvest. Started/closed by the app lifespan;
+    scripts and jobs get a client lazily on first use.
+
+    Timeouts: `host_timeouts` overrides the default for matching hosts, unless
+    the caller passes an explicit `timeout=` on the request.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections: int = settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        http2: bool = settings.HTTP2_ENABLED,
+        timeout: float = settings.HTTP_TIMEOUT_SECONDS,
+        host_timeouts: Optional[Dict[str, float]] = None
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.http2 = http2 and self._h2_available()
+        self.timeout = httpx.Timeout(timeout)
+        host_timeouts = settings.HTTP_HOST_TIMEOUTS if host_timeouts is None else host_timeouts
+        self.host_timeouts = {
+            host: httpx.Timeout(seconds).as_dict() for host, seconds in host_timeouts.items()
+        }
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostStats] = defaultdict(_HostStats)
+        self.clients_created = 0
+
+    @staticmethod
+    def _h2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("[HTTPClient] HTTP2_ENABLED but the 'h2' package is missing; using HTTP/1.1")
+            return False
+        return True
+
+    # -----------------------------------------------------
+    # LIFECYCLE
+    # -----------------------------------------------------
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        The shared client. Connections belong to the event loop that opened
+        them, so a caller on a different loop (e.g. `asyncio.run` in a job)
+        gets a fresh pool instead of sockets from a dead loop.
+        """
+        loop = asyncio.get_running_loop()
+        client = self._client
+        if client is not None and not client.is_closed and self._loop is loop:
+            return client
+        with self._lock:
+            if self._client is None or self._client.is_closed or self._loop is not loop:
+                self._client = self._build()
+                self._loop = loop
+            return self._client
+
+    def _build(self) -> httpx.AsyncClient:
+        self.clients_created += 1
+        return httpx.AsyncClient(
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+            event_hooks={"request": [self._on_request]}
+        )
+
+    async def start(self):
+        """Opens the pool on the running loop (called from the app lifespan)."""
+        return self.client
+
+    async def aclose(self):
+        client, self._client, self._loop = self._client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    # -----------------------------------------------------
+    # HOOKS & STATS
+    # -----------------------------------------------------
+    async def _on_request(self, request: httpx.Request):
+        host = request.url.host
+        stats = self._hosts[host]
+        stats.requests += 1
+
+        override = self.host_timeouts.get(host)
+        if override is not None and request.extensions.get("timeout") == self.timeout.as_dict():
+            request.extensions["timeout"] = override
+
+        async def trace(event_name: str, info: dict):
+            # httpcore emits these only when a new connection is opened
+            if event_name == "connection.connect_tcp.complete":
+                stats.connections_opened += 1
+            elif event_name == "connection.start_tls.complete":
+                stats.tls_handshakes += 1
+
+        request.extensions["trace"] = trace
+
+    def stats(self) -> Dict:
+        hosts = {host: entry.as_dict() for host, entry in list(self._hosts.items())}
+        requests = sum(h["requests"] for h in hosts.values())
+        opened = sum(h["connections_opened"] for h in hosts.values())
+
+        pool = {"open": 0, "idle": 0}
+        client = self._client
+        # httpcore keeps the live connections on the transport's pool
+        connections = getattr(getattr(getattr(client, "_transport", None), "_pool", None), "connections", None)
+        if connections is not None:
+            pool["open"] = len(connections)
+            pool["idle"] = sum(1 for c in connections if c.is_idle())
+
+        return {
+            "started": client is not None and not client.is_closed,
+            "http2": self.http2,
+            "limits": {
+                "max_connections": self.limits.max_connections,
+                "max_keepalive_connections": self.limits.max_keepalive_connections,
+                "keepalive_expiry": self.limits.keepalive_expiry,
+            },
+            "requests": requests,
+            "connections_opened": opened,
+            "reuse_ratio": round(1 - opened / requests, 3) if requests else None,
+            "pool": pool,
+            "clients_created": self.clients_created,
+            "hosts": hosts,
+        }
+
+    def reset_stats(self):
+        self._hosts.clear()
+
+
+# Singleton Instance
+http_pool = HTTPClientPool()
@@ -0,0 +1,208 @@
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A single step of a pipeline.
+
+    `fn` is called as `fn(db, **inputs)`, where `inputs` holds the outputs of the
+    stages (or seed values) listed in `requires`. `after` only orders the stage
+    behind others whose side effects it depends on (e.g. DB writes).
+    Isolated stages are read-only: they run on the worker pool, each with its
+    own Session, concurrently with everything else that is ready.
+    """
+    name: str
+    fn: Callable[..., Any]
+    requires: Tuple[str, ...] = ()
+    isolated: bool = False
+    after: Tuple[str, ...] = ()
+
+    @property
+    def dependencies(self) -> Tuple[str, ...]:
+        return self.requires + self.after
+
+
+@dataclass
+class StageRun:
+    """Outputs of a graph execution plus per-stage wall time (milliseconds)."""
+    results: Dict[str, Any]
+    timings: Dict[str, float] = field(default_factory=dict)
+    total_ms: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Rebind:
+    """Placeholder for an ORM instance that must be re-loaded in a stage session."""
+    model: type
+    identity: Tuple[Any, ...]
+
+
+class StageGraph:
+    """
+    Executes a set of declared stages respecting their data dependencies.
+
+    Non-isolated stages run in declaration order on the caller's thread and
+    share the caller's Session (they may write and commit). Isolated stages are
+    submitted to a thread pool as soon as their inputs are available, so the
+    latency of a run is bounded by its slowest branch rather than the sum of
+    all stages.
+
+    When the caller's Session cannot be safely forked (in-memory SQLite, mocks),
+    isolated stages transparently fall back to inline execution.
+    """
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = Lock()
+
+    def __init__(self, stages: Iterable[Stage], max_workers: int = 4):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage name: {stage.name}")
+            self.stages[stage.name] = stage
+        self.max_workers = max_workers
+
+    # -----------------------------------------------------
+    # EXECUTION
+    # -----------------------------------------------------
+    def run(self, db: Session, seeds: Dict[str, Any]) -> StageRun:
+        started = time.perf_counter()
+        run = StageRun(results=dict(seeds))
+        pending = dict(self.stages)
+        in_flight: Dict[Future, Stage] = {}
+        bind = self._isolation_bind(db)
+
+        try:
+            while pending or in_flight:
+                ready = [
+                    s for s in pending.values()
+                    if all(dep in run.results for dep in s.dependencies)
+                ]
+
+                # 1. Fan out every isolated stage that became ready
+                if bind is not None:
+                    for stage in [s for s in ready if s.isolated]:
+                        del pending[stage.name]
+                        inputs = self._detach_inputs(stage, run.results)
+                        future = self._get_executor().submit(
+                            self._run_isolated, bind, stage, inputs
+                        )
+                        in_flight[future] = stage
+
+                # 2. Run the next inline stage on the caller's thread
+                inline = next(
+                    (s for s in ready if s.name in pending),
+                    None
+                )
+                if inline is not None:
+                    del pending[inline.name]
+                    inputs = {dep: run.results[dep] for dep in inline.requires}
+                    value, elapsed = self._timed(inline, db, inputs)
+                    run.results[inline.name] = value
+                    run.timings[inline.name] = elapsed
+                    self._collect(in_flight, run, block=False)
+                    continue
+
+                if in_flight:
+                    self._collect(in_flight, run, block=True)
+                elif pending:
+                    missing = {
+                        s.name: [d for d in s.dependencies if d not in run.results]
+                        for s in pending.values()
+                    }
+                    raise ValueError(f"Unresolvable stage dependencies: {missing}")
+        finally:
+            # After a failure, do not start stages that are still queued
+            for future in in_flight:
+                future.cancel()
+
+        run.total_ms = (time.perf_counter() - started) * 1000
+        logger.debug(
+            "[StageGraph] total=%.1fms stages=%s",
+            run.total_ms,
+            {k: round(v, 1) for k, v in run.timings.items()}
+        )
+        return run
+
+    # -----------------------------------------------------
+    # INTERNAL HELPERS
+    # -----------------------------------------------------
+    @staticmethod
+    def _timed(stage: Stage, db, inputs: Dict[str, Any]) -> Tuple[Any, float]:
+        t0 = time.perf_counter()
+        value = stage.fn(db, **inputs)
+        return value, (time.perf_counter() - t0) * 1000
+
+    @classmethod
+    def _run_isolated(cls, bind, stage: Stage, inputs: Dict[str, Any]) -> Tuple[Any, float]:
+        with Session(bind=bind, autoflush=False) as session:
+            local_inputs = {
+                k: session.get(v.model, v.identity) if isinstance(v, _Rebind) else v
+                for k, v in inputs.items()
+            }
+            return cls._timed(stage, session, local_inputs)
+
+    @staticmethod
+    def _collect(in_flight: Dict[Future, Stage], run: StageRun, block: bool):
+        if not in_flight:
+            return
+        done, _ = wait(list(in_flight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for future in done:
+            stage = in_flight.pop(future)
+            value, elapsed = future.result()
+            run.results[stage.name] = value
+            run.timings[stage.name] = elapsed
+
+    @staticmethod
+    def _detach_inputs(stage: Stage, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        ORM instances belong to the caller's Session and must not cross threads.
+        They are replaced by their identity and re-loaded in the stage session.
+        """
+        inputs = {}
+        for dep in stage.requires:
+            value = results[dep]
+            state = inspect(value, raiseerr=False)
+            if state is not None and getattr(state, "identity", None) is not None:
+                value = _Rebind(type(value), state.identity)
+            inputs[dep] = value
+        return inputs
+
+    @staticmethod
+    def _isolation_bind(db):
+        """Returns the Engine isolated stages may connect to, or None to run inline."""
+        if not isinstance(db, Session):
+            return None
+        try:
+            bind = db.get_bind()
+        except Exception:
+            return None
+
+        url = getattr(bind, "url", None)
+        if url is None:
+            return None
+        # Every connection to an in-memory SQLite database sees a different database
+        if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+            return None
+        return bind
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # One process-wide pool: bounds the extra DB connections under load
+        with StageGraph._executor_lock:
+            if StageGraph._executor is None:
+                StageGraph._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="stage-graph"
+                )
+            return StageGraph._executor
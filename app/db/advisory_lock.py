@@ -0,0 +1,69 @@
+import asyncio
+import hashlib
+import logging
+import time
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from app.db.session import engine as default_engine
+
+logger = logging.getLogger(__name__)
+
+
+def lock_id(name: str) -> int:
+    """Stable signed 64-bit id for a lock name (pg_advisory_lock takes a bigint)."""
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big", signed=True)
+
+
+@asynccontextmanager
+async def advisory_lock(
+    name: str,
+    timeout: float = 60.0,
+    poll_interval: float = 0.25,
+    engine: Engine = default_engine
+):
+    """
+    Cross-process mutex on a Postgres session-level advisory lock.
+
+    Waits (without blocking the event loop) up to `timeout` seconds, then
+    yields False and runs unlocked rather than failing the caller. Yields
+    True while held. Other databases (SQLite in dev/tests) have no advisory
+    locks: yields False immediately, in-process coordination still applies.
+    """
+    if engine.dialect.name != "postgresql":
+        yield False
+        return
+
+    key = lock_id(name)
+    conn = await asyncio.to_thread(engine.connect)
+    acquired = False
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            acquired = await asyncio.to_thread(_try_lock, conn, key)
+            if acquired or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(poll_interval)
+        if not acquired:
+            logger.warning(f"[AdvisoryLock] timed out after {timeout}s waiting for {name!r}; running unlocked")
+        yield acquired
+    finally:
+        await asyncio.to_thread(_release, conn, key, acquired)
+
+
+def _try_lock(conn: Connection, key: int) -> bool:
+    acquired = bool(conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": key}).scalar())
+    conn.commit()
+    return acquired
+
+
+def _release(conn: Connection, key: int, acquired: bool):
+    try:
+        if acquired:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": key})
+            conn.commit()
+    finally:
+        conn.close()
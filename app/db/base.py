@@ -16,3 +16,10 @@ from app.db.models.mentor import MentorMemory
 
 # --- ADICIONE ESTA LINHA ---
 from app.db.models.analytics import RiskSnapshot
+from app.db.models.latest_risk import LatestRisk
+from app.db.models.job_checkpoint import JobCheckpoint
+from app.db.models.github_repo_state import GitHubRepoState
+from app.db.models.harvest_job import HarvestJob
+
+# Listeners que mantêm a projeção latest_risk
+import app.services.latest_risk  # noqa: F401
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, UniqueConstraint
+from datetime import datetime
+
+from app.db.base_class import Base
+
+class GitHubRepoState(Base):
+    """
+    Last harvested evidence of one GitHub repository of a user.
+
+    `pushed_at` / `deps_pushed_at` are the repo's GitHub `pushed_at` when the
+    stored languages/frameworks and dependency skills were computed. A sync
+    only refetches repos whose current `pushed_at` differs; the rest are
+    merged from here.
+    """
+    __tablename__ = "github_repo_states"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    repo_full_name = Column(String(255), nullable=False)
+
+    # --- SocialHarvester._harvest_github_raw ---
+    pushed_at = Column(String(30), nullable=True)       # ISO 8601, ex: "2026-05-01T12:00:00Z"
+    languages = Column(JSON, nullable=True)             # {"Python": 12345}
+    frameworks = Column(JSON, nullable=True)            # ["fastapi", "react"]
+
+    # --- SocialHarvester.scan_user_dependencies ---
+    deps_pushed_at = Column(String(30), nullable=True)
+    dependency_skills = Column(JSON, nullable=True)     # ["Fastapi", "Next.js"]
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "repo_full_name", name="uq_github_repo_state_user_repo"),
+    )
@@ -0,0 +1,46 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index, text
+from datetime import datetime
+
+from app.db.base_class import Base
+
+class HarvestJob(Base):
+    """
+    Durable background job (GitHub / LinkedIn harvest), processed by
+    app.jobs.harvest_worker outside the web workers.
+
+    At most one *queued* job exists per dedupe_key (ex: "github_sync:42"):
+    re-triggering a harvest that is still waiting reuses that row.
+    Tokens are never stored here; the worker reads them from the User row.
+    """
+    __tablename__ = "harvest_jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)            # github_sync | linkedin_sync
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    dedupe_key = Column(String(150), nullable=False)
+    payload = Column(JSON, nullable=True)
+
+    status = Column(String(20), nullable=False, default="queued")  # queued | running | done | failed
+    priority = Column(Integer, nullable=False, default=10)          # menor = primeiro
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)  # backoff
+    last_error = Column(Text, nullable=True)
+
+    locked_by = Column(String(100), nullable=True)       # worker id (host:pid)
+    locked_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Claim order: queued jobs that are due, by priority
+        Index("ix_harvest_jobs_claim", "status", "priority", "run_after"),
+        # Per-user de-duplication of pending work
+        Index(
+            "uq_harvest_jobs_queued_dedupe", "dedupe_key", unique=True,
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'")
+        ),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.db.base_class import Base
+
+class JobCheckpoint(Base):
+    """
+    Progress cursor of a resumable batch job (one row per job name).
+    Updated in the same transaction as the chunk it covers, so a crashed run
+    resumes right after the last committed chunk.
+    """
+    __tablename__ = "job_checkpoints"
+
+    job_name = Column(String(100), primary_key=True)
+
+    cursor = Column(Integer, nullable=False, default=0)     # Ex: último user_id processado
+    processed = Column(Integer, nullable=False, default=0)  # Itens processados no run atual
+    status = Column(String(20), nullable=False, default="running")  # running | done
+
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
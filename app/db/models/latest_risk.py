@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from datetime import datetime
+
+from app.db.base_class import Base
+
+class LatestRisk(Base):
+    """
+    Materialized projection: the most recent RiskSnapshot of each user,
+    denormalized with the profile's cohort columns.
+
+    Maintained by app.services.latest_risk on every snapshot insert and
+    profile update; rebuilt from history by app.jobs.backfill_latest_risk.
+    Team/cohort analytics read O(members) rows here instead of O(history).
+    """
+    __tablename__ = "latest_risk"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+
+    # --- Latest Snapshot ---
+    snapshot_id = Column(Integer, nullable=True)
+    risk_score = Column(Integer, nullable=False)
+    risk_level = Column(String(10))
+    recorded_at = Column(DateTime, nullable=True)
+
+    # --- Cohort (copied from CareerProfile) ---
+    company = Column(String(100), nullable=True)
+    region = Column(String(50), nullable=True)
+    organization = Column(String(100), nullable=True)
+    team = Column(String(100), nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_latest_risk_team", "team"),
+        Index("ix_latest_risk_org_team", "organization", "team"),
+        Index("ix_latest_risk_company_region", "company", "region"),
+    )
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, LargeBinary, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 
+# MentorMemory.embedding_status (NULL: embedded, or nothing to embed)
+EMBEDDING_PENDING = "pending"
+EMBEDDING_FAILED = "failed"
+
 class MentorMemory(Base):
     __tablename__ = "mentor_memories"
 
@@ -12,7 +16,23 @@ class MentorMemory(Base):
     # Campos da memória
     context_key = Column(String, index=True) # Ex: "preferencia_ensino"
     memory_value = Column(Text)              # Ex: "Visual, gosta de diagramas"
+    # Embedding binário (app/services/embedding_codec.py): float32, float16 ou int8
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_dtype = Column(String(8), nullable=True)
+    # Preenchido fora do request pelo app/services/memory_embedder.py
+    embedding_status = Column(String(10), nullable=True, index=True)
+    embedding_attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    embed_after = Column(DateTime, nullable=True)       # próxima tentativa / fim do lease
+    # De-duplicação (app/services/memory_compaction.py): sha256 de
+    # (categoria, chave, conteúdo), quantas vezes foi vista e quando por último
+    content_hash = Column(String(64), nullable=True)
+    repeat_count = Column(Integer, nullable=False, default=1, server_default="1")
+    last_seen_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relacionamento Reverso (Caminho completo para segurança)
     user = relationship("app.db.models.user.User", back_populates="mentor_memories")
+
+    __table_args__ = (
+        Index("ix_mentor_memories_user_hash", "user_id", "content_hash"),
+    )
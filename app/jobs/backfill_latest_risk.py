@@ -0,0 +1,20 @@
+import logging
+
+from app.db.session import SessionLocal
+from app.services.latest_risk import rebuild_latest_risk
+
+logger = logging.getLogger(__name__)
+
+def backfill_latest_risk(batch_size=500):
+    db = SessionLocal()
+    try:
+        written = rebuild_latest_risk(db, batch_size=batch_size)
+        logger.info(f"[LatestRisk] backfill done: {written} users")
+        return written
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(f"latest_risk rows written: {backfill_latest_risk()}")
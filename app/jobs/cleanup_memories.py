@@ -1,13 +1,54 @@
+import argparse
+import logging
+import time
 from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_
+
+import app.db.base  # noqa: F401  (registers every model for the standalone process)
+from app.core.config import settings
 from app.db.session import SessionLocal
-from app.db.models.mentor_memory import MentorMemory
+from app.db.models.mentor import MentorMemory
+
+logger = logging.getLogger(__name__)
 
-def cleanup_old_memories(days=180):
-    db = SessionLocal()
+
+def cleanup_old_memories(
+    days=180,
+    batch_size=settings.MENTOR_COMPACTION_BATCH_SIZE,
+    pause_seconds=settings.MENTOR_COMPACTION_PAUSE_SECONDS,
+    session_factory=SessionLocal
+):
+    """Deletes memories not seen for `days`, `batch_size` rows per transaction."""
     cutoff = datetime.utcnow() - timedelta(days=days)
+    # A compacted memory that keeps repeating is as old as its last_seen_at
+    stale = or_(
+        MentorMemory.last_seen_at < cutoff,
+        and_(MentorMemory.last_seen_at.is_(None), MentorMemory.created_at < cutoff)
+    )
+
+    deleted = 0
+    while True:
+        with session_factory() as db:
+            ids = [
+                memory_id for (memory_id,) in
+                db.query(MentorMemory.id).filter(stale).order_by(MentorMemory.id).limit(batch_size)
+            ]
+            if ids:
+                db.query(MentorMemory).filter(MentorMemory.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+        deleted += len(ids)
+        if len(ids) < batch_size:
+            logger.info(f"[MentorMemory] {deleted} memories older than {days} days deleted")
+            return deleted
+        if pause_seconds > 0:
+            time.sleep(pause_seconds)
 
-    db.query(MentorMemory)\
-      .filter(MentorMemory.created_at < cutoff)\
-      .delete()
 
-    db.commit()
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Delete mentor memories not seen for a number of days")
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--batch-size", type=int, default=settings.MENTOR_COMPACTION_BATCH_SIZE)
+    args = parser.parse_args()
+    print(cleanup_old_memories(days=args.days, batch_size=args.batch_size))
@@ -0,0 +1,24 @@
+import argparse
+import logging
+
+import app.db.base  # noqa: F401  (registers every model for the standalone process)
+from app.core.config import settings
+from app.services.memory_compaction import MemoryCompactor
+
+logger = logging.getLogger(__name__)
+
+
+def compact_memories(
+    batch_size=settings.MENTOR_COMPACTION_BATCH_SIZE,
+    pause_seconds=settings.MENTOR_COMPACTION_PAUSE_SECONDS
+):
+    return MemoryCompactor(batch_size=batch_size, pause_seconds=pause_seconds).run()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Collapse repeated mentor memories into one row each")
+    parser.add_argument("--batch-size", type=int, default=settings.MENTOR_COMPACTION_BATCH_SIZE)
+    parser.add_argument("--pause", type=float, default=settings.MENTOR_COMPACTION_PAUSE_SECONDS)
+    args = parser.parse_args()
+    print(compact_memories(batch_size=args.batch_size, pause_seconds=args.pause))
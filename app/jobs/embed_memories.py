@@ -0,0 +1,22 @@
+import argparse
+import logging
+
+import app.db.base  # noqa: F401  (registers every model for the standalone process)
+from app.core.config import settings
+from app.services.memory_embedder import MemoryEmbedder
+
+logger = logging.getLogger(__name__)
+
+
+def embed_pending_memories(batch_size=settings.MENTOR_EMBED_BATCH_SIZE):
+    attempted = MemoryEmbedder(batch_size=batch_size).drain()
+    logger.info(f"[MemoryEmbedder] attempted {attempted} memories")
+    return attempted
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Embed every due pending mentor memory and exit")
+    parser.add_argument("--batch-size", type=int, default=settings.MENTOR_EMBED_BATCH_SIZE)
+    args = parser.parse_args()
+    print(embed_pending_memories(batch_size=args.batch_size))
@@ -0,0 +1,204 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.http_client import http_pool
+import app.db.base  # noqa: F401  (registers every model for the standalone process)
+from app.db.models.harvest_job import HarvestJob
+from app.db.models.user import User
+from app.db.session import SessionLocal
+from app.services.fleet_refresh import fleet_refresher
+from app.services.harvest_scheduler import harvest_priority, PRIORITY_BACKGROUND
+from app.services.job_queue import job_queue, JobQueue, GITHUB_SYNC, LINKEDIN_SYNC
+from app.services.social_harvester import social_harvester
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[int, str], Awaitable[bool]]
+
+
+async def _github_sync(user_id: int, token: str) -> bool:
+    # Queued work: queues behind this process's interactive harvests and,
+    # in any process, leaves the token's background reserve to them
+    with harvest_priority(PRIORITY_BACKGROUND):
+        return await social_harvester.sync_profile(user_id, token)
+
+
+async def _linkedin_sync(user_id: int, token: str) -> bool:
+    return await social_harvester.harvest_linkedin_data(user_id, token)
+
+
+# kind -> (User column holding the OAuth token, handler)
+HANDLERS: Dict[str, Tuple[str, Handler]] = {
+    GITHUB_SYNC: ("github_token", _github_sync),
+    LINKEDIN_SYNC: ("linkedin_token", _linkedin_sync),
+}
+
+
+class HarvestWorker:
+    """
+    Runs queued harvest jobs, at most `concurrency` at a time.
+
+    Tokens are read from the User row when the job starts (never stored in
+    the queue), so a reconnect between enqueue and run uses the new token.
+    A handler returning False or raising is retried by the queue with backoff.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue = job_queue,
+        concurrency: int = settings.HARVEST_WORKER_CONCURRENCY,
+        poll_interval: float = settings.JOB_POLL_INTERVAL_SECONDS,
+        handlers: Optional[Dict[str, Tuple[str, Handler]]] = None,
+        session_factory=SessionLocal
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.handlers = handlers if handlers is not None else HANDLERS
+        self.session_factory = session_factory
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run_once(self) -> int:
+        """Claims up to `concurrency` due jobs and runs them. Returns how many ran."""
+        jobs = await asyncio.to_thread(self._claim_sync, self.concurrency)
+        await asyncio.gather(*(self._execute(job) for job in jobs))
+        return len(jobs)
+
+    async def run(self, stop: Optional[asyncio.Event] = None):
+        """Polls the queue until `stop` is set, then drains the running jobs."""
+        stop = stop or asyncio.Event()
+        running: Set[asyncio.Task] = set()
+        logger.info(f"[HarvestWorker] {self.worker_id} started (concurrency={self.concurrency})")
+
+        while not stop.is_set():
+            free = self.concurrency - len(running)
+            jobs = await asyncio.to_thread(self._claim_sync, free) if free > 0 else []
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                running.add(task)
+                task.add_done_callback(running.discard)
+
+            if not jobs:
+                # Idle or full: wake on the next finished job, new poll or stop
+                waiters = set(running) | {asyncio.ensure_future(stop.wait())}
+                done, pending = await asyncio.wait(
+                    waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                for fut in pending:
+                    if fut not in running:
+                        fut.cancel()
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        logger.info(f"[HarvestWorker] {self.worker_id} stopped")
+
+    # -----------------------------------------------------
+    # JOB EXECUTION
+    # -----------------------------------------------------
+    async def _execute(self, job: Dict):
+        job_id, kind, user_id = job["id"], job["kind"], job["user_id"]
+        entry = self.handlers.get(kind)
+        if entry is None:
+            await asyncio.to_thread(self._finish_sync, job_id, f"unknown job kind {kind!r}", False)
+            return
+
+        token_attr, handler = entry
+        token = await asyncio.to_thread(self._token_sync, user_id, token_attr)
+        if not token:
+            # Nothing to retry with until the user reconnects
+            await asyncio.to_thread(self._finish_sync, job_id, f"user has no {token_attr}", False)
+            return
+
+        error = None
+        try:
+            if not await handler(user_id, token):
+                error = "handler reported failure"
+        except Exception as e:
+            logger.exception(f"[HarvestWorker] job {job_id} ({kind}) crashed")
+            error = f"{type(e).__name__}: {e}"
+        await asyncio.to_thread(self._finish_sync, job_id, error, True)
+
+    def _claim_sync(self, limit: int) -> List[Dict]:
+        with self.session_factory() as db:
+            return [
+                {"id": job.id, "kind": job.kind, "user_id": job.user_id}
+                for job in self.queue.claim(db, self.worker_id, limit=limit)
+            ]
+
+    def _token_sync(self, user_id: int, token_attr: str) -> Optional[str]:
+        with self.session_factory() as db:
+            user = db.query(User).filter(User.id == user_id).first()
+            return getattr(user, token_attr, None) if user else None
+
+    def _finish_sync(self, job_id: int, error: Optional[str], retry: bool):
+        with self.session_factory() as db:
+            job = db.get(HarvestJob, job_id)
+            if job is None:
+                return
+            if error is None:
+                self.queue.complete(db, job)
+            else:
+                self.queue.fail(db, job, error, retry=retry)
+
+
+def _fleet_cycle_sync(shard: int, shards: int):
+    with SessionLocal() as db:
+        return fleet_refresher.run_cycle(db, shard, shards)
+
+
+async def serve(stop: asyncio.Event, concurrency: int = settings.HARVEST_WORKER_CONCURRENCY, shard: int = 0, shards: int = 0):
+    """Runs the worker (and the fleet re-harvest of `shard` when `shards`) until `stop` is set."""
+    worker = HarvestWorker(concurrency=concurrency)
+    if shards:
+        # This process also keeps its shard of the fleet fresh
+        refresher = asyncio.create_task(fleet_refresher.run(SessionLocal, shard, shards, stop))
+        await asyncio.gather(worker.run(stop), refresher)
+    else:
+        await worker.run(stop)
+
+
+async def main(concurrency: int, once: bool, shard: int = 0, shards: int = 0):
+    await http_pool.start()
+    try:
+        if once:
+            if shards:
+                await asyncio.to_thread(_fleet_cycle_sync, shard, shards)
+            ran = await HarvestWorker(concurrency=concurrency).run_once()
+            logger.info(f"[HarvestWorker] ran {ran} job(s)")
+            return
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except NotImplementedError:
+                pass
+        await serve(stop, concurrency, shard, shards)
+    finally:
+        await http_pool.aclose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Run queued GitHub/LinkedIn harvest jobs")
+    parser.add_argument("--concurrency", type=int, default=settings.HARVEST_WORKER_CONCURRENCY)
+    parser.add_argument("--once", action="store_true", help="run one batch of due jobs and exit")
+    parser.add_argument(
+        "--shard", type=int, default=settings.FLEET_REHARVEST_SHARD,
+        help="fleet re-harvest shard owned by this process"
+    )
+    parser.add_argument(
+        "--shards", type=int, default=settings.FLEET_REHARVEST_SHARDS,
+        help="number of fleet re-harvest shards (0 disables the fleet re-harvest)"
+    )
+    args = parser.parse_args()
+    if args.shards and not 0 <= args.shard < args.shards:
+        parser.error("--shard must be in [0, --shards)")
+    asyncio.run(main(concurrency=args.concurrency, once=args.once, shard=args.shard, shards=args.shards))
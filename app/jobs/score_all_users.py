@@ -0,0 +1,25 @@
+import argparse
+import logging
+
+from app.db.session import SessionLocal
+from app.services.batch_scoring import BatchRiskScorer
+
+logger = logging.getLogger(__name__)
+
+def score_all_users(chunk_size=1000, resume=True):
+    db = SessionLocal()
+    try:
+        stats = BatchRiskScorer(chunk_size=chunk_size).run(db, resume=resume)
+        logger.info(f"[BatchScoring] done: {stats}")
+        return stats
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Score career risk for every user in bulk")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--restart", action="store_true", help="ignore the saved checkpoint")
+    args = parser.parse_args()
+    print(score_all_users(chunk_size=args.chunk_size, resume=not args.restart))
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -70,6 +71,10 @@ from app.middleware.auth import AuthMiddleware
 from app.middleware.watchdog import WatchdogMiddleware
 from app.middleware.blocker import RouteBlockerMiddleware
 from app.ai.chatbot import chatbot_service
+from app.ml import backends as ml_backends
+from app.core.http_client import http_pool
+from app.services.memory_embedder import memory_embedder
+from app.jobs import harvest_worker
 # Worker removed
 
 # Importando suas rotas
@@ -104,7 +109,24 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.critical(f"CRITICAL OUTAGE: AI MODULE FAILURE. {e}")
 
-        # Worker Start removed
+        # Heavy ML backends: imported on first use, or warmed up off the event loop
+        if settings.ML_WARMUP_ENABLED:
+            ml_backends.warm_up(delay_seconds=settings.ML_WARMUP_DELAY_SECONDS)
+
+        # Shared outbound HTTP pool (keep-alive connections reused across requests)
+        await http_pool.start()
+
+        # Mentor memory embeddings are filled in off the request path
+        if settings.MENTOR_EMBEDDER_ENABLED:
+            embedder_stop = asyncio.Event()
+            embedder_task = asyncio.create_task(memory_embedder.run(embedder_stop))
+
+        # Harvest queue consumer, unless a dedicated worker process runs it
+        if settings.HARVEST_WORKER_EMBEDDED:
+            harvest_stop = asyncio.Event()
+            harvest_task = asyncio.create_task(harvest_worker.serve(
+                harvest_stop, shard=settings.FLEET_REHARVEST_SHARD, shards=settings.FLEET_REHARVEST_SHARDS
+            ))
 
 
     except Exception as e:
@@ -113,6 +135,13 @@ async def lifespan(app: FastAPI):
         raise e
     yield
     logger.info("Desligando...")
+    if settings.HARVEST_WORKER_EMBEDDED:
+        harvest_stop.set()
+        await asyncio.wait([harvest_task], timeout=10)
+    if settings.MENTOR_EMBEDDER_ENABLED:
+        embedder_stop.set()
+        await asyncio.wait([embedder_task], timeout=10)
+    await http_pool.aclose()
     # Worker Stop removed
 
 # 5. Inicialização do App
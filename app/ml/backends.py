@@ -0,0 +1,116 @@
+import importlib
+import logging
+import resource
+import threading
+import time
+import types
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# LAZY ML BACKENDS
+# =========================================================
+# TensorFlow, SHAP and MLflow cost seconds of import time and hundreds of MB
+# of RSS per worker. Modules reference them through these proxies, so the
+# real import happens on first attribute access (or in the optional
+# background warm-up), never at `import app.*` time.
+
+_report: Dict[str, Dict] = {}
+_report_lock = threading.Lock()
+
+
+def _rss_mb() -> float:
+    # ru_maxrss is KB on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class LazyModule(types.ModuleType):
+    """Module proxy that imports `name` on first attribute access."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        object.__setattr__(self, "_lazy_module", None)
+        object.__setattr__(self, "_lazy_lock", threading.Lock())
+        with _report_lock:
+            _report.setdefault(name, {"loaded": False})
+
+    def _load(self, trigger: str = "on_demand") -> types.ModuleType:
+        module = object.__getattribute__(self, "_lazy_module")
+        if module is not None:
+            return module
+        with object.__getattribute__(self, "_lazy_lock"):
+            module = object.__getattribute__(self, "_lazy_module")
+            if module is None:
+                rss_before = _rss_mb()
+                started = time.perf_counter()
+                module = importlib.import_module(self.__name__)
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                object.__setattr__(self, "_lazy_module", module)
+                with _report_lock:
+                    _report[self.__name__] = {
+                        "loaded": True,
+                        "import_ms": round(elapsed_ms, 1),
+                        "max_rss_delta_mb": round(_rss_mb() - rss_before, 1),
+                        "trigger": trigger,
+                        "thread": threading.current_thread().name,
+                        "loaded_at": datetime.utcnow().isoformat(),
+                    }
+                logger.info(f"[Backends] imported {self.__name__} in {elapsed_ms:.0f}ms ({trigger})")
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+tensorflow_keras = LazyModule("tensorflow.keras")
+shap = LazyModule("shap")
+mlflow = LazyModule("mlflow")
+
+BACKENDS = {
+    "tensorflow.keras": tensorflow_keras,
+    "shap": shap,
+    "mlflow": mlflow,
+}
+
+
+# ---------------------------------------------------------
+# WARM-UP & REPORT
+# ---------------------------------------------------------
+def warm_up(names: Optional[Iterable[str]] = None, delay_seconds: float = 0) -> threading.Thread:
+    """
+    Imports the given backends (default: all) on a daemon thread, after
+    `delay_seconds`, so the first request that needs them doesn't pay for it.
+    """
+    names = list(names or BACKENDS)
+
+    def run():
+        if delay_seconds:
+            time.sleep(delay_seconds)
+        for name in names:
+            try:
+                BACKENDS[name]._load(trigger="warmup")
+            except Exception as e:
+                logger.warning(f"[Backends] warm-up of {name} failed: {e}")
+        logger.info(f"[Backends] warm-up done: {import_report()}")
+
+    thread = threading.Thread(target=run, name="ml-backend-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def import_report() -> Dict:
+    """Import cost of each heavy backend in this worker (and current max RSS)."""
+    with _report_lock:
+        backends = {name: dict(entry) for name, entry in _report.items()}
+    return {"backends": backends, "max_rss_mb": _rss_mb()}
@@ -1,4 +1,5 @@
 # app/ml/feature_store.py
+import numpy as np
 
 # List of high-demand skills for market gap analysis
 MARKET_TRENDS = [
@@ -63,3 +64,29 @@ def compute_features(metrics, snapshots):
         # Keep legacy key just in case, though we primarily use commit_velocity now
         "commit_trend": commit_velocity
     }
+
+
+def compute_features_batch(metrics_list):
+    """
+    Vectorized compute_features for batch scoring.
+
+    Args:
+        metrics_list (list): GitHub activity metrics dict per user.
+
+    Returns:
+        dict: NumPy arrays aligned with the inputs ("commit_velocity", the
+        only feature the risk models read). skill_slope and market_gap are
+        not model inputs, so they are left to compute_features.
+    """
+    commit_velocity = np.fromiter(
+        (
+            (m.get("commits_last_30_days", 0) or 0) if isinstance(m, dict) else 0
+            for m in metrics_list
+        ),
+        dtype=np.float64,
+        count=len(metrics_list)
+    )
+
+    return {
+        "commit_velocity": commit_velocity
+    }
@@ -1,12 +1,11 @@
 import numpy as np
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import LSTM, Dense
+from app.ml.backends import tensorflow_keras as keras
 
 class LSTMRiskModel:
     def build(self):
-        model = Sequential([
-            LSTM(64, input_shape=(10, 1)),
-            Dense(1)
+        model = keras.models.Sequential([
+            keras.layers.LSTM(64, input_shape=(10, 1)),
+            keras.layers.Dense(1)
         ])
         model.compile(optimizer="adam", loss="mse")
         return model
@@ -1,18 +1,127 @@
 import numpy as np
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import LSTM, Dense
-from tensorflow.keras.callbacks import EarlyStopping
 import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from queue import Empty, Queue
+from typing import List, Optional, Sequence
+
+from app.ml.backends import tensorflow_keras as keras
+from app.ml.model_registry import model_registry
 
 MODEL_PATH = "app/ml/models/lstm_risk_model.h5"
+MODEL_NAME = "lstm_risk"
 WINDOW_SIZE = 10
 
+# Micro-batching: concurrent predictions arriving within BATCH_WAIT_MS of the
+# first one share a single forward pass (up to MAX_BATCH_SIZE windows)
+BATCH_WAIT_MS = 5
+MAX_BATCH_SIZE = 64
+# Offline scoring chunk for predict_many
+OFFLINE_BATCH_SIZE = 256
+# An online prediction not answered within this (first call includes loading
+# TensorFlow and the model), or whose worker thread died, is computed in the
+# caller's thread instead; the worker's liveness is checked every LIVENESS_POLL_S
+PREDICT_TIMEOUT_S = 60.0
+LIVENESS_POLL_S = 0.5
+
+
+def _load_keras(path: str):
+    # Inference only: skip optimizer/loss restoration
+    return keras.models.load_model(path, compile=False)
+
+
+class _InferenceBatcher:
+    """
+    Single worker thread that drains queued windows in micro-batches.
+    Callers block on a Future; the worker runs one forward pass per batch.
+    A caller never waits on a dead (or stuck) worker: `predict` falls back to
+    running its window directly, and the next `submit` restarts the thread.
+    """
+
+    def __init__(self, run_batch, wait_ms: float = BATCH_WAIT_MS, max_batch: int = MAX_BATCH_SIZE):
+        self.run_batch = run_batch
+        self.wait_s = wait_ms / 1000
+        self.max_batch = max_batch
+        self._queue: Queue = Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.fallbacks = 0
+
+    def submit(self, window: Sequence[float]) -> Future:
+        self._ensure_started()
+        future = Future()
+        self._queue.put((window, future))
+        return future
+
+    def predict(self, window: Sequence[float], timeout: float = PREDICT_TIMEOUT_S):
+        future = self.submit(window)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return future.result(timeout=LIVENESS_POLL_S)
+            except FutureTimeout:
+                if not self._alive() or time.monotonic() >= deadline:
+                    break
+        # The worker will skip the window if it ever gets to it
+        future.cancel()
+        self.fallbacks += 1
+        return self.run_batch([window])[0]
+
+    def _alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._worker, name="lstm-inference", daemon=True
+                )
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.wait_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except Empty:
+                    break
+
+            # Drops windows whose caller gave up; the rest can no longer be cancelled
+            batch = [(w, f) for w, f in batch if f.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            windows = [w for w, _ in batch]
+            try:
+                results = self.run_batch(windows)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            self.batches += 1
+            self.items += len(batch)
+
+
 class LSTMRiskProductionModel:
 
+    def __init__(self):
+        self._batcher = _InferenceBatcher(self.predict_many)
+
     def build(self):
-        model = Sequential([
-            LSTM(64, input_shape=(WINDOW_SIZE, 1)),
-            Dense(1)
+        model = keras.models.Sequential([
+            keras.layers.LSTM(64, input_shape=(WINDOW_SIZE, 1)),
+            keras.layers.Dense(1)
         ])
         model.compile(optimizer="adam", loss="mse")
         return model
@@ -31,19 +140,43 @@ class LSTMRiskProductionModel:
             X, y,
             epochs=50,
             batch_size=8,
-            callbacks=[EarlyStopping(patience=5)],
+            callbacks=[keras.callbacks.EarlyStopping(patience=5)],
             verbose=0
         )
 
         os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
         model.save(MODEL_PATH)
+        model_registry.invalidate(MODEL_NAME)
 
     def predict(self, recent_risks: list) -> int:
-        if not os.path.exists(MODEL_PATH):
-            return recent_risks[-1]
+        """
+        Online path: joins the current micro-batch and waits for its result.
+        """
+        if len(recent_risks) < WINDOW_SIZE:
+            raise ValueError(f"LSTM needs {WINDOW_SIZE} points, got {len(recent_risks)}")
+        return self._batcher.predict(list(recent_risks[-WINDOW_SIZE:]))
+
+    def predict_many(self, windows: List[Sequence[float]]) -> List[int]:
+        """
+        Bulk path (offline scoring, micro-batches): one forward pass per chunk.
+        Without a trained artifact, each window's last value is returned.
+        """
+        if not windows:
+            return []
+        if any(len(w) < WINDOW_SIZE for w in windows):
+            raise ValueError(f"Every window needs {WINDOW_SIZE} points")
+
+        model = model_registry.get(MODEL_NAME, MODEL_PATH, loader=_load_keras)
+        if model is None:
+            return [int(w[-1]) for w in windows]
+
+        X = np.array(
+            [w[-WINDOW_SIZE:] for w in windows], dtype=np.float32
+        ).reshape(-1, WINDOW_SIZE, 1)
 
-        model = load_model(MODEL_PATH)
-        X = np.array(recent_risks[-WINDOW_SIZE:]).reshape(1, WINDOW_SIZE, 1)
-        pred = model.predict(X, verbose=0)[0][0]
+        preds = []
+        for start in range(0, len(X), OFFLINE_BATCH_SIZE):
+            chunk = model.predict_on_batch(X[start:start + OFFLINE_BATCH_SIZE])
+            preds.extend(np.asarray(chunk).reshape(-1).tolist())
 
-        return max(0, min(int(pred), 100))
+        return [max(0, min(int(p), 100)) for p in preds]
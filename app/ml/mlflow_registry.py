@@ -1,4 +1,4 @@
-import mlflow
+from app.ml.backends import mlflow
 
 def register(model, version):
     mlflow.start_run()
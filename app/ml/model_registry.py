@@ -0,0 +1,126 @@
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# REGISTRY CONFIGURATION
+# =========================================================
+
+# How often (seconds) a cached artifact is re-stat'ed for a newer file.
+# Between checks, `get` never touches the filesystem.
+CHECK_INTERVAL_SECONDS = 5.0
+
+
+class _Entry:
+    __slots__ = ("model", "path", "version", "mtime", "loaded_at", "checked_at", "hits", "loads")
+
+    def __init__(self, path: str):
+        self.model = None
+        self.path = path
+        self.version = None
+        self.mtime = None
+        self.loaded_at = None
+        self.checked_at = 0.0
+        self.hits = 0
+        self.loads = 0
+
+
+# =========================================================
+# MODEL REGISTRY
+# =========================================================
+
+class ModelRegistry:
+    """
+    In-process cache of deserialized model artifacts.
+
+    Each named artifact is loaded once and served from memory. At most every
+    `check_interval` seconds the file's mtime/size is compared with the loaded one;
+    a newer artifact is deserialized off to the side and swapped in with a
+    single assignment, so concurrent callers see either the old or the new
+    model, never a partial one. A failed reload keeps serving the old model.
+    """
+
+    def __init__(self, check_interval: float = CHECK_INTERVAL_SECONDS):
+        self.check_interval = check_interval
+        self._entries: Dict[str, _Entry] = {}
+        self._locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+    def get(
+        self,
+        name: str,
+        path: str,
+        loader: Callable[[str], Any] = joblib.load,
+        version: Optional[str] = None
+    ) -> Optional[Any]:
+        """Returns the in-memory model for `name`, or None if no artifact exists."""
+        entry = self._entries.get(name)
+        if entry is not None and entry.path == path and \
+                time.monotonic() - entry.checked_at < self.check_interval:
+            entry.hits += 1
+            return entry.model
+
+        with self._locks[name]:
+            entry = self._entries.get(name)
+            if entry is None or entry.path != path:
+                entry = _Entry(path)
+
+            try:
+                stat = os.stat(path)
+                mtime = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                mtime = None
+
+            if mtime is not None and mtime != entry.mtime:
+                try:
+                    model = loader(path)
+                except Exception as e:
+                    logger.warning(f"[ModelRegistry] failed to load {name} from {path}: {e}")
+                else:
+                    fresh = _Entry(path)
+                    fresh.model = model
+                    fresh.version = version
+                    fresh.mtime = mtime
+                    fresh.loaded_at = datetime.utcnow()
+                    fresh.hits = entry.hits
+                    fresh.loads = entry.loads + 1
+                    entry = fresh
+                    logger.info(f"[ModelRegistry] loaded {name} v{version} from {path}")
+            # If the artifact disappeared, whatever is in memory keeps being served
+
+            entry.checked_at = time.monotonic()
+            entry.hits += 1
+            self._entries[name] = entry
+            return entry.model
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forces a reload on next access (e.g. right after retraining)."""
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+    def stats(self) -> Dict[str, Dict]:
+        return {
+            name: {
+                "path": entry.path,
+                "version": entry.version,
+                "loaded": entry.model is not None,
+                "loaded_at": entry.loaded_at.isoformat() if entry.loaded_at else None,
+                "artifact_mtime": entry.mtime[0] / 1e9 if entry.mtime else None,
+                "hits": entry.hits,
+                "loads": entry.loads,
+            }
+            for name, entry in list(self._entries.items())
+        }
+
+
+# Singleton Instance
+model_registry = ModelRegistry()
@@ -1,8 +1,11 @@
 import os
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+
+from app.ml.model_registry import model_registry
 
 # =========================================================
 # MODEL CONFIGURATION
@@ -14,6 +17,10 @@ MODEL_DIR = "app/ml/models"
 LEGACY_MODEL_PATH = "app/ml/risk_model.joblib"
 VERSIONED_MODEL_PATH = f"{MODEL_DIR}/risk_model_v{MODEL_VERSION}.joblib"
 
+# Registry keys (artifacts are deserialized once per process)
+ADVANCED_MODEL_NAME = "risk_model"
+LEGACY_MODEL_NAME = "risk_model_legacy"
+
 
 # =========================================================
 # RISK FORECAST MODEL
@@ -28,6 +35,7 @@ class RiskForecastModel:
     - Advanced mode (confidence + commit velocity)
     - Explicit versioning
     - Safe fallback when model is missing
+    - Artifacts served from the in-process model registry
     """
 
     def __init__(self):
@@ -51,15 +59,21 @@ class RiskForecastModel:
             X = df[["avg_confidence", "commit_velocity"]].fillna(0)
             y = df["risk_score"].fillna(0)
             path = VERSIONED_MODEL_PATH
+            name = ADVANCED_MODEL_NAME
         else:
             X = df[["confidence"]].fillna(0)
             y = df["risk"].fillna(0)
             path = LEGACY_MODEL_PATH
+            name = LEGACY_MODEL_NAME
 
         self.model.fit(X, y)
+        # Background means for closed-form attribution (coef * (x - mean))
+        self.model.feature_means_ = X.mean().to_numpy(dtype=float)
 
         os.makedirs(os.path.dirname(path), exist_ok=True)
         joblib.dump(self.model, path)
+        # Serve the new artifact immediately in this process
+        model_registry.invalidate(name)
 
     # -----------------------------------------------------
     # PREDICTION (SAFE + COMPATIBLE)
@@ -79,8 +93,12 @@ class RiskForecastModel:
             -> falls back to legacy model
         """
         # ---------- Advanced path ----------
-        if commit_velocity is not None and os.path.exists(VERSIONED_MODEL_PATH):
-            model = joblib.load(VERSIONED_MODEL_PATH)
+        model = None
+        if commit_velocity is not None:
+            model = model_registry.get(
+                ADVANCED_MODEL_NAME, VERSIONED_MODEL_PATH, version=self.version
+            )
+        if model is not None:
             raw_pred = model.predict([[avg_confidence, commit_velocity]])[0]
 
             return {
@@ -90,8 +108,8 @@ class RiskForecastModel:
             }
 
         # ---------- Legacy fallback ----------
-        if os.path.exists(LEGACY_MODEL_PATH):
-            model = joblib.load(LEGACY_MODEL_PATH)
+        model = model_registry.get(LEGACY_MODEL_NAME, LEGACY_MODEL_PATH, version="legacy")
+        if model is not None:
             raw_pred = model.predict([[avg_confidence]])[0]
 
             return {
@@ -107,10 +125,41 @@ class RiskForecastModel:
             "mode": "fallback"
         }
 
+    def predict_batch(
+        self,
+        avg_confidence: np.ndarray,
+        commit_velocity: np.ndarray
+    ) -> Tuple[np.ndarray, str]:
+        """
+        Vectorized predict() for batch scoring: one model call for all rows.
+        Returns (ml_risk int array, model_version).
+        """
+        avg_confidence = np.asarray(avg_confidence, dtype=float)
+        commit_velocity = np.asarray(commit_velocity, dtype=float)
+
+        model = model_registry.get(
+            ADVANCED_MODEL_NAME, VERSIONED_MODEL_PATH, version=self.version
+        )
+        if model is not None:
+            raw = model.predict(np.column_stack([avg_confidence, commit_velocity]))
+            return self._normalize_many(raw), self.version
+
+        model = model_registry.get(LEGACY_MODEL_NAME, LEGACY_MODEL_PATH, version="legacy")
+        if model is not None:
+            raw = model.predict(avg_confidence.reshape(-1, 1))
+            return self._normalize_many(raw), "legacy"
+
+        return self._normalize_many(100 - avg_confidence), "heuristic"
+
     # -----------------------------------------------------
     # INTERNAL HELPERS
     # -----------------------------------------------------
 
+    @staticmethod
+    def _normalize_many(values) -> np.ndarray:
+        """Vectorized _normalize: truncate, then clamp to [0, 100]."""
+        return np.clip(np.trunc(np.asarray(values, dtype=float)), 0, 100).astype(int)
+
     @staticmethod
     def _normalize(value: float) -> int:
         """Clamp prediction to [0, 100]."""
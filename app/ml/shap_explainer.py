@@ -1,90 +1,110 @@
-import shap
 import joblib
 import numpy as np
 import os
-from typing import Dict
+from typing import Dict, Optional, Tuple
+from app.ml.backends import shap
 from app.ml.risk_forecast_model import VERSIONED_MODEL_PATH
 
+FEATURES = ("avg_confidence", "commit_velocity")
+
 class ShapRiskExplainer:
     """
-    Uses SHAP to compute feature contribution and generate quantitative counterfactual deltas.
+    Computes feature contributions for the risk model and generates
+    quantitative counterfactual deltas.
+
+    For linear models trained with stored background means (`feature_means_`,
+    written by RiskForecastModel.train) contributions are exact and closed-form:
+    coef * (x - mean), vectorized over any number of rows. SHAP is only used
+    for non-linear models (or legacy artifacts without stored means).
     """
     def __init__(self):
         self.model = None
         self.explainer = None
+        self.linear: Optional[Tuple[np.ndarray, np.ndarray]] = None
 
     def _load_resources(self):
         if self.model is None:
             if not os.path.exists(VERSIONED_MODEL_PATH):
                 raise FileNotFoundError(f"Model not found at {VERSIONED_MODEL_PATH}")
-            self.model = joblib.load(VERSIONED_MODEL_PATH)
-            # Use specific explainer based on model type (TreeExplainer is faster for forests)
-            # For LinearRegression (which is used in risk_forecast_model.py), LinearExplainer is appropriate,
-            # but generic Explainer handles most cases automatically.
-            self.explainer = shap.Explainer(self.model)
+            model = joblib.load(VERSIONED_MODEL_PATH)
+            self.linear = self._linear_params(model)
+            if self.linear is None:
+                # Generic explainer for non-linear models (TreeExplainer etc. chosen by SHAP)
+                self.explainer = shap.Explainer(model)
+            self.model = model
 
-    def explain(self, avg_confidence: float, commit_velocity: float) -> Dict:
-        """
-        Explain the risk score using SHAP values.
+    @staticmethod
+    def _linear_params(model) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        coef = getattr(model, "coef_", None)
+        means = getattr(model, "feature_means_", None)
+        if isinstance(coef, np.ndarray) and isinstance(means, np.ndarray) \
+                and coef.shape[-1] == means.shape[-1] == len(FEATURES):
+            return coef.reshape(-1).astype(float), means.reshape(-1).astype(float)
+        return None
 
-        Args:
-            avg_confidence (float): The average skill confidence score.
-            commit_velocity (float): The commit velocity metric.
+    def attribute(self, X) -> np.ndarray:
+        """
+        Contributions for a batch of rows [[avg_confidence, commit_velocity], ...].
+        Returns an (n_rows, n_features) array.
+        """
+        self._load_resources()
+        # NOTE: column order must match RiskForecastModel.train:
+        # X = df[["avg_confidence", "commit_velocity"]]
+        X = np.asarray(X, dtype=float)
+        if self.linear is not None:
+            coef, means = self.linear
+            return (X - means) * coef
+        return np.asarray(self.explainer(X).values)
 
-        Returns:
-            Dict: A dictionary containing feature contributions.
+    def explain_all(self, avg_confidence: float, commit_velocity: float) -> Dict:
+        """
+        One attribution, both payloads: the counterfactual `features` dict and
+        the Chart.js `visual` dict.
         """
         try:
-            self._load_resources()
-
-            # NOTE: Ensure this array structure matches EXACTLY the training data columns
-            # Based on RiskForecastModel.train: X = df[["avg_confidence", "commit_velocity"]]
-            X = np.array([[avg_confidence, commit_velocity]])
-
-            shap_values = self.explainer(X)
-
-            # shap_values.values is a matrix (1, n_features)
-            contributions = shap_values.values[0]
-
-            return {
-                "features": {
-                    "avg_confidence": float(contributions[0]),
-                    "commit_velocity": float(contributions[1])
-                }
-            }
-        except (FileNotFoundError, OSError, Exception) as e:
-            # FALLBACK: Return heuristic values if model is missing or loading fails
-            # This ensures the app works immediately after deploy without the artifact
-            # Returning dummy positive contributions that mimic a high risk scenario or neutral
-            # depending on what the CounterfactualEngine expects.
-            # User instruction: "Return heuristic values if model is missing... avg_confidence: 0.5"
+            contributions = self.attribute([[avg_confidence, commit_velocity]])[0]
+        except (FileNotFoundError, AttributeError, OSError, Exception):
+            # FALLBACK: heuristic values if the model is missing or loading fails,
+            # so the app works right after deploy without the artifact
             return {
                 "features": {
                     "avg_confidence": 0.5, # Dummy positive contribution
                     "commit_velocity": 0.0
+                },
+                "visual": {
+                    "labels": ["Skill Confidence", "Commit Velocity"],
+                    "values": [0, 0]
                 }
             }
 
+        return {
+            "features": {
+                "avg_confidence": float(contributions[0]),
+                "commit_velocity": float(contributions[1])
+            },
+            "visual": {
+                "labels": ["Verified Skill Confidence", "Commit Velocity"],
+                "values": [float(contributions[0]), float(contributions[1])]
+            }
+        }
+
+    def explain(self, avg_confidence: float, commit_velocity: float) -> Dict:
+        """
+        Explain the risk score using feature contributions.
+
+        Args:
+            avg_confidence (float): The average skill confidence score.
+            commit_velocity (float): The commit velocity metric.
+
+        Returns:
+            Dict: A dictionary containing feature contributions.
+        """
+        return {"features": self.explain_all(avg_confidence, commit_velocity)["features"]}
+
     def explain_visual(self, avg_confidence: float, commit_velocity: float):
         """
         Returns data formatted specifically for Chart.js visualization.
         """
-        # Ensure resources are loaded (Lazy Loading)
-        try:
-            self._load_resources()
-            X = np.array([[avg_confidence, commit_velocity]])
-            shap_values = self.explainer(X)
-            contributions = shap_values.values[0]
-
-            return {
-                "labels": ["Verified Skill Confidence", "Commit Velocity"],
-                "values": [float(contributions[0]), float(contributions[1])]
-            }
-        except (FileNotFoundError, AttributeError, OSError, Exception):
-            # Fallback if model is missing
-            return {
-                "labels": ["Skill Confidence", "Commit Velocity"],
-                "values": [0, 0]
-            }
+        return self.explain_all(avg_confidence, commit_velocity)["visual"]
 
 shap_explainer = ShapRiskExplainer()
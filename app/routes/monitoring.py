@@ -7,8 +7,16 @@ import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.db.session import get_db, SessionLocal
-import httpx
 import asyncio
+from app.core.http_client import http_pool
+from app.services.github_cache import github_cache
+from app.services.embedding_cache import embedding_cache
+from app.services.harvest_scheduler import harvest_scheduler
+from app.services.job_queue import job_queue
+from app.services.fleet_refresh import fleet_refresher
+from app.services.memory_embedder import memory_embedder
+from app.ml.model_registry import model_registry
+from app.ml.backends import import_report
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -58,12 +66,11 @@ async def system_diagnostics():
 
     # 2. Check Internet Connectivity (Google Ping)
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get("https://www.google.com", timeout=2.0)
-            if resp.status_code == 200:
-                diagnostics["internet"] = "connected"
-            else:
-                diagnostics["internet"] = f"unreachable (status: {resp.status_code})"
+        resp = await http_pool.client.get("https://www.google.com", timeout=2.0)
+        if resp.status_code == 200:
+            diagnostics["internet"] = "connected"
+        else:
+            diagnostics["internet"] = f"unreachable (status: {resp.status_code})"
     except Exception as e:
         diagnostics["internet"] = f"error: {str(e)}"
         logger.error(f"Diagnostics Internet Error: {e}")
@@ -76,6 +83,76 @@ async def system_diagnostics():
 
     return diagnostics
 
+@router.get("/models")
+async def loaded_models():
+    """
+    In-memory ML artifacts of this worker: version, load time, hits and reloads.
+    """
+    return model_registry.stats()
+
+@router.get("/http")
+async def http_pool_stats():
+    """
+    Shared outbound HTTP pool of this worker: limits, open/idle connections,
+    and requests vs. new connections per host.
+    """
+    return http_pool.stats()
+
+@router.get("/github-cache")
+async def github_cache_stats():
+    """
+    ETag cache for GitHub API calls: hits (304s, free on the rate limit),
+    misses, evictions and current size.
+    """
+    return github_cache.stats()
+
+@router.get("/embedding-cache")
+async def embedding_cache_stats():
+    """
+    Embedding cache: hits per tier (process LRU / shared SQLite), misses
+    sent to the API, evictions and current size.
+    """
+    return embedding_cache.stats()
+
+@router.get("/harvest-scheduler")
+async def harvest_scheduler_stats():
+    """
+    Harvest request pacing: queue depth, wait time per priority, and the
+    rate-limit budget of each (token, host).
+    """
+    return harvest_scheduler.stats()
+
+@router.get("/jobs")
+async def job_queue_stats(db: Session = Depends(get_db)):
+    """
+    Harvest job queue: jobs per status and how long the oldest due job has
+    been waiting for a worker.
+    """
+    return await asyncio.to_thread(job_queue.stats, db)
+
+@router.get("/fleet-freshness")
+async def fleet_freshness(db: Session = Depends(get_db)):
+    """
+    Age of the GitHub metrics of every connected user (p50/p90/p99/max, in
+    hours), how many are overdue for the rolling re-harvest and never synced.
+    """
+    return await asyncio.to_thread(fleet_refresher.freshness, db)
+
+@router.get("/embedder")
+async def memory_embedder_stats(db: Session = Depends(get_db)):
+    """
+    Mentor memories waiting for the background embedder, permanently failed
+    ones, and when the oldest pending one was written.
+    """
+    return await asyncio.to_thread(memory_embedder.stats, db)
+
+@router.get("/imports")
+async def ml_import_report():
+    """
+    Which heavy ML backends this worker has imported, and what each one cost.
+    """
+    return import_report()
+
 @router.post("/analyze-posture")
 async def analyze_posture(data: PostureAnalysisRequest, user = Depends(check_auth)):
     if not client:
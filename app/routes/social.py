@@ -1,12 +1,12 @@
-from fastapi import APIRouter, Request, Depends, BackgroundTasks
-from fastapi.responses import RedirectResponse, HTMLResponse
+from fastapi import APIRouter, Request, Depends
+from fastapi.responses import RedirectResponse, HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
 from authlib.integrations.starlette_client import OAuth
 from authlib.integrations.base_client.errors import OAuthError
 from sqlalchemy.orm import Session, joinedload
 from app.core.config import settings
 from app.db.session import get_db, SessionLocal
-from app.services.social_harvester import social_harvester
+from app.services.job_queue import job_queue, GITHUB_SYNC, LINKEDIN_SYNC, PRIORITY_HIGH
 from app.db.crud.users import (
     get_user_by_email,
     get_user_by_github_id,
@@ -206,7 +206,7 @@ async def login_github(request: Request):
     return await oauth.github.authorize_redirect(request, redirect_uri)
 
 @router.get("/auth/github/callback")
-async def auth_github_callback(request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def auth_github_callback(request: Request, db: Session = Depends(get_db)):
     ip = get_client_ip(request)
 
     code = request.query_params.get('code')
@@ -289,7 +289,8 @@ async def auth_github_callback(request: Request, background_tasks: BackgroundTas
             return RedirectResponse("/onboarding/connect-github?error=github_taken", status_code=302)
 
         if token.get('access_token'):
-            background_tasks.add_task(social_harvester.harvest_github_data, current_user_state.id, token.get('access_token'))
+            # Durable: runs in the harvest worker, survives restarts, retried with backoff
+            await _enqueue_harvest(db, GITHUB_SYNC, current_user_state.id)
 
         return RedirectResponse("/dashboard", status_code=303)
 
@@ -320,6 +321,23 @@ async def login_linkedin(request: Request):
 
     return await oauth.linkedin.authorize_redirect(request, redirect_uri)
 
+async def _enqueue_harvest(db: Session, kind: str, user_id: int):
+    """Queues a harvest for the worker; a queue failure never blocks the login."""
+    try:
+        await asyncio.to_thread(job_queue.enqueue, db, kind, user_id, None, PRIORITY_HIGH)
+    except Exception as e:
+        logger.error(f"Failed to enqueue {kind} for user {user_id}: {e}")
+        db.rollback()
+
+@router.get("/api/harvest/status")
+async def harvest_status(request: Request, db: Session = Depends(get_db)):
+    """Latest GitHub/LinkedIn harvest job of the logged-in user."""
+    user = getattr(request.state, "user", None)
+    if not user:
+        return JSONResponse({"detail": "Authentication required"}, status_code=401)
+    jobs = await asyncio.to_thread(job_queue.status_for_user, db, user.id)
+    return {"jobs": jobs}
+
 def _process_github_connect_sync(db: Session, user_id: int, github_id: str, token_str: str, avatar: str, ip: str) -> str:
     """
     Synchronous helper to handle GitHub connection logic.
@@ -537,7 +555,7 @@ def _process_linkedin_login_sync(user_info: dict, token_data: dict, ip: str, use
             return {"status": "error", "error": "internal_error", "message": str(e)}
 
 @router.get("/auth/linkedin/callback")
-async def auth_linkedin_callback(request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def auth_linkedin_callback(request: Request, db: Session = Depends(get_db)):
     # Note: 'db' dependency is not used for the heavy lifting anymore, only for lightweight or legacy parts if needed.
     # The sync helper creates its own session.
 
@@ -612,7 +630,7 @@ async def auth_linkedin_callback(request: Request, background_tasks: BackgroundT
 
         # 4. Trigger Background Data Harvest
         if token_str:
-            background_tasks.add_task(social_harvester.harvest_linkedin_data, result["user_id"], token_str)
+            await _enqueue_harvest(db, LINKEDIN_SYNC, result["user_id"])
 
         # 5. Create Response
         # CHECK FOR DIRECT CHAINING
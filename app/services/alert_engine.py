@@ -1,15 +1,12 @@
-from app.db.models.analytics import RiskSnapshot
+from typing import Optional
 from app.services.mentor_engine import mentor_engine
+from app.services.snapshot_context import RiskSnapshotContext
 
 class AlertEngine:
 
-    def detect_state_change(self, db, user, new_level: str):
-        last = (
-            db.query(RiskSnapshot)
-            .filter(RiskSnapshot.user_id == user.id)
-            .order_by(RiskSnapshot.recorded_at.desc())
-            .first()
-        )
+    def detect_state_change(self, db, user, new_level: str, snapshots: Optional[RiskSnapshotContext] = None):
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
+        last = snapshots.latest
 
         if last and last.risk_level != new_level:
             mentor_engine.store(
@@ -1,79 +1,41 @@
+from typing import Optional
 from sqlalchemy.orm import Session
-from app.db.models.analytics import RiskSnapshot
-from app.db.models.career import CareerProfile
+from app.services.percentile_index import CohortPercentileIndex
+from app.services.snapshot_context import RiskSnapshotContext
 
 class BenchmarkEngine:
-    def compute(self, db: Session, user):
+    def __init__(self):
+        # Sorted peer scores per cohort, shared by compute / compute_team_org
+        self.percentiles = CohortPercentileIndex()
+
+    def compute(self, db: Session, user, snapshots: Optional[RiskSnapshotContext] = None):
         profile = user.career_profile
         if not profile:
             return None
 
-        latest = (
-            db.query(RiskSnapshot)
-            .filter(RiskSnapshot.user_id == user.id)
-            .order_by(RiskSnapshot.created_at.desc())
-            .first()
-        )
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
+        latest = snapshots.latest
         if not latest:
             return None
 
-        query = (
-            db.query(RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-        )
-
         context = []
         if profile.company:
-            query = query.filter(CareerProfile.company == profile.company)
             context.append(profile.company)
         if profile.region:
-            query = query.filter(CareerProfile.region == profile.region)
             context.append(profile.region)
 
-        peers = query.all()
-        if not peers:
+        # Percentile: percent of peers (latest score per developer) with
+        # risk_score <= my score, answered by the cohort index with a bisect
+        lookup = self.percentiles.percentile(
+            db,
+            "company_region",
+            {"company": profile.company or None, "region": profile.region or None},
+            latest.risk_score
+        )
+        if not lookup:
             return None
+        percentile, _ = lookup
 
-        scores = sorted([p[0] for p in peers])
-        
-        # Percentile: percent of peers with risk_score <= my score
-        # Note: logic provided was: sum(1 for s in scores if s <= latest.risk_score) / len(scores) * 100
-        # If risk_score 0 is "good" and 100 is "bad", then being <= my score means "safer or same safety"?
-        # Wait. "you are safer than {percentile}% of them."
-        # If my risk is 20 (Low). Peer is 80 (High). 20 <= 20. 80 is not <= 20.
-        # So sum(s <= 20) would be small if everyone else is high risk.
-        # Then percentile is small. "You are safer than 10% of them".
-        # This seems inverted if "safer" means "better".
-        # Usually "safer than X%" means I am in the top X% of safety.
-        # If I have low risk, I am safer than people with high risk.
-        # So I should be counting people with risk >= my risk?
-        # But I must follow the provided logic:
-        # "percentile = int(sum(1 for s in scores if s <= latest.risk_score) / len(scores) * 100)"
-        # "you are safer than {percentile}% of them."
-
-        # Let's re-read the provided snippet carefully.
-        # "scores = sorted([p[0] for p in peers])"
-        # "percentile = int(sum(1 for s in scores if s <= latest.risk_score) / len(scores) * 100)"
-
-        # If risk score: 0 (safe) -> 100 (risky).
-        # Me: 10. Peer1: 5, Peer2: 90.
-        # Scores: [5, 10, 90].
-        # s <= 10: 5, 10. Count = 2.
-        # Percentile = 2/3 = 66%.
-        # "You are safer than 66% of them."
-        # Who am I safer than? I am safer than the guy with 90.
-        # But I am NOT safer than the guy with 5.
-        # So I am safer than 1 person (the 90 guy).
-        # But the calculation counts 2 people (me and the 5 guy).
-        # This implies "safer or as safe as"?
-        # If I strictly follow the code provided, I implement the code provided.
-        # The prompt said: "Implement this specific comparison logic: ... Execute the implementation exactly based on the specifications below."
-        # So I will copy the logic exactly, even if I have doubts about the phrasing "safer than".
-
-        percentile = int(
-            sum(1 for s in scores if s <= latest.risk_score) / len(scores) * 100
-        )
-        
         return {
             "context": " / ".join(context),
             "percentile": percentile,
@@ -83,22 +45,17 @@ class BenchmarkEngine:
             )
         }
 
-    def get_user_history(self, db: Session, user):
-        # Fetch user's personal history (last 12 snapshots)
-        # We fetch in descending order to get the most recent ones, then sort back to ascending for the chart
-        recent_history = (
-            db.query(RiskSnapshot)
-            .filter(RiskSnapshot.user_id == user.id)
-            .order_by(RiskSnapshot.created_at.desc())
-            .limit(12)
-            .all()
-        )
+    def get_user_history(self, db: Session, user, snapshots: Optional[RiskSnapshotContext] = None):
+        # User's personal history (last 12 snapshots, most recent first)
+        # Sorted back to ascending for the chart
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
+        recent_history = snapshots.recent(12)
 
         if not recent_history:
             return None
 
         # Restore chronological order for the chart
-        history = sorted(recent_history, key=lambda h: h.created_at)
+        history = recent_history[::-1]
 
         # Return separate arrays for Chart.js
         return {
@@ -106,26 +63,13 @@ class BenchmarkEngine:
             "values": [h.risk_score for h in history]
         }
 
-    def compute_team_health(self, db, user):
+    def compute_team_health(self, db, user, snapshots: Optional[RiskSnapshotContext] = None):
         profile = user.career_profile
         if not profile or not profile.team:
             return None
-        # 1. Fetch all snapshots for team members, ordered by newest first
-        # We join CareerProfile to filter by team
-        raw_data = (
-            db.query(RiskSnapshot.user_id, RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-            .filter(CareerProfile.team == profile.team)
-            .order_by(RiskSnapshot.created_at.desc())
-            .all()
-        )
-        if not raw_data:
-            return None
-        # 2. Deduplicate: Keep only the latest score per user
-        latest_scores = {}
-        for user_id, score in raw_data:
-            if user_id not in latest_scores:
-                latest_scores[user_id] = score
+        # 1-2. Latest score per team member (shared team view of the request)
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
+        latest_scores = snapshots.team_latest_scores()
         if not latest_scores:
             return None
         # 3. Calculate Average Risk of the Team
@@ -139,59 +83,43 @@ class BenchmarkEngine:
             "member_count": len(latest_scores)
         }
 
-    def compute_team_org(self, db: Session, user):
+    def compute_team_org(self, db: Session, user, snapshots: Optional[RiskSnapshotContext] = None):
         profile = user.career_profile
         if not profile:
             return None
 
         # 1. Get user's latest snapshot
-        latest = (
-            db.query(RiskSnapshot)
-            .filter(RiskSnapshot.user_id == user.id)
-            .order_by(RiskSnapshot.created_at.desc())
-            .first()
-        )
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
+        latest = snapshots.latest
         if not latest:
             return None
 
-        # 2. Base Query for Peers
-        query = (
-            db.query(RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-        )
-
         context = []
-        has_filter = False
 
-        # 3. Apply Hierarchical Filters
+        # 2. Hierarchical cohort: organization / team
         if profile.organization:
-            query = query.filter(CareerProfile.organization == profile.organization)
             context.append(profile.organization)
-            has_filter = True
-
         if profile.team:
-            query = query.filter(CareerProfile.team == profile.team)
             context.append(profile.team)
-            has_filter = True
 
-        # Optimization: Don't run query if user belongs to no team/org
-        if not has_filter:
+        # Optimization: Don't look up if user belongs to no team/org
+        if not context:
             return None
 
-        peers = query.all()
-        if not peers:
+        # 3. Percentile from the cohort index (bisect over sorted latest scores)
+        lookup = self.percentiles.percentile(
+            db,
+            "org_team",
+            {"organization": profile.organization or None, "team": profile.team or None},
+            latest.risk_score
+        )
+        if not lookup:
             return None
-
-        # 4. Calculate Percentile
-        scores = sorted([p[0] for p in peers])
+        percentile, cohort_size = lookup
 
         # Handle edge case: single user (100th percentile)
-        if len(scores) == 1:
+        if cohort_size == 1:
             percentile = 100
-        else:
-            percentile = int(
-                sum(1 for s in scores if s <= latest.risk_score) / len(scores) * 100
-            )
 
         return {
             "context": " / ".join(context),
@@ -3,10 +3,11 @@ import random
 from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.stage_graph import Stage, StageGraph
 from app.db.models.user import User
 from app.db.models.career import CareerProfile, LearningPlan
 from app.db.models.ml_risk_log import MLRiskLog
-from app.db.models.analytics import RiskSnapshot
 from app.services.mentor_engine import mentor_engine
 from app.services.alert_engine import alert_engine
 from app.services.benchmark_engine import benchmark_engine
@@ -14,6 +15,7 @@ from app.services.team_health_engine import team_health_engine
 from app.services.counterfactual_engine import counterfactual_engine
 from app.services.social_harvester import social_harvester
 from app.services.growth_engine import growth_engine
+from app.services.snapshot_context import RiskSnapshotContext
 from app.ml.risk_forecast_model import RiskForecastModel
 from app.ml.lstm_risk_production import LSTMRiskProductionModel
 from app.ml.feature_store import compute_features
@@ -34,6 +36,7 @@ class CareerEngine:
     """
 
     def __init__(self):
+        self._analysis_graph = self._build_analysis_graph()
         self.market_high_demand_skills = [
             "Rust",
             "Go",
@@ -58,11 +61,213 @@ class CareerEngine:
         skill_audit: Dict,
         user: User
     ) -> Dict:
+        """
+        Runs the analysis stage graph (see `_build_analysis_graph`).
+
+        Read-only analytics (benchmarks, team health, simulations, history)
+        run concurrently with the write path (plan, forecast, mentor), so the
+        dashboard latency is set by the slowest branch.
+        """
+        run = self._analysis_graph.run(
+            db,
+            {
+                "user": user,
+                "raw_languages": raw_languages,
+                "linkedin_input": linkedin_input,
+                "metrics": metrics,
+            }
+        )
+        r = run.results
+
         # -------------------------------
-        # SKILL CONFIDENCE SCORE
+        # FINAL RESPONSE
         # -------------------------------
-        skill_confidence = self._calculate_skill_confidence(raw_languages, linkedin_input)
+        return {
+            "zone_a_holistic": {},
+            "zone_b_matrix": skill_audit,
+            "weekly_plan": r["weekly_plan"],
+            "skill_confidence": r["skill_confidence"],
+            "career_risks": r["career_signals"]["career_risks"],
+            "hidden_gems": r["career_signals"]["hidden_gems"],
+            "career_forecast": r["career_forecast"],
+            "benchmark": r["benchmark"],
+            "team_benchmark": r["team_benchmark"],
+            "risk_timeline": r["risk_timeline"],
+            "team_health": r["team_health"],
+            "team_burnout": r["team_metrics"]["team_burnout"],
+            "exit_simulation": r["team_metrics"]["exit_simulation"],
+            "hire_simulation": r["team_metrics"]["hire_simulation"],
+            "counterfactual": r["counterfactual"],
+            "multi_week_plan": r["multi_week_plan"],
+            "shap_visual": r["shap_visual"],
+            "zone_a_radar": {},
+            "missing_skills": [],
+            "stage_timings": {k: round(v, 2) for k, v in run.timings.items()}
+        }
+
+    def _build_analysis_graph(self) -> StageGraph:
+        """
+        Declares the `analyze` pipeline.
 
+        Inline stages share the request Session and run in the order below
+        (they write: weekly plan, ML log, mentor memories). Isolated stages
+        only read snapshots and run on the worker pool with their own Session.
+        """
+        return StageGraph(
+            [
+                # -------------------------------
+                # SKILL SIGNALS
+                # -------------------------------
+                Stage(
+                    "skill_confidence",
+                    lambda db, raw_languages, linkedin_input:
+                        self._calculate_skill_confidence(raw_languages, linkedin_input),
+                    ("raw_languages", "linkedin_input")
+                ),
+                Stage(
+                    "career_signals",
+                    self._stage_career_signals,
+                    ("raw_languages", "linkedin_input", "metrics")
+                ),
+
+                # -------------------------------
+                # WRITE PATH (REQUEST SESSION)
+                # -------------------------------
+                Stage(
+                    "weekly_plan",
+                    self._stage_weekly_plan,
+                    ("user", "skill_confidence", "career_signals")
+                ),
+                Stage(
+                    "career_forecast",
+                    lambda db, user, skill_confidence, metrics, snapshots:
+                        self.forecast_career_risk(
+                            db, user, skill_confidence, metrics, snapshots=snapshots
+                        ),
+                    ("user", "skill_confidence", "metrics", "snapshots")
+                ),
+                Stage(
+                    "mentor_insights",
+                    lambda db, user, career_forecast, weekly_plan:
+                        mentor_engine.proactive_insights(
+                            db,
+                            user,
+                            {
+                                "career_forecast": career_forecast,
+                                "weekly_plan": weekly_plan
+                            }
+                        ),
+                    ("user", "career_forecast", "weekly_plan")
+                ),
+
+                # -------------------------------
+                # RISK SNAPSHOTS (ONE LOAD PER REQUEST)
+                # -------------------------------
+                Stage(
+                    "snapshots",
+                    lambda db, user: RiskSnapshotContext.load(db, user),
+                    ("user",), isolated=True
+                ),
+
+                # -------------------------------
+                # BENCHMARK & TEAM ANALYTICS (READ-ONLY)
+                # -------------------------------
+                # Calcula a performance relativa do usuário vs. mercado
+                # (Contextual Benchmark: Company & Region segmentation)
+                Stage(
+                    "benchmark",
+                    lambda db, user, snapshots: benchmark_engine.compute(db, user, snapshots=snapshots),
+                    ("user", "snapshots"), isolated=True
+                ),
+                Stage(
+                    "team_benchmark",
+                    lambda db, user, snapshots: benchmark_engine.compute_team_org(db, user, snapshots=snapshots),
+                    ("user", "snapshots"), isolated=True
+                ),
+                Stage(
+                    "risk_timeline",
+                    lambda db, user, snapshots: benchmark_engine.get_user_history(db, user, snapshots=snapshots),
+                    ("user", "snapshots"), isolated=True
+                ),
+                Stage(
+                    "team_health",
+                    lambda db, user, snapshots: benchmark_engine.compute_team_health(db, user, snapshots=snapshots),
+                    ("user", "snapshots"), isolated=True
+                ),
+                # Burnout, exit/hire simulations and ranking: one pass over the
+                # team aggregate already held by the snapshot context
+                Stage(
+                    "team_metrics",
+                    lambda db, user, snapshots: team_health_engine.team_metrics(db, user, snapshots=snapshots),
+                    ("user", "snapshots")
+                ),
+
+                # -------------------------------
+                # COUNTERFACTUAL ANALYSIS (WHAT-IF SCENARIOS)
+                # -------------------------------
+                Stage(
+                    "features",
+                    self._stage_features,
+                    ("metrics", "skill_confidence", "snapshots")
+                ),
+                # Feature attribution, computed once for both payloads below
+                Stage(
+                    "attribution",
+                    lambda db, features: shap_explainer.explain_all(
+                        avg_confidence=features["avg_confidence"],
+                        commit_velocity=features.get("commit_velocity", 0)
+                    ),
+                    ("features",)
+                ),
+                # Visual SHAP Explanation
+                Stage(
+                    "shap_visual",
+                    lambda db, attribution: attribution["visual"],
+                    ("attribution",)
+                ),
+                # Gera cenário contrafactual (ex: "Se você aumentar commits em 20%, o risco cai para X")
+                Stage(
+                    "counterfactual",
+                    lambda db, features, career_forecast, attribution: counterfactual_engine.generate(
+                        features=features,
+                        current_risk=career_forecast["risk_score"],
+                        explanation={"features": attribution["features"]}
+                    ),
+                    ("features", "career_forecast", "attribution")
+                ),
+
+                # -------------------------------
+                # MENTOR INTEGRATION
+                # -------------------------------
+                Stage(
+                    "mentor_counterfactual",
+                    lambda db, user, counterfactual:
+                        mentor_engine.proactive_from_counterfactual(db, user, counterfactual),
+                    ("user", "counterfactual"),
+                    after=("mentor_insights",)
+                ),
+                # Generate 4-Week Horizon
+                Stage(
+                    "multi_week_plan",
+                    lambda db, user, counterfactual:
+                        mentor_engine.generate_multi_week_plan(db, user, counterfactual),
+                    ("user", "counterfactual"),
+                    after=("mentor_counterfactual",)
+                ),
+            ],
+            max_workers=settings.ANALYZE_STAGE_WORKERS
+        )
+
+    # =========================================================
+    # ANALYSIS STAGES
+    # =========================================================
+    def _stage_career_signals(
+        self,
+        db: Session,
+        raw_languages: Dict[str, int],
+        linkedin_input: Dict,
+        metrics: Dict
+    ) -> Dict[str, List[Dict]]:
         # -------------------------------
         # REAL LOGIC: IMPOSTER & HIDDEN GEM DETECTION
         # -------------------------------
@@ -98,9 +303,15 @@ class CareerEngine:
                 "message": "Low coding activity detected. Skills may decay."
             })
 
-        # -------------------------------
-        # WEEKLY GROWTH PLAN
-        # -------------------------------
+        return {"career_risks": career_risks, "hidden_gems": hidden_gems}
+
+    def _stage_weekly_plan(
+        self,
+        db: Session,
+        user: User,
+        skill_confidence: Dict[str, int],
+        career_signals: Dict[str, List[Dict]]
+    ) -> Dict:
         # Delegate to GrowthEngine for Kanban-Lite & Gap Analysis
         weekly_plan = growth_engine.generate_weekly_plan(db, user)
 
@@ -108,109 +319,29 @@ class CareerEngine:
         # ACCELERATOR MODE DECISION
         # -------------------------------
         if self.should_enable_accelerator(
-            skill_confidence, career_risks, user.streak_count or 0
+            skill_confidence, career_signals["career_risks"], user.streak_count or 0
         ):
             weekly_plan["mode"] = "ACCELERATOR"
             # Update DB/Profile to reflect accelerator override if needed
             # For now, just overriding the display mode in the return dict
 
-        # -------------------------------
-        # CAREER RISK FORECAST (HYBRID + LSTM + A/B TEST)
-        # -------------------------------
-        career_forecast = self.forecast_career_risk(
-            db, user, skill_confidence, metrics
-        )
-
-        # -------------------------------
-        # MENTOR PROACTIVE INSIGHTS
-        # -------------------------------
-        mentor_engine.proactive_insights(
-            db,
-            user,
-            {
-                "career_forecast": career_forecast,
-                "weekly_plan": weekly_plan
-            }
-        )
-
-        # -------------------------------
-        # BENCHMARK ENGINE
-        # -------------------------------
-        # Calcula a performance relativa do usuário vs. mercado
-        # (Contextual Benchmark: Company & Region segmentation)
-        benchmark = benchmark_engine.compute(db, user)
+        return weekly_plan
 
-        # -------------------------------
-        # COUNTERFACTUAL ANALYSIS (WHAT-IF SCENARIOS)
-        # -------------------------------
-        # Recupera snapshots recentes para compor o histórico de features
-        recent_snapshots = (
-            db.query(RiskSnapshot)
-            .filter(RiskSnapshot.user_id == user.id)
-            .order_by(RiskSnapshot.recorded_at.desc())
-            .limit(5)
-            .all()
-        )
-        
+    def _stage_features(
+        self,
+        db: Session,
+        metrics: Dict,
+        skill_confidence: Dict[str, int],
+        snapshots: RiskSnapshotContext
+    ) -> Dict:
+        # Snapshots recentes compõem o histórico de features
         # Computa features normalizadas para o modelo ML
-        features = compute_features(metrics, recent_snapshots)
+        features = compute_features(metrics, snapshots.recent(5))
 
         # Adiciona avg_confidence explicitamente para SHAP analysis
         avg_confidence = sum(skill_confidence.values()) / max(len(skill_confidence), 1)
         features["avg_confidence"] = avg_confidence
-
-        # Visual SHAP Explanation
-        shap_visual_data = shap_explainer.explain_visual(
-            avg_confidence=features["avg_confidence"],
-            commit_velocity=features.get("commit_velocity", 0)
-        )
-
-        # Gera cenário contrafactual (ex: "Se você aumentar commits em 20%, o risco cai para X")
-        counterfactual = counterfactual_engine.generate(
-            features=features,
-            current_risk=career_forecast["risk_score"]
-        )
-
-        # -------------------------------
-        # MENTOR INTEGRATION
-        # -------------------------------
-        mentor_engine.proactive_from_counterfactual(
-            db,
-            user,
-            counterfactual
-        )
-
-        # Generate 4-Week Horizon
-        multi_week_plan = mentor_engine.generate_multi_week_plan(
-            db,
-            user,
-            counterfactual
-        )
-
-        # -------------------------------
-        # FINAL RESPONSE
-        # -------------------------------
-        return {
-            "zone_a_holistic": {},
-            "zone_b_matrix": skill_audit,
-            "weekly_plan": weekly_plan,
-            "skill_confidence": skill_confidence,
-            "career_risks": career_risks,
-            "hidden_gems": hidden_gems,
-            "career_forecast": career_forecast,
-            "benchmark": benchmark,
-            "team_benchmark": benchmark_engine.compute_team_org(db, user),
-            "risk_timeline": benchmark_engine.get_user_history(db, user),
-            "team_health": benchmark_engine.compute_team_health(db, user),
-            "team_burnout": team_health_engine.team_burnout_risk(db, user),
-            "exit_simulation": team_health_engine.simulate_member_exit(db, user),
-            "hire_simulation": team_health_engine.simulate_new_hire(db, user),
-            "counterfactual": counterfactual,
-            "multi_week_plan": multi_week_plan,
-            "shap_visual": shap_visual_data,
-            "zone_a_radar": {},
-            "missing_skills": []
-        }
+        return features
 
     # =========================================================
     # REAL LOGIC ALGORITHM: SKILL ALIGNMENT
@@ -280,23 +411,17 @@ class CareerEngine:
         # 2. Calcula Skill Confidence
         skill_confidence = self._calculate_skill_confidence(raw_languages, linkedin_input)
 
-        # 3. Calcula Risco Atual (Forecast)
+        # 3. Recupera Snapshots (uma única consulta)
+        snapshots = RiskSnapshotContext.load(db, user)
+
+        # 4. Calcula Risco Atual (Forecast)
         career_forecast = self.forecast_career_risk(
-            db, user, skill_confidence, metrics
+            db, user, skill_confidence, metrics, snapshots=snapshots
         )
         current_risk = career_forecast["risk_score"]
 
-        # 4. Recupera Snapshots
-        recent_snapshots = (
-            db.query(RiskSnapshot)
-            .filter(RiskSnapshot.user_id == user.id)
-            .order_by(RiskSnapshot.recorded_at.desc())
-            .limit(5)
-            .all()
-        )
-
         # 5. Computa Features e Gera Counterfactual
-        features = compute_features(metrics, recent_snapshots)
+        features = compute_features(metrics, snapshots.recent(5))
 
         # Adiciona avg_confidence explicitamente para SHAP analysis
         avg_confidence = sum(skill_confidence.values()) / max(len(skill_confidence), 1)
@@ -416,8 +541,10 @@ class CareerEngine:
         db: Session,
         user: User,
         skill_confidence: Dict[str, int],
-        metrics: Dict
+        metrics: Dict,
+        snapshots: Optional[RiskSnapshotContext] = None
     ) -> Dict:
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
         risk_score = 0
         reasons: List[str] = []
 
@@ -463,11 +590,7 @@ class CareerEngine:
 
             # 3. Refinamento Temporal via LSTM (Se houver histórico)
             try:
-                recent_risks = [r.risk_score for r in db.query(RiskSnapshot)
-                                .filter(RiskSnapshot.user_id == user.id)
-                                .order_by(RiskSnapshot.recorded_at.desc())
-                                .limit(10)
-                                .all()][::-1]
+                recent_risks = snapshots.risk_series(10)
 
                 if len(recent_risks) == 10:
                     lstm_risk = lstm_model.predict(recent_risks)
@@ -501,7 +624,7 @@ class CareerEngine:
         
         # --- Detecção de Mudança de Estado (Alert Engine) ---
         # Dispara alertas se o risco mudar significativamente (ex: LOW -> HIGH)
-        alert_engine.detect_state_change(db, user, level)
+        alert_engine.detect_state_change(db, user, level, snapshots=snapshots)
 
         summary = "Career trajectory stable."
         if level == "HIGH":
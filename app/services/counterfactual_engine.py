@@ -1,4 +1,4 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from app.ml.shap_explainer import shap_explainer
 
 class CounterfactualEngine:
@@ -10,20 +10,29 @@ class CounterfactualEngine:
     key feature improvements (Commit Velocity, Skill Slope, Market Gaps).
     """
 
-    def generate(self, features: Dict[str, Any], current_risk: int) -> Dict[str, Any]:
+    def generate(
+        self,
+        features: Dict[str, Any],
+        current_risk: int,
+        explanation: Optional[Dict] = None
+    ) -> Dict[str, Any]:
         """
         Facade method that now delegates to SHAP-based generation.
         Maintains backward compatibility for the call signature.
+        `explanation` lets callers reuse an attribution already computed.
         """
-        return self.generate_from_shap(features, current_risk)
+        return self.generate_from_shap(features, current_risk, explanation)
 
-    def generate_from_shap(self, features: dict, current_risk: int):
+    def generate_from_shap(
+        self, features: dict, current_risk: int, explanation: Optional[Dict] = None
+    ):
         # 1. Get mathematical explanation
         # features should now contain "avg_confidence" and "commit_velocity"
-        explanation = shap_explainer.explain(
-            features.get("avg_confidence", 0),
-            features.get("commit_velocity", 0)
-        )
+        if explanation is None:
+            explanation = shap_explainer.explain(
+                features.get("avg_confidence", 0),
+                features.get("commit_velocity", 0)
+            )
         actions = []
         
         # 2. Translate SHAP positive contributions (risk drivers) into actions
@@ -0,0 +1,134 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.sqlite_lru import SQLiteLRU
+
+
+def normalize_text(text: str) -> str:
+    """The text actually embedded: surrounding whitespace dropped, inner runs (newlines included) as one space."""
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of embeddings, keyed by sha256(model, normalized text).
+
+    Mentor memories are mostly templated strings repeated across users and
+    days, so the same text is embedded over and over. Lookups go to a
+    per-process LRU of `memory_entries` vectors first, then to a SQLite file
+    shared by all workers (float32 bytes, evicted least-recently-used by entry
+    count and total bytes; app/services/sqlite_lru.py). SQLite calls are
+    synchronous: callers already run in worker threads (the embedder, analyze
+    stages). `self._lock` only guards the memory tier, so a memory hit never
+    waits on another thread's disk I/O.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.EMBEDDING_CACHE_PATH,
+        memory_entries: int = settings.EMBEDDING_CACHE_MEMORY_ENTRIES,
+        max_entries: int = settings.EMBEDDING_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.EMBEDDING_CACHE_MAX_BYTES,
+        enabled: bool = settings.EMBEDDING_CACHE_ENABLED
+    ):
+        self.memory_entries = memory_entries
+        self.enabled = enabled
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._table = SQLiteLRU(
+            path, "embeddings", [("vector", "BLOB")], max_entries, max_bytes, log_name="EmbeddingCache"
+        )
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # -----------------------------------------------------
+    # PUBLIC API
+    # -----------------------------------------------------
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Cached vectors (read-only float32) for the keys found, memory tier first."""
+        if not self.enabled:
+            return {}
+        found: Dict[str, np.ndarray] = {}
+        wanted = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+                else:
+                    wanted.append(key)
+            self.memory_hits += len(found)
+        if not wanted:
+            return found
+
+        from_disk = {
+            key: np.frombuffer(bytes(blob), dtype=np.float32)
+            for key, (blob,) in self._table.get_many(wanted).items()
+        }
+        with self._lock:
+            self.disk_hits += len(from_disk)
+            self.misses += len(wanted) - len(from_disk)
+            for key, vector in from_disk.items():
+                self._remember(key, vector)
+        found.update(from_disk)
+        return found
+
+    def put_many(self, vectors: Dict[str, np.ndarray]):
+        if not self.enabled or not vectors:
+            return
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+        rows = {}
+        for key, vector in vectors.items():
+            blob = np.asarray(vector, dtype=np.float32).tobytes()
+            rows[key] = ((blob,), len(blob))
+        self._table.put_many(rows)
+
+    def stats(self) -> Dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else None,
+            "memory_entries": len(self._memory),
+            "evictions": self._table.evictions,
+            "entries": self._table.entries,
+            "bytes": self._table.bytes,
+            "max_entries": self._table.max_entries,
+            "max_bytes": self._table.max_bytes,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        self._table.clear()
+
+    # -----------------------------------------------------
+    # MEMORY TIER (caller holds self._lock)
+    # -----------------------------------------------------
+    def _remember(self, key: str, vector: np.ndarray):
+        vector = np.asarray(vector, dtype=np.float32)
+        vector.flags.writeable = False      # shared by every caller
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+
+# Singleton Instance
+embedding_cache = EmbeddingCache()
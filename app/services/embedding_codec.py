@@ -0,0 +1,43 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+FLOAT32 = "float32"
+FLOAT16 = "float16"
+INT8 = "int8"
+DTYPES = (FLOAT32, FLOAT16, INT8)
+
+# int8 rows start with their float32 scale (max |x| / 127)
+_SCALE_BYTES = 4
+
+
+def encode(vector: Sequence[float], dtype: str = FLOAT32) -> Tuple[bytes, str]:
+    """Packs an embedding into (bytes, dtype) for MentorMemory.embedding / embedding_dtype."""
+    v = np.asarray(vector, dtype=np.float32)
+    if dtype == FLOAT32:
+        return v.tobytes(), dtype
+    if dtype == FLOAT16:
+        return v.astype(np.float16).tobytes(), dtype
+    if dtype == INT8:
+        peak = float(np.abs(v).max()) if len(v) else 0.0
+        scale = peak / 127 if peak else 1.0
+        q = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).tobytes() + q.tobytes(), dtype
+    raise ValueError(f"unsupported embedding dtype {dtype!r} (expected one of {DTYPES})")
+
+
+def decode(blob: Optional[bytes], dtype: Optional[str]) -> Optional[np.ndarray]:
+    """
+    The stored embedding as a read-only array. float32 and float16 are
+    zero-copy np.frombuffer views over `blob`; int8 is dequantized to float32.
+    """
+    if not blob:
+        return None
+    if dtype in (None, FLOAT32):
+        return np.frombuffer(blob, dtype=np.float32)
+    if dtype == FLOAT16:
+        return np.frombuffer(blob, dtype=np.float16)
+    if dtype == INT8:
+        scale = np.frombuffer(blob, dtype=np.float32, count=1)[0]
+        return np.frombuffer(blob, dtype=np.int8, offset=_SCALE_BYTES) * scale
+    raise ValueError(f"unsupported embedding dtype {dtype!r} (expected one of {DTYPES})")
@@ -1,37 +1,88 @@
 from typing import List
+
+import numpy as np
 from openai import OpenAI
 
+from app.services.embedding_cache import embedding_cache, normalize_text
+
 # ---------------------------------------------------------
 # OPENAI CLIENT CONFIGURATION
 # ---------------------------------------------------------
 # O cliente procurará automaticamente por "OPENAI_API_KEY" nas variáveis de ambiente.
 client = OpenAI()
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Máximo de textos por chamada `input=[...]` (limite da API: 2048)
+MAX_BATCH_INPUTS = 512
+
 
 def embed_text(text: str) -> List[float]:
     """
     Gera um vetor de embedding para o texto fornecido usando
-    o modelo 'text-embedding-3-small' da OpenAI.
+    o modelo 'text-embedding-3-small' da OpenAI (via cache, ver `embed_many`).
     """
     # 1. Validação simples para evitar chamadas de API desnecessárias
     if not text or not text.strip():
         return []
 
-    # 2. Sanitização (Recomendação OpenAI: substituir newlines por espaços)
-    clean_text = text.replace("\n", " ")
-
     try:
-        # 3. Chamada à API
-        response = client.embeddings.create(
-            model="text-embedding-3-small",
-            input=clean_text
-        )
-        
-        # 4. Retorno do vetor
-        return response.data[0].embedding
+        return embed_many([text])[0]
 
     except Exception as e:
         # Log de erro (em produção, use um logger adequado como logging ou sentry)
         print(f"Error generating embedding: {e}")
         # Retorna lista vazia em caso de falha para não quebrar o fluxo
         return []
+
+
+def embed_many(texts: List[str]) -> List[List[float]]:
+    """
+    Embeddings de vários textos, na mesma ordem, passando pelo cache
+    (app/services/embedding_cache.py): só os textos ausentes do cache, sem
+    repetição, vão para a API. Erros da API propagam; textos vazios voltam
+    como lista vazia.
+    """
+    keys = [embedding_cache.key(EMBEDDING_MODEL, t) if t and t.strip() else None for t in texts]
+    found = embedding_cache.get_many(k for k in keys if k)
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key and key not in found:
+            missing.setdefault(key, normalize_text(text))
+
+    if missing:
+        pending = list(missing.items())
+        for i in range(0, len(pending), MAX_BATCH_INPUTS):
+            chunk = pending[i:i + MAX_BATCH_INPUTS]
+            vectors = embed_batch([text for _, text in chunk])
+            fresh = {
+                key: np.asarray(vector, dtype=np.float32)
+                for (key, _), vector in zip(chunk, vectors) if vector
+            }
+            # Cached per chunk: a later failing chunk does not waste this one
+            embedding_cache.put_many(fresh)
+            found.update(fresh)
+
+    return [found[k].tolist() if k in found else [] for k in keys]
+
+
+def embed_batch(texts: List[str]) -> List[List[float]]:
+    """
+    Embeddings de vários textos numa única chamada (`input=[...]`), na mesma
+    ordem, sem cache. Ao contrário de `embed_text`, erros da API propagam
+    (quem chama decide se tenta de novo); textos vazios voltam como lista vazia.
+    """
+    clean = [(i, t.replace("\n", " ")) for i, t in enumerate(texts) if t and t.strip()]
+    vectors: List[List[float]] = [[] for _ in texts]
+    if not clean:
+        return vectors
+
+    response = client.embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=[t for _, t in clean]
+    )
+    # A API devolve os itens com `index` relativo ao input
+    for item in response.data:
+        vectors[clean[item.index][0]] = item.embedding
+    return vectors
@@ -0,0 +1,222 @@
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.career import CareerProfile
+from app.db.models.harvest_job import HarvestJob
+from app.db.models.user import User
+from app.services.job_queue import job_queue, JobQueue, GITHUB_SYNC, PRIORITY_LOW
+
+logger = logging.getLogger(__name__)
+
+# Knuth multiplicative hash: spreads sequential ids evenly over the shards and
+# is plain integer arithmetic, so the database can filter on it too
+_HASH_MULTIPLIER = 2654435761
+_HASH_MODULUS = 2 ** 32
+
+
+def shard_of(user_id: int, shards: int) -> int:
+    return (user_id * _HASH_MULTIPLIER % _HASH_MODULUS) % shards
+
+
+def _shard_filter(column, shard: int, shards: int):
+    return (column * _HASH_MULTIPLIER) % _HASH_MODULUS % shards == shard
+
+
+class Candidate(NamedTuple):
+    user_id: int
+    synced_at: Optional[datetime]
+    commits_last_30_days: int
+    overdue: float          # age / refresh interval; >= 1 means due
+
+
+class FleetRefresher:
+    """
+    Re-harvests every GitHub-connected user on a rolling cadence, so
+    github_activity_metrics does not wait for the next login or verify.
+
+    Each harvest worker (app.jobs.harvest_worker, or the one the app embeds
+    when HARVEST_WORKER_EMBEDDED) owns one shard of the users (hash of the
+    user id; FLEET_REHARVEST_SHARD of FLEET_REHARVEST_SHARDS) and, every
+    `cycle_seconds`, queues GITHUB_SYNC jobs at PRIORITY_LOW for the users of
+    its shard that are due: active users (commits in the last 30 days) after
+    `interval_seconds`, idle ones after `interval_seconds * idle_multiplier`, counted from the last sync or, if
+    later, the last finished attempt (so failing users are retried at the
+    same cadence instead of every cycle). The most overdue go first, and the
+    number queued per cycle is capped by this shard's share of the fleet-wide
+    GitHub request budget, minus what the shard still has queued.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue = job_queue,
+        interval_seconds: float = settings.FLEET_REHARVEST_INTERVAL_SECONDS,
+        idle_multiplier: float = settings.FLEET_REHARVEST_IDLE_MULTIPLIER,
+        cycle_seconds: float = settings.FLEET_REHARVEST_CYCLE_SECONDS,
+        requests_per_hour: int = settings.FLEET_REHARVEST_GITHUB_REQUESTS_PER_HOUR,
+        requests_per_sync: int = settings.FLEET_REHARVEST_REQUESTS_PER_SYNC
+    ):
+        self.queue = queue
+        self.interval_seconds = interval_seconds
+        self.idle_multiplier = idle_multiplier
+        self.cycle_seconds = cycle_seconds
+        self.requests_per_hour = requests_per_hour
+        self.requests_per_sync = requests_per_sync
+
+    # -----------------------------------------------------
+    # PLANNING
+    # -----------------------------------------------------
+    def cycle_budget(self, shards: int) -> int:
+        """Syncs one shard may queue per cycle under the global request budget."""
+        syncs_per_hour = self.requests_per_hour / max(self.requests_per_sync, 1)
+        return int(syncs_per_hour * self.cycle_seconds / 3600 / shards)
+
+    def plan(self, db: Session, shard: int = 0, shards: int = 1, now: Optional[datetime] = None) -> List[Candidate]:
+        """Due users of the shard without a pending sync, most overdue first."""
+        now = now or datetime.utcnow()
+        pending = {
+            user_id for (user_id,) in db.query(HarvestJob.user_id).filter(
+                HarvestJob.kind == GITHUB_SYNC,
+                HarvestJob.status.in_(("queued", "running")),
+                _shard_filter(HarvestJob.user_id, shard, shards)
+            )
+        }
+
+        # Latest finished sync per user, failed ones included: a user whose sync
+        # keeps failing never gets a fresh synced_at, and would otherwise stay
+        # at the head of every cycle
+        attempted = dict(
+            db.query(HarvestJob.user_id, func.max(HarvestJob.finished_at)).filter(
+                HarvestJob.kind == GITHUB_SYNC,
+                HarvestJob.status.in_(("done", "failed")),
+                _shard_filter(HarvestJob.user_id, shard, shards)
+            ).group_by(HarvestJob.user_id).all()
+        )
+
+        due = []
+        for user_id, metrics in self._connected(db, shard, shards):
+            if user_id in pending:
+                continue
+            candidate = self._candidate(user_id, metrics, now, attempted.get(user_id))
+            if candidate.overdue >= 1:
+                due.append(candidate)
+        # Never-synced users (inf) first, then by staleness, busiest accounts on ties
+        due.sort(key=lambda c: (-c.overdue, -c.commits_last_30_days, c.user_id))
+        return due
+
+    def run_cycle(self, db: Session, shard: int = 0, shards: int = 1) -> Dict:
+        """Queues the due users of the shard that fit in this cycle's budget."""
+        due = self.plan(db, shard, shards)
+        queued = db.query(func.count(HarvestJob.id)).filter(
+            HarvestJob.kind == GITHUB_SYNC,
+            HarvestJob.status == "queued",
+            HarvestJob.priority >= PRIORITY_LOW,
+            _shard_filter(HarvestJob.user_id, shard, shards)
+        ).scalar()
+        # A backlog the workers have not drained yet counts against the budget
+        budget = max(self.cycle_budget(shards) - queued, 0)
+
+        for candidate in due[:budget]:
+            self.queue.enqueue(db, GITHUB_SYNC, candidate.user_id, priority=PRIORITY_LOW)
+
+        stats = {
+            "shard": shard,
+            "shards": shards,
+            "due": len(due),
+            "enqueued": min(len(due), budget),
+            "deferred": max(len(due) - budget, 0),
+            "backlog": queued,
+        }
+        logger.info(f"[FleetRefresher] cycle {stats}")
+        return stats
+
+    def _connected(self, db: Session, shard: int, shards: int):
+        return db.query(User.id, CareerProfile.github_activity_metrics) \
+            .outerjoin(CareerProfile, CareerProfile.user_id == User.id) \
+            .filter(
+                User.github_token.isnot(None),
+                User.is_active.isnot(False),
+                User.is_banned.isnot(True),
+                _shard_filter(User.id, shard, shards)
+            ).all()
+
+    def _candidate(
+        self, user_id: int, metrics: Optional[Dict], now: datetime, attempted_at: Optional[datetime] = None
+    ) -> Candidate:
+        """`overdue` counts from the later of the last sync and the last finished attempt."""
+        metrics = metrics or {}
+        synced_at = _parse_time(metrics.get("synced_at"))
+        commits = metrics.get("commits_last_30_days") or 0
+        interval = self.interval_seconds * (1 if commits > 0 else self.idle_multiplier)
+        since = max((t for t in (synced_at, attempted_at) if t is not None), default=None)
+        if since is None:
+            overdue = math.inf
+        else:
+            overdue = (now - since).total_seconds() / interval
+        return Candidate(user_id, synced_at, commits, overdue)
+
+    # -----------------------------------------------------
+    # FRESHNESS
+    # -----------------------------------------------------
+    def freshness(self, db: Session, now: Optional[datetime] = None) -> Dict:
+        """Age of github_activity_metrics across the whole fleet (all shards)."""
+        now = now or datetime.utcnow()
+        ages, never, overdue = [], 0, 0
+        for user_id, metrics in self._connected(db, 0, 1):
+            candidate = self._candidate(user_id, metrics, now)
+            if candidate.synced_at is None:
+                never += 1
+                continue
+            ages.append((now - candidate.synced_at).total_seconds() / 3600)
+            overdue += candidate.overdue >= 1
+
+        report = {"connected_users": len(ages) + never, "never_synced": never, "overdue": overdue}
+        if ages:
+            p50, p90, p99 = np.percentile(ages, [50, 90, 99])
+            report.update({
+                "age_hours_p50": round(float(p50), 2),
+                "age_hours_p90": round(float(p90), 2),
+                "age_hours_p99": round(float(p99), 2),
+                "age_hours_max": round(max(ages), 2),
+            })
+        return report
+
+    # -----------------------------------------------------
+    # LOOP
+    # -----------------------------------------------------
+    async def run(self, session_factory, shard: int, shards: int, stop: asyncio.Event):
+        """Runs a cycle every `cycle_seconds` until `stop` is set."""
+        logger.info(f"[FleetRefresher] shard {shard}/{shards} started")
+        while not stop.is_set():
+            try:
+                await asyncio.to_thread(self._cycle_sync, session_factory, shard, shards)
+            except Exception:
+                logger.exception(f"[FleetRefresher] shard {shard}/{shards} cycle failed")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.cycle_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def _cycle_sync(self, session_factory, shard: int, shards: int) -> Dict:
+        with session_factory() as db:
+            return self.run_cycle(db, shard, shards)
+
+
+def _parse_time(value) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Singleton Instance
+fleet_refresher = FleetRefresher()
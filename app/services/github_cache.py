@@ -0,0 +1,142 @@
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.services.sqlite_lru import SQLiteLRU, TOUCH_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Headers describing the stored (already decoded) body; never replayed
+_BODY_HEADERS = {"content-length", "content-encoding", "transfer-encoding"}
+
+
+class GitHubResponseCache:
+    """
+    Conditional-request cache for GitHub REST GETs.
+
+    A 200 carrying an ETag or Last-Modified is stored (keyed by URL, Accept
+    and token identity, never the raw token). The next request for the same
+    key replays the validators as If-None-Match / If-Modified-Since; GitHub
+    answers 304 without body and without spending rate limit, and the stored
+    body is served instead.
+
+    Entries live in a bounded SQLite file shared by all workers, evicted
+    least-recently-used by entry count and total body bytes
+    (app/services/sqlite_lru.py). SQLite calls run in a worker thread so the
+    event loop never waits on disk.
+    """
+
+    def __init__(
+        self,
+        path: str = settings.GITHUB_CACHE_PATH,
+        max_entries: int = settings.GITHUB_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.GITHUB_CACHE_MAX_BYTES,
+        enabled: bool = settings.GITHUB_CACHE_ENABLED,
+        touch_interval: float = TOUCH_INTERVAL_SECONDS
+    ):
+        self.enabled = enabled
+        self._table = SQLiteLRU(
+            path, "github_responses",
+            [("url", "TEXT"), ("etag", "TEXT"), ("last_modified", "TEXT"), ("headers", "TEXT"), ("body", "BLOB")],
+            max_entries, max_bytes, touch_interval, log_name="GitHubCache"
+        )
+
+        self.hits = 0           # 304 -> served from the store
+        self.misses = 0         # full 200 download
+        self.uncacheable = 0    # 200 without validators, or non-200
+
+    # -----------------------------------------------------
+    # PUBLIC API
+    # -----------------------------------------------------
+    async def get(self, client: httpx.AsyncClient, url: str, headers: Dict[str, str]) -> httpx.Response:
+        """Drop-in for `client.get(url, headers=headers)`."""
+        if not self.enabled:
+            return await client.get(url, headers=headers)
+
+        key = self._key(url, headers)
+        cached = await asyncio.to_thread(self._load, key)
+
+        request_headers = dict(headers)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+
+        response = await client.get(url, headers=request_headers)
+
+        if response.status_code == 304 and cached is not None:
+            self.hits += 1
+            _, _, stored_headers, body = cached
+            # Fresh rate-limit/date headers from the 304 over the stored ones
+            stored_headers.update(
+                (k, v) for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS
+            )
+            return httpx.Response(200, headers=stored_headers, content=body, request=response.request)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (isinstance(etag, str) or isinstance(last_modified, str)):
+            self.misses += 1
+            stored_headers = {
+                k: v for k, v in response.headers.items() if k.lower() not in _BODY_HEADERS
+            }
+            await asyncio.to_thread(
+                self._store, key, url,
+                etag if isinstance(etag, str) else None,
+                last_modified if isinstance(last_modified, str) else None,
+                stored_headers, response.content
+            )
+        else:
+            self.uncacheable += 1
+        return response
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncacheable": self.uncacheable,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            "evictions": self._table.evictions,
+            "entries": self._table.entries,
+            "bytes": self._table.bytes,
+            "max_entries": self._table.max_entries,
+            "max_bytes": self._table.max_bytes,
+        }
+
+    def clear(self):
+        self._table.clear()
+
+    # -----------------------------------------------------
+    # STORE (runs in worker threads)
+    # -----------------------------------------------------
+    @staticmethod
+    def _key(url: str, headers: Dict[str, str]) -> str:
+        auth = headers.get("Authorization", "")
+        accept = headers.get("Accept", "")
+        return hashlib.sha256(f"{auth}\n{accept}\n{url}".encode("utf-8")).hexdigest()
+
+    def _load(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], Dict[str, str], bytes]]:
+        row = self._table.get_many([key]).get(key)
+        if row is None:
+            return None
+        _, etag, last_modified, headers, body = row
+        return etag, last_modified, json.loads(headers), bytes(body)
+
+    def _store(self, key: str, url: str, etag: Optional[str], last_modified: Optional[str],
+               headers: Dict[str, str], body: bytes):
+        if len(body) > self._table.max_bytes:
+            return
+        self._table.put_many({key: ((url, etag, last_modified, json.dumps(headers), body), len(body))})
+
+
+# Singleton Instance
+github_cache = GitHubResponseCache()
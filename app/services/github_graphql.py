@@ -0,0 +1,98 @@
+import re
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# GitHub caps `first` at 100 nodes per connection
+MAX_PAGE_SIZE = 100
+
+
+def blob_alias(filename: str) -> str:
+    """GraphQL-safe alias for a root file (ex: "package.json" -> "file_package_json")."""
+    return "file_" + re.sub(r"[^0-9A-Za-z_]", "_", filename)
+
+
+def build_repositories_query(filenames: Iterable[str]) -> str:
+    """
+    One page of the viewer's owned repos, most recently updated first, with
+    language byte sizes and the text of each root dependency file in
+    `filenames` (null when absent, binary or too large).
+
+    The commit count comes from contributionsCollection, so the whole harvest
+    needs no other request.
+    """
+    blobs = "\n".join(
+        f'        {blob_alias(name)}: object(expression: "HEAD:{name}") {{ ... on Blob {{ text }} }}'
+        for name in filenames
+    )
+    return f"""
+query($first: Int!, $after: String, $since: DateTime!) {{
+  viewer {{
+    login
+    contributionsCollection(from: $since) {{ totalCommitContributions }}
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER,
+                 orderBy: {{field: UPDATED_AT, direction: DESC}}) {{
+      pageInfo {{ hasNextPage endCursor }}
+      nodes {{
+        name
+        nameWithOwner
+        pushedAt
+        languages(first: 100) {{ edges {{ size node {{ name }} }} }}
+{blobs}
+      }}
+    }}
+  }}
+}}
+""".strip()
+
+
+def query_variables(first: int, after: Optional[str], since: datetime) -> Dict[str, Any]:
+    return {
+        "first": min(first, MAX_PAGE_SIZE),
+        "after": after,
+        "since": since.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }
+
+
+def parse_repositories_page(
+    payload: Dict[str, Any],
+    filenames: Iterable[str]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Splits a response into (viewer info, repos). Each repo is
+    {"name", "full_name", "pushed_at", "languages": {lang: bytes},
+    "files": {filename: text}}. Raises ValueError when there is no data.
+    """
+    viewer = (payload.get("data") or {}).get("viewer")
+    if not viewer:
+        raise ValueError(f"GraphQL error: {payload.get('errors')}")
+
+    repos = []
+    connection = viewer.get("repositories") or {}
+    for node in connection.get("nodes") or []:
+        if not node:
+            continue
+        files = {}
+        for name in filenames:
+            blob = node.get(blob_alias(name))
+            if blob and blob.get("text") is not None:
+                files[name] = blob["text"]
+        repos.append({
+            "name": node.get("name"),
+            "full_name": node.get("nameWithOwner") or node.get("name"),
+            "pushed_at": node.get("pushedAt"),
+            "languages": {
+                edge["node"]["name"]: edge["size"]
+                for edge in (node.get("languages") or {}).get("edges") or []
+            },
+            "files": files,
+        })
+
+    info = {
+        "login": viewer.get("login"),
+        "commits": (viewer.get("contributionsCollection") or {}).get("totalCommitContributions", 0),
+        "has_next_page": bool((connection.get("pageInfo") or {}).get("hasNextPage")),
+        "end_cursor": (connection.get("pageInfo") or {}).get("endCursor"),
+    }
+    return info, repos
@@ -5,6 +5,7 @@ from app.db.models.user import User
 from app.db.models.career import CareerProfile
 from app.db.models.weekly_routine import WeeklyRoutine
 from app.services.social_harvester import social_harvester
+from app.services.harvest_scheduler import harvest_priority, PRIORITY_INTERACTIVE
 from app.db.session import SessionLocal
 import logging
 
@@ -238,8 +239,9 @@ class GrowthEngine:
 
         # Trigger Harvest
         if user.github_token:
-             # Use the async harvester
-             await social_harvester.sync_profile(user.id, user.github_token)
+             # Use the async harvester (user is waiting: ahead of background harvests)
+             with harvest_priority(PRIORITY_INTERACTIVE):
+                 await social_harvester.sync_profile(user.id, user.github_token)
         else:
              # Simulation / Fail
              return {"success": False, "message": "GitHub Token required for verification."}
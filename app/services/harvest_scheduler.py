@@ -0,0 +1,326 @@
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# =========================================================
+# PRIORITIES
+# =========================================================
+# Lower runs first. The priority travels with the asyncio context, so every
+# request made under `harvest_priority(...)` (including gathered sub-tasks)
+# is queued with it. Queues live in this process only; across processes
+# (app.jobs.harvest_worker runs the queued harvests) the ordering comes from
+# the background reserve: the rate-limit headers count every process's calls
+# on the token, and background requests stop once it is down to the reserve.
+PRIORITY_INTERACTIVE = 0    # a user is waiting (verify_task, dashboard, career scan)
+PRIORITY_BACKGROUND = 10    # queued harvest jobs (app.jobs.harvest_worker)
+
+_priority: ContextVar[int] = ContextVar("harvest_priority", default=PRIORITY_INTERACTIVE)
+
+_PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BACKGROUND: "background"}
+
+# One concurrent request per this many calls left in the window
+REMAINING_PER_SLOT = 10
+
+# Idle budgets (nothing in flight or queued, rate-limit window over) are
+# dropped at most this often
+PRUNE_INTERVAL_SECONDS = 60.0
+
+
+@contextmanager
+def harvest_priority(level: int):
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+# =========================================================
+# BUDGETS
+# =========================================================
+
+class _Budget:
+    """Rate-limit state of one (token, host) pair, as last reported by the host."""
+    __slots__ = ("remaining", "limit", "reset_at", "blocked_until", "in_flight", "waiters", "timer")
+
+    def __init__(self):
+        self.remaining: Optional[int] = None
+        self.limit: Optional[int] = None
+        self.reset_at: Optional[float] = None      # epoch seconds (X-RateLimit-Reset)
+        self.blocked_until = 0.0                   # epoch seconds (Retry-After / exhausted)
+        self.in_flight = 0
+        self.waiters: List[Tuple[int, int, asyncio.Future, float]] = []
+        self.timer: Optional[Tuple[asyncio.AbstractEventLoop, asyncio.TimerHandle]] = None
+
+
+class _Slot:
+    def __init__(self, scheduler: "HarvestScheduler", budget: _Budget):
+        self._scheduler = scheduler
+        self._budget = budget
+
+    def observe(self, response: httpx.Response) -> bool:
+        """Feeds the response's rate-limit headers back. True if it was throttled."""
+        return self._scheduler._observe(self._budget, response)
+
+
+class HarvestScheduler:
+    """
+    Paces outbound harvest requests per (token, host).
+
+    Concurrency per budget starts at `max_concurrency` and shrinks as
+    X-RateLimit-Remaining drops (one slot per REMAINING_PER_SLOT calls left).
+    An exhausted budget, a 429, or a secondary-limit 403 with Retry-After
+    blocks the budget until X-RateLimit-Reset / Retry-After; queued requests
+    then resume in priority order, and `get` retries the throttled call.
+
+    Background requests also leave the last `background_reserve` share of
+    X-RateLimit-Limit to interactive ones, waiting for the reset instead.
+    Queues are per process, but the headers reflect every process's calls on
+    the token, so this reserve is what keeps a harvest worker from draining
+    the limit an interactive call in the app needs.
+    Budgets that went idle are pruned, so a long-lived worker touching every
+    connected user's token does not keep one per user forever.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.HARVEST_MAX_CONCURRENCY_PER_HOST,
+        max_retries: int = settings.HARVEST_MAX_RETRIES,
+        background_reserve: float = settings.HARVEST_BACKGROUND_RESERVE,
+        clock: Callable[[], float] = time.time
+    ):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.background_reserve = background_reserve
+        self.clock = clock
+        self._budgets: Dict[Tuple[str, str], _Budget] = {}
+        self._seq = itertools.count()
+        self._pruned_at = 0.0
+
+        self.granted = 0
+        self.throttled = 0
+        self.retries = 0
+        self._waits: Dict[str, List[float]] = {}   # priority -> [count, total_s, max_s]
+
+    # -----------------------------------------------------
+    # PUBLIC API
+    # -----------------------------------------------------
+    async def get(
+        self,
+        headers: Dict[str, str],
+        url: str,
+        send: Callable[[], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """Runs `send()` in a slot of the request's budget, retrying throttled responses."""
+        for attempt in range(self.max_retries + 1):
+            async with self.slot(headers, url) as slot:
+                response = await send()
+                throttled = slot.observe(response)
+            if not throttled or attempt == self.max_retries:
+                return response
+            self.retries += 1
+            logger.warning(f"[HarvestScheduler] throttled on {urlsplit(url).hostname}, retry {attempt + 1}")
+        return response
+
+    @asynccontextmanager
+    async def slot(self, headers: Dict[str, str], url: str):
+        """Waits for a slot of the (token, host) budget; for streamed calls."""
+        budget = self._budget(headers, url)
+        await self._acquire(budget)
+        try:
+            yield _Slot(self, budget)
+        finally:
+            budget.in_flight -= 1
+            self._dispatch(budget)
+
+    def stats(self) -> Dict:
+        now = self.clock()
+        self._prune(now)
+        budgets = {}
+        for (token_id, host), budget in list(self._budgets.items()):
+            slots, reopens_in = self._capacity(budget, now)
+            budgets[f"{token_id}@{host}"] = {
+                "remaining": budget.remaining,
+                "limit": budget.limit,
+                "reset_in_s": round(budget.reset_at - now, 1) if budget.reset_at else None,
+                "blocked_for_s": round(reopens_in, 1),
+                "concurrency": slots,
+                "in_flight": budget.in_flight,
+                "queued": sum(1 for w in budget.waiters if not w[2].done()),
+            }
+        return {
+            "queue_depth": sum(b["queued"] for b in budgets.values()),
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "wait_ms": {
+                name: {
+                    "count": int(count),
+                    "avg": round(total / count * 1000, 1) if count else 0.0,
+                    "max": round(peak * 1000, 1),
+                }
+                for name, (count, total, peak) in self._waits.items()
+            },
+            "budgets": budgets,
+        }
+
+    # -----------------------------------------------------
+    # QUEUE
+    # -----------------------------------------------------
+    def _budget(self, headers: Dict[str, str], url: str) -> _Budget:
+        auth = headers.get("Authorization", "")
+        token_id = hashlib.sha256(auth.encode("utf-8")).hexdigest()[:12] if auth else "anonymous"
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        if parts.path == "/graphql":
+            host += "/graphql"   # GitHub meters GraphQL separately (points, not calls)
+        key = (token_id, host)
+        self._prune(self.clock())
+        budget = self._budgets.get(key)
+        if budget is None:
+            budget = self._budgets[key] = _Budget()
+        return budget
+
+    def _prune(self, now: float):
+        """Drops idle budgets: nothing in flight or queued, not blocked, window reset."""
+        if now - self._pruned_at < PRUNE_INTERVAL_SECONDS:
+            return
+        self._pruned_at = now
+        idle = [
+            key for key, budget in self._budgets.items()
+            if budget.in_flight == 0
+            and budget.timer is None
+            and not any(not w[2].done() for w in budget.waiters)
+            and budget.blocked_until <= now
+            and (budget.reset_at is None or budget.reset_at <= now)
+        ]
+        for key in idle:
+            del self._budgets[key]
+
+    def _capacity(self, budget: _Budget, now: float, priority: int = PRIORITY_INTERACTIVE) -> Tuple[int, float]:
+        """(slots allowed right now for `priority`, seconds until the budget reopens)."""
+        if budget.blocked_until > now:
+            return 0, budget.blocked_until - now
+        if priority >= PRIORITY_BACKGROUND and self._in_reserve(budget, now):
+            return 0, budget.reset_at - now
+        if budget.remaining is None:
+            return self.max_concurrency, 0.0
+        if budget.remaining <= 0:
+            if budget.reset_at and budget.reset_at > now:
+                return 0, budget.reset_at - now
+            return 1, 0.0   # window rolled over: probe with a single call
+        return max(1, min(self.max_concurrency, budget.remaining // REMAINING_PER_SLOT)), 0.0
+
+    def _in_reserve(self, budget: _Budget, now: float) -> bool:
+        """True if the calls left are down to the share kept for interactive requests."""
+        return (
+            budget.remaining is not None
+            and bool(budget.limit)
+            and budget.reset_at is not None and budget.reset_at > now
+            and budget.remaining < budget.limit * self.background_reserve
+        )
+
+    async def _acquire(self, budget: _Budget):
+        priority = _priority.get()
+        enqueued = time.monotonic()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(budget.waiters, (priority, next(self._seq), future, enqueued))
+        self._dispatch(budget)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted and cancelled in the same tick: hand the slot back
+                budget.in_flight -= 1
+                self._dispatch(budget)
+            raise
+        self._record_wait(priority, time.monotonic() - enqueued)
+
+    def _dispatch(self, budget: _Budget):
+        while budget.waiters:
+            priority, _, future, _ = budget.waiters[0]
+            if future.done() or future.get_loop().is_closed():
+                heapq.heappop(budget.waiters)   # cancelled while queued
+                continue
+
+            # The head is the most urgent waiter: a background one means none is interactive
+            slots, reopens_in = self._capacity(budget, self.clock(), priority)
+            if reopens_in > 0:
+                loop = asyncio.get_running_loop()
+                if budget.timer is None or budget.timer[0] is not loop:
+                    budget.timer = (loop, loop.call_later(reopens_in, self._reopen, budget))
+                return
+            if budget.in_flight >= slots:
+                return
+
+            _, _, future, _ = heapq.heappop(budget.waiters)
+            budget.in_flight += 1
+            self.granted += 1
+            future.set_result(None)
+
+    def _reopen(self, budget: _Budget):
+        budget.timer = None
+        self._dispatch(budget)
+
+    def _record_wait(self, priority: int, waited: float):
+        name = _PRIORITY_NAMES.get(priority, str(priority))
+        entry = self._waits.setdefault(name, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += waited
+        entry[2] = max(entry[2], waited)
+
+    # -----------------------------------------------------
+    # RATE-LIMIT HEADERS
+    # -----------------------------------------------------
+    def _observe(self, budget: _Budget, response: httpx.Response) -> bool:
+        headers = response.headers
+        now = self.clock()
+
+        remaining = _num_header(headers, "X-RateLimit-Remaining")
+        if remaining is not None:
+            budget.remaining = int(remaining)
+            limit = _num_header(headers, "X-RateLimit-Limit")
+            budget.limit = int(limit) if limit is not None else budget.limit
+            budget.reset_at = _num_header(headers, "X-RateLimit-Reset") or budget.reset_at
+
+        status = response.status_code
+        retry_after = _num_header(headers, "Retry-After")
+        throttled = False
+        if status == 429 or (status == 403 and retry_after is not None):
+            # Secondary limit: wait as told (GitHub suggests >= 60s without the header)
+            budget.blocked_until = now + (retry_after if retry_after is not None else 60)
+            throttled = True
+        elif status == 403 and remaining == 0:
+            budget.blocked_until = budget.reset_at or now + 60
+            throttled = True
+
+        if throttled:
+            self.throttled += 1
+        return throttled
+
+
+def _num_header(headers, name: str) -> Optional[float]:
+    value = headers.get(name)
+    if not isinstance(value, str):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+# Singleton Instance
+harvest_scheduler = HarvestScheduler()
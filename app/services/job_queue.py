@@ -0,0 +1,236 @@
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.harvest_job import HarvestJob
+
+logger = logging.getLogger(__name__)
+
+GITHUB_SYNC = "github_sync"
+LINKEDIN_SYNC = "linkedin_sync"
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+
+class JobQueue:
+    """
+    DB-backed queue of harvest jobs (table harvest_jobs).
+
+    Web workers only `enqueue`; app.jobs.harvest_worker `claim`s due jobs
+    (FOR UPDATE SKIP LOCKED on Postgres, so several workers never block on
+    or double-take the same row), runs them and reports `complete`/`fail`.
+    Failures are retried with exponential backoff up to `max_attempts`;
+    jobs whose worker died are re-queued once their lease expires.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        backoff_base: float = settings.JOB_BACKOFF_BASE_SECONDS,
+        backoff_max: float = settings.JOB_BACKOFF_MAX_SECONDS,
+        lease_seconds: int = settings.JOB_LEASE_SECONDS
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.lease_seconds = lease_seconds
+
+    # -----------------------------------------------------
+    # PRODUCER
+    # -----------------------------------------------------
+    def enqueue(
+        self,
+        db: Session,
+        kind: str,
+        user_id: int,
+        payload: Optional[Dict] = None,
+        priority: int = PRIORITY_NORMAL,
+        delay_seconds: float = 0
+    ) -> HarvestJob:
+        """
+        Queues `kind` for `user_id`, or returns the job already waiting for
+        it (made due no later than requested, at the higher priority).
+        """
+        dedupe_key = f"{kind}:{user_id}"
+        run_after = datetime.utcnow() + timedelta(seconds=delay_seconds)
+
+        existing = self._queued(db, dedupe_key)
+        if existing is None:
+            job = HarvestJob(
+                kind=kind,
+                user_id=user_id,
+                dedupe_key=dedupe_key,
+                payload=payload,
+                status="queued",
+                priority=priority,
+                attempts=0,
+                max_attempts=self.max_attempts,
+                run_after=run_after
+            )
+            db.add(job)
+            try:
+                db.commit()
+                return job
+            except IntegrityError:
+                # Another request queued it first
+                db.rollback()
+                existing = self._queued(db, dedupe_key)
+                if existing is None:
+                    raise
+
+        existing.priority = min(existing.priority, priority)
+        existing.run_after = min(existing.run_after, run_after)
+        if payload is not None:
+            existing.payload = payload
+        db.commit()
+        return existing
+
+    def _queued(self, db: Session, dedupe_key: str) -> Optional[HarvestJob]:
+        return db.query(HarvestJob).filter(
+            HarvestJob.dedupe_key == dedupe_key,
+            HarvestJob.status == "queued"
+        ).first()
+
+    # -----------------------------------------------------
+    # CONSUMER
+    # -----------------------------------------------------
+    def claim(self, db: Session, worker_id: str, limit: int = 1) -> List[HarvestJob]:
+        """Marks up to `limit` due jobs as running for `worker_id` and returns them."""
+        self._requeue_expired(db, datetime.utcnow())
+        now = datetime.utcnow()
+
+        candidates = (
+            db.query(HarvestJob.id)
+            .filter(HarvestJob.status == "queued", HarvestJob.run_after <= now)
+            .order_by(HarvestJob.priority, HarvestJob.run_after, HarvestJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+        claimed_ids = []
+        for (job_id,) in candidates:
+            # Conditional update: only one worker wins a row (SQLite has no SKIP LOCKED)
+            won = db.query(HarvestJob).filter(
+                HarvestJob.id == job_id, HarvestJob.status == "queued"
+            ).update({
+                HarvestJob.status: "running",
+                HarvestJob.locked_by: worker_id,
+                HarvestJob.locked_at: now,
+                HarvestJob.started_at: now,
+                HarvestJob.attempts: HarvestJob.attempts + 1,
+            }, synchronize_session=False)
+            if won:
+                claimed_ids.append(job_id)
+        db.commit()
+
+        if not claimed_ids:
+            return []
+        return db.query(HarvestJob).filter(HarvestJob.id.in_(claimed_ids)) \
+            .order_by(HarvestJob.priority, HarvestJob.id).all()
+
+    def complete(self, db: Session, job: HarvestJob):
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        job.locked_by = None
+        job.last_error = None
+        db.commit()
+
+    def fail(self, db: Session, job: HarvestJob, error: str, retry: bool = True):
+        """Schedules a retry with exponential backoff, or gives up after max_attempts."""
+        job.last_error = error[:2000]
+        job.locked_by = None
+        if not retry or job.attempts >= job.max_attempts:
+            job.status = "failed"
+            job.finished_at = datetime.utcnow()
+            logger.error(f"[JobQueue] job {job.id} ({job.dedupe_key}) failed for good: {error}")
+        else:
+            delay = self.backoff_delay(job.attempts)
+            job.status = "queued"
+            job.run_after = datetime.utcnow() + timedelta(seconds=delay)
+            logger.warning(
+                f"[JobQueue] job {job.id} ({job.dedupe_key}) attempt {job.attempts} failed, "
+                f"retry in {delay:.0f}s: {error}"
+            )
+        try:
+            db.commit()
+        except IntegrityError:
+            # A fresh job for the same user was queued meanwhile: it supersedes this retry
+            db.rollback()
+            job = db.get(HarvestJob, job.id)
+            job.status = "failed"
+            job.last_error = f"superseded; {error[:1900]}"
+            job.finished_at = datetime.utcnow()
+            job.locked_by = None
+            db.commit()
+
+    def backoff_delay(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** max(attempts - 1, 0)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _requeue_expired(self, db: Session, now: datetime):
+        expired = db.query(HarvestJob).filter(
+            HarvestJob.status == "running",
+            HarvestJob.locked_at < now - timedelta(seconds=self.lease_seconds)
+        ).all()
+        for job in expired:
+            logger.warning(f"[JobQueue] lease expired for job {job.id} (worker {job.locked_by})")
+            self.fail(db, job, "lease expired (worker lost)")
+
+    # -----------------------------------------------------
+    # STATUS
+    # -----------------------------------------------------
+    def status_for_user(self, db: Session, user_id: int) -> Dict[str, Dict]:
+        """Most recent job of each kind for the user."""
+        jobs = (
+            db.query(HarvestJob)
+            .filter(HarvestJob.user_id == user_id)
+            .order_by(HarvestJob.id.desc())
+            .limit(20)
+            .all()
+        )
+        latest: Dict[str, Dict] = {}
+        for job in jobs:
+            if job.kind not in latest:
+                latest[job.kind] = self.describe(job)
+        return latest
+
+    @staticmethod
+    def describe(job: HarvestJob) -> Dict:
+        return {
+            "id": job.id,
+            "kind": job.kind,
+            "status": job.status,
+            "attempts": job.attempts,
+            "max_attempts": job.max_attempts,
+            "run_after": job.run_after.isoformat() if job.run_after else None,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            "last_error": job.last_error,
+        }
+
+    def stats(self, db: Session) -> Dict:
+        counts = dict(
+            db.query(HarvestJob.status, func.count(HarvestJob.id)).group_by(HarvestJob.status).all()
+        )
+        oldest_due = db.query(func.min(HarvestJob.run_after)).filter(
+            HarvestJob.status == "queued", HarvestJob.run_after <= datetime.utcnow()
+        ).scalar()
+        return {
+            "counts": counts,
+            "oldest_due_age_s": round((datetime.utcnow() - oldest_due).total_seconds(), 1)
+            if oldest_due else 0.0,
+        }
+
+
+# Singleton Instance
+job_queue = JobQueue()
@@ -0,0 +1,137 @@
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Set, Tuple
+
+import numpy as np
+
+_HASH_BITS = 16
+_HASH_MASK = (1 << _HASH_BITS) - 1
+
+# With this few keywords left, one `in` scan each beats hashing the window
+DIRECT_SCAN_MAX = 4
+
+
+def _trigram_hash(a: int, b: int, c: int) -> int:
+    return (a * 961 + b * 31 + c) & _HASH_MASK
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive multi-keyword substring matcher over bytes.
+
+    Compiled once per keyword set: every keyword is indexed by a hash of its
+    first 3 bytes. A scan lowercases the data once (C speed), hashes every
+    3-byte window with numpy and keeps only the hashes some keyword starts
+    with; only those keywords are then confirmed with a plain `in`. The cost
+    is a fixed number of passes over the data whatever the number of
+    keywords, where the previous loop did one full scan per keyword.
+
+    Streams are scanned chunk by chunk: a keyword crossing a chunk border is
+    found in the small seam (tail of the previous chunk + head of the next),
+    so chunks are never concatenated, and the scan stops as soon as every
+    keyword has been seen.
+    """
+
+    def __init__(self, keyword_map: Dict[bytes, str]):
+        self.keyword_map = keyword_map
+        self._by_hash: Dict[int, List[bytes]] = {}
+        self._short: List[bytes] = []        # < 3 bytes: checked directly
+        self._lower: Dict[bytes, bytes] = {kw: kw.lower() for kw in keyword_map}
+        for kw, kw_lower in self._lower.items():
+            if len(kw_lower) < 3:
+                self._short.append(kw)
+            else:
+                self._by_hash.setdefault(_trigram_hash(*kw_lower[:3]), []).append(kw)
+        self._table = np.zeros(1 << _HASH_BITS, dtype=bool)
+        if self._by_hash:
+            self._table[list(self._by_hash)] = True
+        self.overlap = max((len(kw) for kw in keyword_map), default=1) - 1
+
+    # -----------------------------------------------------
+    # PUBLIC API
+    # -----------------------------------------------------
+    def find(self, content: bytes) -> List[str]:
+        """Original keyword strings found in `content`, in keyword_map order."""
+        scan = _Scan(self)
+        scan.feed_lowered(content.lower())
+        return scan.result()
+
+    async def find_in_stream(self, stream: AsyncIterator[bytes]) -> List[str]:
+        scan = _Scan(self)
+        async for chunk in stream:
+            if scan.feed(chunk):
+                break   # everything found: stop reading
+        return scan.result()
+
+
+class _Scan:
+    """State of one scan: what is found so far and the seam bytes."""
+
+    def __init__(self, matcher: KeywordMatcher):
+        self.matcher = matcher
+        self.found: Set[bytes] = set()
+        self.pending = len(matcher.keyword_map)
+        self.table = matcher._table.copy()   # hashes whose keywords are all found get cleared
+        self.tail = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        """Scans the next chunk of a stream. True once every keyword was found."""
+        lowered = chunk.lower()
+        overlap = self.matcher.overlap
+        if overlap and self.tail:
+            self.feed_lowered(self.tail + lowered[:overlap])
+        self.feed_lowered(lowered)
+        if overlap:
+            self.tail = lowered[-overlap:] if len(lowered) >= overlap else (self.tail + lowered)[-overlap:]
+        return self.pending == 0
+
+    def feed_lowered(self, data: bytes):
+        matcher = self.matcher
+        if self.pending <= DIRECT_SCAN_MAX:
+            for kw, kw_lower in matcher._lower.items():
+                if kw not in self.found and kw_lower in data:
+                    self._add(kw)
+            return
+
+        for kw in matcher._short:
+            if kw not in self.found and matcher._lower[kw] in data:
+                self._add(kw)
+        if len(data) < 3:
+            return
+
+        # Same hash as _trigram_hash: uint16 arithmetic wraps mod 2**16
+        window = np.frombuffer(data, dtype=np.uint8).astype(np.uint16)
+        hashes = window[:-2] * np.uint16(961)
+        hashes += window[1:-1] * np.uint16(31)
+        hashes += window[2:]
+        mask = self.table[hashes]
+        if not mask.any():
+            return
+        hits = hashes[mask]
+        for h in np.unique(hits).tolist():
+            remaining = False
+            for kw in matcher._by_hash[h]:
+                if kw in self.found:
+                    continue
+                if matcher._lower[kw] in data:
+                    self._add(kw)
+                else:
+                    remaining = True
+            if not remaining:
+                self.table[h] = False
+
+    def _add(self, kw: bytes):
+        self.found.add(kw)
+        self.pending -= 1
+
+    def result(self) -> List[str]:
+        return [original for kw, original in self.matcher.keyword_map.items() if kw in self.found]
+
+
+@lru_cache(maxsize=64)
+def _compiled(items: Tuple[Tuple[bytes, str], ...]) -> KeywordMatcher:
+    return KeywordMatcher(dict(items))
+
+
+def matcher_for(keyword_map: Dict[bytes, str]) -> KeywordMatcher:
+    """Compiled matcher for `keyword_map`, shared by every scan of the same keywords."""
+    return _compiled(tuple(keyword_map.items()))
@@ -0,0 +1,256 @@
+import logging
+import weakref
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import event, func, inspect, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, object_session
+
+from app.db.models.analytics import RiskSnapshot
+from app.db.models.career import CareerProfile
+from app.db.models.latest_risk import LatestRisk
+
+logger = logging.getLogger(__name__)
+
+COHORT_FIELDS = ("company", "region", "organization", "team")
+
+# In-memory views built on latest_risk (objects exposing mark_dirty(user_id))
+_subscribers = weakref.WeakSet()
+_PENDING_KEY = "latest_risk_pending"
+
+
+def subscribe(view) -> None:
+    """Registers a view to be told which users changed, once the change is committed."""
+    _subscribers.add(view)
+
+
+# ---------------------------------------------------------
+# UPSERT (DIALECT AWARE)
+# ---------------------------------------------------------
+def _insert_for(connection: Connection):
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        return insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        return insert
+    return None
+
+
+def upsert_latest_risk(connection: Connection, values: Dict) -> None:
+    """
+    Inserts or replaces the user's row, unless the stored snapshot is newer
+    (out-of-order writes and backfills never move the projection backwards).
+    """
+    upsert_latest_risk_many(connection, [values])
+
+
+def upsert_latest_risk_many(connection: Connection, rows: List[Dict]) -> None:
+    """Bulk form of upsert_latest_risk: one executemany for all rows."""
+    if not rows:
+        return
+    insert = _insert_for(connection)
+    table = LatestRisk.__table__
+
+    if insert is None:
+        # Generic fallback: UPDATE guarded by recency, then INSERT when missing
+        for values in rows:
+            exists = connection.execute(
+                select(table.c.user_id).where(table.c.user_id == values["user_id"])
+            ).first()
+            if exists:
+                connection.execute(
+                    update(table)
+                    .where(table.c.user_id == values["user_id"])
+                    .where(or_(
+                        table.c.recorded_at.is_(None),
+                        table.c.recorded_at <= values["recorded_at"]
+                    ))
+                    .values(**values)
+                )
+            else:
+                connection.execute(table.insert().values(**values))
+        return
+
+    stmt = insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={k: stmt.excluded[k] for k in rows[0] if k != "user_id"},
+        where=or_(
+            table.c.recorded_at.is_(None),
+            table.c.recorded_at <= stmt.excluded.recorded_at
+        )
+    )
+    connection.execute(stmt, rows)
+
+
+def cohorts_for(connection: Connection, user_ids: List[int]) -> Dict[int, Dict[str, Optional[str]]]:
+    """Cohort columns of many users in one query: {user_id: {field: value}}."""
+    profiles = CareerProfile.__table__
+    cohorts = {uid: {f: None for f in COHORT_FIELDS} for uid in user_ids}
+    for row in connection.execute(
+        select(profiles.c.user_id, *[profiles.c[f] for f in COHORT_FIELDS])
+        .where(profiles.c.user_id.in_(user_ids))
+    ):
+        cohorts[row[0]] = dict(zip(COHORT_FIELDS, row[1:]))
+    return cohorts
+
+
+def _cohort_for(connection: Connection, user_id: int) -> Dict[str, Optional[str]]:
+    profiles = CareerProfile.__table__
+    row = connection.execute(
+        select(*[profiles.c[f] for f in COHORT_FIELDS])
+        .where(profiles.c.user_id == user_id)
+    ).first()
+    if not row:
+        return {f: None for f in COHORT_FIELDS}
+    return dict(zip(COHORT_FIELDS, row))
+
+
+# ---------------------------------------------------------
+# INCREMENTAL MAINTENANCE (ORM EVENTS)
+# ---------------------------------------------------------
+@event.listens_for(RiskSnapshot, "after_insert")
+def _on_snapshot_insert(mapper, connection, target: RiskSnapshot):
+    values = {
+        "user_id": target.user_id,
+        "snapshot_id": target.id,
+        "risk_score": target.risk_score,
+        "risk_level": target.risk_level,
+        "recorded_at": target.recorded_at or datetime.utcnow(),
+        "updated_at": datetime.utcnow(),
+    }
+    values.update(_cohort_for(connection, target.user_id))
+    upsert_latest_risk(connection, values)
+    _queue_change(target)
+
+
+@event.listens_for(CareerProfile, "after_insert")
+@event.listens_for(CareerProfile, "after_update")
+def _on_profile_change(mapper, connection, target: CareerProfile):
+    state = inspect(target)
+    if not any(state.attrs[f].history.has_changes() for f in COHORT_FIELDS):
+        return
+
+    table = LatestRisk.__table__
+    connection.execute(
+        update(table)
+        .where(table.c.user_id == target.user_id)
+        .values(
+            updated_at=datetime.utcnow(),
+            **{f: getattr(target, f) for f in COHORT_FIELDS}
+        )
+    )
+    _queue_change(target)
+
+
+# ---------------------------------------------------------
+# CHANGE NOTIFICATIONS
+# ---------------------------------------------------------
+# Changed users are only published on commit, so a subscriber never consumes
+# a dirty mark before the new latest_risk row is visible to it.
+def _queue_change(target):
+    session = object_session(target)
+    if session is not None:
+        queue_changes(session, [target.user_id])
+
+
+def queue_changes(session: Session, user_ids: Iterable[int]) -> None:
+    """
+    Publishes users whose latest_risk row changed when `session` commits.
+    Bulk writers that bypass ORM events call this directly.
+    """
+    session.info.setdefault(_PENDING_KEY, set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _on_commit(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    for view in list(_subscribers):
+        for user_id in pending:
+            view.mark_dirty(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _on_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------
+# BACKFILL
+# ---------------------------------------------------------
+def rebuild_latest_risk(db: Session, batch_size: int = 500) -> int:
+    """
+    Rebuilds the projection from the full snapshot history, in batches of
+    users (one commit per batch). Safe to run on a live system.
+    Returns the number of users written.
+    """
+    ranked = (
+        select(
+            RiskSnapshot.id,
+            RiskSnapshot.user_id,
+            RiskSnapshot.risk_score,
+            RiskSnapshot.risk_level,
+            RiskSnapshot.recorded_at,
+            func.row_number().over(
+                partition_by=RiskSnapshot.user_id,
+                order_by=(RiskSnapshot.recorded_at.desc(), RiskSnapshot.id.desc())
+            ).label("rn")
+        )
+        .subquery()
+    )
+
+    written = 0
+    last_user_id = 0
+    while True:
+        user_ids = [
+            row[0] for row in db.execute(
+                select(RiskSnapshot.user_id)
+                .where(RiskSnapshot.user_id > last_user_id)
+                .group_by(RiskSnapshot.user_id)
+                .order_by(RiskSnapshot.user_id)
+                .limit(batch_size)
+            )
+        ]
+        if not user_ids:
+            break
+
+        rows = db.execute(
+            select(
+                ranked.c.id,
+                ranked.c.user_id,
+                ranked.c.risk_score,
+                ranked.c.risk_level,
+                ranked.c.recorded_at,
+                *[CareerProfile.__table__.c[f] for f in COHORT_FIELDS]
+            )
+            .select_from(ranked)
+            .outerjoin(CareerProfile, CareerProfile.user_id == ranked.c.user_id)
+            .where(ranked.c.rn == 1)
+            .where(ranked.c.user_id.in_(user_ids))
+        ).all()
+
+        connection = db.connection()
+        now = datetime.utcnow()
+        for row in rows:
+            values = {
+                "user_id": row.user_id,
+                "snapshot_id": row.id,
+                "risk_score": row.risk_score,
+                "risk_level": row.risk_level,
+                "recorded_at": row.recorded_at or now,
+                "updated_at": now,
+            }
+            values.update({f: getattr(row, f) for f in COHORT_FIELDS})
+            upsert_latest_risk(connection, values)
+
+        db.commit()
+        written += len(rows)
+        last_user_id = user_ids[-1]
+        logger.info(f"[LatestRisk] backfilled {written} users (up to user_id={last_user_id})")
+
+    return written
@@ -0,0 +1,491 @@
+import json
+import re
+from typing import AsyncIterator, Callable, Dict, Iterable, List, NamedTuple, Optional
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+from app.core.config import settings
+
+
+class Dependency(NamedTuple):
+    name: str                  # normalized per ecosystem (see each parser)
+    version: Optional[str]     # as declared (pin, range, ${property}...)
+
+
+class ManifestParseError(ValueError):
+    pass
+
+
+# =========================================================
+# BASE PARSERS
+# =========================================================
+
+class _ManifestParser:
+    """
+    Incremental parser: `feed` chunks as they arrive, `close` at the end.
+    `feed` returns True once the dependency sections are fully consumed, so
+    the caller can stop downloading the rest of the file.
+    """
+
+    def __init__(self):
+        self.dependencies: List[Dependency] = []
+        self.done = False
+
+    def feed(self, chunk: bytes) -> bool:
+        raise NotImplementedError
+
+    def close(self, complete: bool = True) -> List[Dependency]:
+        """`complete=False` when the stream was cut short (byte cap)."""
+        return self.dependencies
+
+    def _add(self, name: str, version: Optional[str] = None):
+        dep = Dependency(name, version or None)
+        if name and dep not in self.dependencies:
+            self.dependencies.append(dep)
+
+
+class _LineParser(_ManifestParser):
+    """Splits the stream into decoded lines; subclasses implement `_line`."""
+
+    def __init__(self):
+        super().__init__()
+        self._partial = b""
+
+    def feed(self, chunk: bytes) -> bool:
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._line(line.decode("utf-8", "replace").rstrip("\r"))
+            if self.done:
+                break
+        return self.done
+
+    def close(self, complete: bool = True) -> List[Dependency]:
+        if self._partial and not self.done and complete:
+            self._line(self._partial.decode("utf-8", "replace"))
+        self._partial = b""
+        return self.dependencies
+
+    def _line(self, line: str):
+        raise NotImplementedError
+
+
+# =========================================================
+# PYTHON / GO / RUBY / RUST
+# =========================================================
+
+def normalize_python_name(name: str) -> str:
+    """PEP 503 normalization ("Scikit_Learn" -> "scikit-learn")."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class RequirementsParser(_LineParser):
+    """requirements.txt: one requirement per line; options and includes are skipped."""
+
+    _REQ = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*((?:===?|~=|!=|>=|<=|>|<)[^;#]*)?")
+    _EGG = re.compile(r"#egg=([A-Za-z0-9][A-Za-z0-9._-]*)")
+
+    def _line(self, line: str):
+        line = line.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            return
+        if line.startswith("-") or "://" in line:
+            egg = self._EGG.search(line)
+            if egg:
+                self._add(normalize_python_name(egg.group(1)))
+            return
+        match = self._REQ.match(line)
+        if not match:
+            return
+        spec = (match.group(2) or "").strip().replace(" ", "")
+        version = spec[2:] if spec.startswith("==") and not spec.startswith("===") else spec
+        self._add(normalize_python_name(match.group(1)), version)
+
+
+class GoModParser(_LineParser):
+    """go.mod: direct requirements (single-line and `require ( ... )` blocks)."""
+
+    def __init__(self):
+        super().__init__()
+        self._in_require = False
+
+    def _line(self, line: str):
+        indirect = "// indirect" in line
+        line = line.split("//", 1)[0].strip()
+        if self._in_require:
+            if line.startswith(")"):
+                self._in_require = False
+            elif line and not indirect:
+                self._require(line)
+            return
+        if line.startswith("require"):
+            rest = line[len("require"):].strip()
+            if rest.startswith("("):
+                self._in_require = True
+            elif rest and not indirect:
+                self._require(rest)
+
+    def _require(self, spec: str):
+        parts = spec.split()
+        self._add(parts[0], parts[1] if len(parts) > 1 else None)
+
+
+class GemfileParser(_LineParser):
+    """Gemfile: `gem "name", "version"` lines, groups included."""
+
+    _GEM = re.compile(r"""^gem\s*\(?\s*["']([^"']+)["'](?:\s*,\s*["']([^"']+)["'])?""")
+
+    def _line(self, line: str):
+        match = self._GEM.match(line.strip())
+        if match:
+            self._add(match.group(1).lower(), match.group(2))
+
+
+class CargoTomlParser(_LineParser):
+    """
+    Cargo.toml: [dependencies], [dev-dependencies], [build-dependencies],
+    [target.*.dependencies], [workspace.dependencies] and [dependencies.<name>].
+    """
+
+    _HEADER = re.compile(r"^\[\s*([^\]]+?)\s*\]")
+    _ENTRY = re.compile(r"^([A-Za-z0-9_-]+)(?:\.[A-Za-z0-9_-]+)?\s*=\s*(.*)$")
+    _VERSION = re.compile(r"""version\s*=\s*["']([^"']+)["']""")
+    _DEP_TABLES = ("dependencies", "dev-dependencies", "build-dependencies")
+
+    def __init__(self):
+        super().__init__()
+        self._in_deps = False
+        self._table_crate: Optional[str] = None   # [dependencies.<crate>]
+
+    @staticmethod
+    def _crate(name: str) -> str:
+        return name.strip().strip("\"'").lower().replace("_", "-")
+
+    def _line(self, line: str):
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            return
+        header = self._HEADER.match(line)
+        if header:
+            self._flush_table_crate()
+            table = header.group(1)
+            last = table.rsplit(".", 1)
+            if table in self._DEP_TABLES or table.endswith(tuple("." + t for t in self._DEP_TABLES)):
+                self._in_deps = True
+            elif len(last) == 2 and last[0].split(".")[-1] in self._DEP_TABLES:
+                self._in_deps = False
+                self._table_crate = self._crate(last[1])
+            else:
+                self._in_deps = False
+            return
+
+        if self._table_crate is not None:
+            version = self._VERSION.match(line)
+            if version:
+                self._add(self._table_crate, version.group(1))
+                self._table_crate = None
+            return
+        if not self._in_deps:
+            return
+        entry = self._ENTRY.match(line)
+        if entry:
+            value = entry.group(2).strip()
+            if value[:1] in ("'", '"'):
+                version = value.strip("\"'")
+            else:
+                found = self._VERSION.search(value)
+                version = found.group(1) if found else None
+            self._add(self._crate(entry.group(1)), version)
+
+    def _flush_table_crate(self):
+        if self._table_crate is not None:
+            self._add(self._table_crate)
+            self._table_crate = None
+
+    def close(self, complete: bool = True) -> List[Dependency]:
+        super().close(complete)
+        self._flush_table_crate()
+        return self.dependencies
+
+
+# =========================================================
+# JVM
+# =========================================================
+
+class GradleParser(_LineParser):
+    """
+    build.gradle: `plugins { }` ids and the top-level `dependencies { }`
+    coordinates ("group:artifact:version", or group:/name:/version: maps).
+    Stops when the dependencies block closes.
+    """
+
+    _COORD = re.compile(r"""["']([\w.\-]+):([\w.\-]+)(?::([^"'@:]+))?[^"']*["']""")
+    _MAP = re.compile(r"""group\s*:\s*["']([^"']+)["']\s*,\s*name\s*:\s*["']([^"']+)["'](?:\s*,\s*version\s*:\s*["']([^"']+)["'])?""")
+    _PLUGIN_ID = re.compile(r"""\bid\s*\(?\s*["']([\w.\-]+)["']\s*\)?(?:\s*version\s*\(?\s*["']([^"']+)["'])?""")
+    _KOTLIN_PLUGIN = re.compile(r"""\bkotlin\s*\(\s*["']([\w.\-]+)["']\s*\)(?:\s*version\s*\(?\s*["']([^"']+)["'])?""")
+    _APPLY = re.compile(r"""^apply\s+plugin\s*:\s*["']([\w.\-]+)["']""")
+    _STRINGS = re.compile(r""""[^"]*"|'[^']*'""")
+
+    def __init__(self):
+        super().__init__()
+        self._depth = 0
+        self._block: Optional[str] = None     # "plugins" | "dependencies" at depth 0
+
+    def _line(self, line: str):
+        line = line.split("//", 1)[0].strip()
+        if not line:
+            return
+
+        if self._depth == 0:
+            applied = self._APPLY.match(line)
+            if applied:
+                self._add(applied.group(1))
+            for block in ("plugins", "dependencies"):
+                if re.match(rf"^{block}\s*\{{", line):
+                    self._block = block
+
+        if self._block == "plugins":
+            for match in self._KOTLIN_PLUGIN.finditer(line):
+                self._add(f"org.jetbrains.kotlin.{match.group(1)}", match.group(2))
+            for match in self._PLUGIN_ID.finditer(line):
+                self._add(match.group(1), match.group(2))
+        elif self._block == "dependencies":
+            for match in self._MAP.finditer(line):
+                self._add(f"{match.group(1)}:{match.group(2)}", match.group(3))
+            for match in self._COORD.finditer(line):
+                self._add(f"{match.group(1)}:{match.group(2)}", match.group(3))
+
+        bare = self._STRINGS.sub("", line)
+        self._depth += bare.count("{") - bare.count("}")
+        if self._depth <= 0:
+            self._depth = 0
+            if self._block == "dependencies":
+                self.done = True
+            self._block = None
+
+
+class PomXmlParser(_ManifestParser):
+    """
+    pom.xml: <parent> and the project-level <dependencies> ("groupId:artifactId").
+    Stops when </dependencies> closes; dependencyManagement and plugin
+    dependencies are not evidence of use and are skipped.
+    """
+
+    _WANTED = {("project", "parent"), ("project", "dependencies", "dependency")}
+
+    def __init__(self):
+        super().__init__()
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._path: List[str] = []
+        self._fields: Dict[str, str] = {}
+
+    def feed(self, chunk: bytes) -> bool:
+        try:
+            self._parser.feed(chunk)
+            for event, elem in self._parser.read_events():
+                tag = elem.tag.rsplit("}", 1)[-1]
+                if event == "start":
+                    self._path.append(tag)
+                    continue
+                path = tuple(self._path)
+                if path[:-1] in self._WANTED and tag in ("groupId", "artifactId", "version"):
+                    self._fields[tag] = (elem.text or "").strip()
+                elif path in self._WANTED:
+                    if self._fields.get("artifactId"):
+                        self._add(
+                            f"{self._fields.get('groupId', '')}:{self._fields['artifactId']}",
+                            self._fields.get("version")
+                        )
+                    self._fields = {}
+                elif path == ("project", "dependencies"):
+                    self.done = True
+                self._path.pop()
+                elem.clear()
+                if self.done:
+                    break
+        except ParseError as e:
+            raise ManifestParseError(f"pom.xml: {e}") from e
+        return self.done
+
+    def close(self, complete: bool = True) -> List[Dependency]:
+        if complete and not self.done:
+            try:
+                self._parser.close()
+            except ParseError as e:
+                raise ManifestParseError(f"pom.xml: {e}") from e
+        return self.dependencies
+
+
+# =========================================================
+# NODE
+# =========================================================
+
+class PackageJsonParser(_ManifestParser):
+    """
+    package.json: name -> version pairs of dependencies, devDependencies,
+    peerDependencies and optionalDependencies. Tokenizes the stream (no
+    full json.loads) and stops once all four sections were read or the
+    top-level object closes.
+    """
+
+    SECTIONS = {"dependencies", "devDependencies", "peerDependencies", "optionalDependencies"}
+    # A string possibly cut at the end of the buffer, punctuation, or a bare literal
+    _TOKEN = re.compile(rb'"(?:[^"\\]|\\.)*(?:"|\\?$)|[{}\[\]:,]|[^\s{}\[\]:,"]+')
+
+    def __init__(self):
+        super().__init__()
+        self._pending = b""
+        self._depth = 0
+        self._key: Optional[str] = None
+        self._after_colon = False
+        self._section: Optional[str] = None
+        self._seen = set()
+
+    def feed(self, chunk: bytes) -> bool:
+        self._tokenize(self._pending + chunk, final=False)
+        return self.done
+
+    def close(self, complete: bool = True) -> List[Dependency]:
+        if not self.done:
+            self._tokenize(self._pending, final=True)
+            if complete and not self.done:
+                raise ManifestParseError("package.json: unexpected end of document")
+        return self.dependencies
+
+    def _tokenize(self, data: bytes, final: bool):
+        self._pending = b""
+        for match in self._TOKEN.finditer(data):
+            if not final and match.end() == len(data):
+                self._pending = data[match.start():]   # may continue in the next chunk
+                return
+            self._token(match.group())
+            if self.done:
+                return
+
+    def _token(self, tok: bytes):
+        first = tok[:1]
+        if first in (b"{", b"["):
+            if self._depth == 0 and first != b"{":
+                raise ManifestParseError("package.json: top level is not an object")
+            if first == b"{" and self._depth == 1 and self._after_colon and self._key in self.SECTIONS:
+                self._section = self._key
+            self._depth += 1
+            self._key = None
+            self._after_colon = False
+        elif first in (b"}", b"]"):
+            self._depth -= 1
+            if self._depth < 0:
+                raise ManifestParseError("package.json: unbalanced brackets")
+            if self._depth == 1 and self._section:
+                self._seen.add(self._section)
+                self._section = None
+                if self._seen == self.SECTIONS:
+                    self.done = True
+            if self._depth == 0:
+                self.done = True
+        elif tok == b":":
+            self._after_colon = True
+        elif tok == b",":
+            self._key = None
+            self._after_colon = False
+        elif self._depth == 0:
+            raise ManifestParseError("package.json: top level is not an object")
+        elif self._after_colon:
+            if self._depth == 2 and self._section and self._key is not None and first == b'"':
+                self._add(self._key.lower(), self._string(tok))
+            self._after_colon = False
+        elif first == b'"' and self._depth in (1, 2):
+            self._key = self._string(tok)
+
+    @staticmethod
+    def _string(tok: bytes) -> str:
+        try:
+            return json.loads(tok)
+        except ValueError as e:
+            raise ManifestParseError(f"package.json: bad string {tok[:40]!r}") from e
+
+
+# =========================================================
+# REGISTRY & MATCHING
+# =========================================================
+
+PARSERS: Dict[str, Callable[[], _ManifestParser]] = {
+    "package.json": PackageJsonParser,
+    "requirements.txt": RequirementsParser,
+    "go.mod": GoModParser,
+    "Cargo.toml": CargoTomlParser,
+    "pom.xml": PomXmlParser,
+    "build.gradle": GradleParser,
+    "Gemfile": GemfileParser,
+}
+
+
+async def parse_manifest_stream(
+    filename: str,
+    stream: AsyncIterator[bytes],
+    max_bytes: int = settings.DEPENDENCY_MANIFEST_MAX_BYTES
+) -> List[Dependency]:
+    """
+    Dependencies declared in manifest `filename`, reading `stream` only until
+    the dependency sections are consumed (or `max_bytes`). Raises
+    ManifestParseError on malformed structured manifests.
+    """
+    parser = PARSERS[filename]()
+    read = 0
+    complete = True
+    async for chunk in stream:
+        read += len(chunk)
+        if parser.feed(chunk):
+            break
+        if read >= max_bytes:
+            complete = False
+            break
+    return parser.close(complete=complete)
+
+
+def parse_manifest(filename: str, content: bytes) -> List[Dependency]:
+    parser = PARSERS[filename]()
+    parser.feed(content)
+    return parser.close()
+
+
+def _npm_match(name: str, keyword: str) -> bool:
+    # "react" is react, not react-native-foo; scoped families: @nestjs/core, @angular/core
+    return name == keyword or name.startswith(f"@{keyword}/")
+
+
+def _family_match(name: str, keyword: str) -> bool:
+    # crates / gems ship as families: actix-web, rspec-rails
+    return name == keyword or name.startswith(f"{keyword}-")
+
+
+def _go_match(name: str, keyword: str) -> bool:
+    # github.com/gin-gonic/gin, gorm.io/gorm, github.com/gofiber/fiber/v2
+    segments = [s for s in name.lower().split("/") if not re.fullmatch(r"v\d+", s)]
+    return bool(segments) and segments[-1] == keyword
+
+
+def _jvm_match(name: str, keyword: str) -> bool:
+    # group:artifact or plugin id: spring-boot-starter-web, org.hibernate:hibernate-core,
+    # jakarta.servlet:jakarta.servlet-api, org.jetbrains.kotlin.jvm
+    group, _, artifact = name.lower().partition(":")
+    if artifact and (_family_match(artifact, keyword) or artifact.startswith(f"{keyword}.")):
+        return True
+    return any(seg in (keyword, f"{keyword}framework") for seg in group.split("."))
+
+
+_MATCHERS: Dict[str, Callable[[str, str], bool]] = {
+    "package.json": _npm_match,
+    "requirements.txt": lambda name, keyword: name == normalize_python_name(keyword),
+    "go.mod": _go_match,
+    "Cargo.toml": _family_match,
+    "pom.xml": _jvm_match,
+    "build.gradle": _jvm_match,
+    "Gemfile": _family_match,
+}
+
+
+def match_keywords(filename: str, dependencies: Iterable[Dependency], keywords: Iterable[str]) -> List[str]:
+    """Keywords (in the given order) that some declared dependency stands for."""
+    matches = _MATCHERS[filename]
+    names = [dep.name for dep in dependencies]
+    return [kw for kw in keywords if any(matches(name, kw.lower()) for name in names)]
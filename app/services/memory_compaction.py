@@ -0,0 +1,228 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.mentor import MentorMemory
+from app.db.session import SessionLocal
+from app.services.embedding_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(category: Optional[str], context_key: Optional[str], content: Optional[str]) -> str:
+    """MentorMemory.content_hash: sha256 of (category, context_key, normalized content)."""
+    text = normalize_text(content or "")
+    return hashlib.sha256(f"{category or ''}\0{context_key or ''}\0{text}".encode("utf-8")).hexdigest()
+
+
+def seen_again(db: Session, user_id: int, digest: str, window_seconds: float) -> bool:
+    """
+    Write-time de-duplication: if the user has a memory with `digest` seen
+    within the window, bumps its repeat_count / last_seen_at (not committed)
+    and returns True; the caller then skips the insert.
+    """
+    if window_seconds <= 0:
+        return False
+    now = datetime.utcnow()
+    recent = (
+        db.query(MentorMemory.id)
+        .filter(
+            MentorMemory.user_id == user_id,
+            MentorMemory.content_hash == digest,
+            MentorMemory.last_seen_at >= now - timedelta(seconds=window_seconds)
+        )
+        .order_by(MentorMemory.id.desc())
+        .first()
+    )
+    if recent is None:
+        return False
+    # Atomic increment; 0 rows if compaction merged it away meanwhile
+    return bool(db.query(MentorMemory).filter(MentorMemory.id == recent.id).update({
+        MentorMemory.repeat_count: MentorMemory.repeat_count + 1,
+        MentorMemory.last_seen_at: now,
+    }, synchronize_session=False))
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class MemoryCompactor:
+    """
+    Collapses repeated mentor memories into one row per (user, content_hash).
+
+    Write-time de-duplication only covers its window (and loses races between
+    concurrent requests), so older repeats are merged here: the oldest row of
+    each group survives with the summed repeat_count and the latest
+    last_seen_at (and an embedding taken from a merged row if it had none);
+    the others are deleted. Rows written before content_hash existed get it
+    backfilled first.
+
+    Every step is a keyset batch of at most `batch_size` rows committed on
+    its own, with `pause_seconds` between batches, so concurrent writers only
+    ever wait on one short transaction. An interrupted run just starts over.
+    Vector index rows of merged memories are dropped by recall_semantic when
+    it fetches them back.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.MENTOR_COMPACTION_BATCH_SIZE,
+        pause_seconds: float = settings.MENTOR_COMPACTION_PAUSE_SECONDS,
+        session_factory=SessionLocal
+    ):
+        self.batch_size = max(int(batch_size), 2)
+        self.pause_seconds = pause_seconds
+        self.session_factory = session_factory
+
+    def run(self) -> Dict:
+        started = time.perf_counter()
+        hashed = self.backfill_hashes()
+        groups, merged = self.compact()
+        stats = {
+            "hashed": hashed,
+            "groups": groups,
+            "merged": merged,
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+        logger.info(f"[MemoryCompactor] {stats}")
+        return stats
+
+    # -----------------------------------------------------
+    # BACKFILL
+    # -----------------------------------------------------
+    def backfill_hashes(self) -> int:
+        """Fills content_hash of older rows. Returns how many were hashed."""
+        hashed, after_id = 0, 0
+        while True:
+            with self.session_factory() as db:
+                rows = (
+                    db.query(MentorMemory.id, MentorMemory.context_key, MentorMemory.memory_value)
+                    .filter(MentorMemory.content_hash.is_(None), MentorMemory.id > after_id)
+                    .order_by(MentorMemory.id)
+                    .limit(self.batch_size)
+                    .all()
+                )
+                if not rows:
+                    return hashed
+                after_id = rows[-1].id
+                for memory_id, context_key, memory_value in rows:
+                    try:
+                        payload = json.loads(memory_value)
+                    except (TypeError, ValueError):
+                        continue        # left unhashed: never merged
+                    db.query(MentorMemory).filter(MentorMemory.id == memory_id).update({
+                        MentorMemory.content_hash: content_hash(
+                            payload.get("category"), context_key, payload.get("content")
+                        )
+                    }, synchronize_session=False)
+                    hashed += 1
+                db.commit()
+            self._pause()
+
+    # -----------------------------------------------------
+    # COMPACTION
+    # -----------------------------------------------------
+    def compact(self) -> Tuple[int, int]:
+        """Merges every group of repeats. Returns (groups merged, rows deleted)."""
+        groups, merged = 0, 0
+        cursor: Optional[Tuple[int, str]] = None
+        while True:
+            with self.session_factory() as db:
+                batch_groups, batch_merged, cursor = self._compact_batch(db, cursor)
+                db.commit()
+            groups += batch_groups
+            merged += batch_merged
+            if cursor is None:
+                return groups, merged
+            self._pause()
+
+    def _compact_batch(self, db: Session, cursor: Optional[Tuple[int, str]]):
+        """
+        Merges repeats of the groups after `cursor`, deleting at most
+        `batch_size` rows. Returns (groups finished, rows deleted, next cursor),
+        the cursor being None once no group is left.
+        """
+        query = db.query(MentorMemory.user_id, MentorMemory.content_hash).filter(
+            MentorMemory.content_hash.isnot(None)
+        )
+        if cursor is not None:
+            user_id, digest = cursor
+            query = query.filter(or_(
+                MentorMemory.user_id > user_id,
+                and_(MentorMemory.user_id == user_id, MentorMemory.content_hash > digest)
+            ))
+        keys = (
+            query.group_by(MentorMemory.user_id, MentorMemory.content_hash)
+            .having(func.count(MentorMemory.id) > 1)
+            .order_by(MentorMemory.user_id, MentorMemory.content_hash)
+            .limit(self.batch_size)
+            .all()
+        )
+        if not keys:
+            return 0, 0, None
+
+        budget, finished, deleted = self.batch_size, 0, 0
+        for user_id, digest in keys:
+            rows = (
+                db.query(
+                    MentorMemory.id, MentorMemory.repeat_count, MentorMemory.last_seen_at,
+                    MentorMemory.created_at, MentorMemory.embedding, MentorMemory.embedding_dtype
+                )
+                .filter(MentorMemory.user_id == user_id, MentorMemory.content_hash == digest)
+                .order_by(MentorMemory.id)
+                .limit(budget + 2)      # one past the budget tells whether the group ends here
+                .all()
+            )
+            if len(rows) < 2:
+                # Merged or deleted by someone else since the keys were read
+                cursor = (user_id, digest)
+                continue
+            survivor, repeats = rows[0], rows[1:budget + 1]
+            if repeats:
+                self._merge(db, survivor, repeats)
+                deleted += len(repeats)
+            if len(rows) > budget + 1:
+                # More repeats than the budget: the next batch resumes at this group
+                return finished, deleted, cursor if cursor is not None else (user_id, "")
+            budget -= len(repeats)
+            finished += 1
+            cursor = (user_id, digest)
+        return finished, deleted, cursor
+
+    @staticmethod
+    def _merge(db: Session, survivor, repeats):
+        seen = [_naive_utc(row.last_seen_at or row.created_at) for row in (survivor, *repeats)]
+        values = {
+            # Relative to the stored value: keeps increments made since the read
+            MentorMemory.repeat_count: MentorMemory.repeat_count + sum(row.repeat_count or 1 for row in repeats),
+            MentorMemory.last_seen_at: max((s for s in seen if s is not None), default=None),
+        }
+        if survivor.embedding is None:
+            donor = next((row for row in repeats if row.embedding is not None), None)
+            if donor is not None:
+                values[MentorMemory.embedding] = donor.embedding
+                values[MentorMemory.embedding_dtype] = donor.embedding_dtype
+                values[MentorMemory.embedding_status] = None
+
+        db.query(MentorMemory).filter(MentorMemory.id == survivor.id).update(values, synchronize_session=False)
+        db.query(MentorMemory).filter(
+            MentorMemory.id.in_([row.id for row in repeats])
+        ).delete(synchronize_session=False)
+
+    def _pause(self):
+        if self.pause_seconds > 0:
+            time.sleep(self.pause_seconds)
+
+
+# Singleton Instance
+memory_compactor = MemoryCompactor()
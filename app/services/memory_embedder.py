@@ -0,0 +1,225 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_
+
+from app.core.config import settings
+from app.db.models.mentor import MentorMemory, EMBEDDING_PENDING, EMBEDDING_FAILED
+from app.db.session import SessionLocal
+from app.services.embedding_codec import decode as decode_embedding, encode as encode_embedding
+from app.services.embedding_service import embed_many
+from app.services.vector_index import memory_index, MemoryVectorIndex
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryEmbedder:
+    """
+    Fills in the embeddings of mentor memories off the request path.
+
+    MentorEngine.store only marks a memory `embedding_status="pending"`; this
+    worker claims due pending rows in batches (a lease in `embed_after`, FOR
+    UPDATE SKIP LOCKED on Postgres, so several app workers can run it), embeds
+    them with `embed_many` (cache hits skipped, one `input=[...]` call for the
+    rest), stores the vectors and appends them to the vector index. A failed
+    batch or item is retried with exponential backoff and marked "failed"
+    after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = settings.MENTOR_EMBED_BATCH_SIZE,
+        max_attempts: int = settings.MENTOR_EMBED_MAX_ATTEMPTS,
+        lease_seconds: float = settings.MENTOR_EMBED_LEASE_SECONDS,
+        poll_interval: float = settings.MENTOR_EMBED_POLL_SECONDS,
+        backoff_base: float = settings.MENTOR_EMBED_BACKOFF_BASE_SECONDS,
+        backoff_max: float = settings.MENTOR_EMBED_BACKOFF_MAX_SECONDS,
+        embed: Callable[[List[str]], List[List[float]]] = embed_many,
+        session_factory=SessionLocal,
+        index: MemoryVectorIndex = memory_index
+    ):
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.embed = embed
+        self.session_factory = session_factory
+        self.index = index
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    # -----------------------------------------------------
+    # BATCH
+    # -----------------------------------------------------
+    def run_once(self) -> int:
+        """Embeds one batch of due pending memories. Returns how many were attempted."""
+        with self.session_factory() as db:
+            batch = self._claim(db)
+        if not batch:
+            return 0
+
+        try:
+            vectors = self.embed([content for _, _, content, _, _ in batch])
+            error = None
+        except Exception as e:
+            vectors, error = [[] for _ in batch], f"{type(e).__name__}: {e}"
+            logger.warning(f"[MemoryEmbedder] batch of {len(batch)} failed: {error}")
+
+        done = self._save(batch, vectors, error)
+        for memory_id, user_id, _, category, context_key, blob, dtype in done:
+            try:
+                self.index.add(user_id, memory_id, decode_embedding(blob, dtype), category, context_key)
+            except Exception as e:
+                # MemoryVectorIndex.sync catches up from the DB on the next recall
+                logger.warning(f"[MemoryEmbedder] failed to index memory {memory_id}: {e}")
+        return len(batch)
+
+    def drain(self) -> int:
+        """Runs batches until nothing is due. Returns how many memories were attempted."""
+        total = 0
+        while True:
+            attempted = self.run_once()
+            total += attempted
+            if attempted < self.batch_size:
+                return total
+
+    def _claim(self, db) -> List[Tuple]:
+        """Leases up to `batch_size` due rows: (id, user_id, content, category, context_key)."""
+        now = datetime.utcnow()
+        due = or_(MentorMemory.embed_after.is_(None), MentorMemory.embed_after <= now)
+        candidates = (
+            db.query(MentorMemory.id)
+            .filter(MentorMemory.embedding_status == EMBEDDING_PENDING, due)
+            .order_by(MentorMemory.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        claimed = []
+        for (memory_id,) in candidates:
+            # Conditional update: only one worker wins a row (SQLite has no SKIP LOCKED)
+            won = db.query(MentorMemory).filter(
+                MentorMemory.id == memory_id, MentorMemory.embedding_status == EMBEDDING_PENDING, due
+            ).update({
+                MentorMemory.embed_after: now + timedelta(seconds=self.lease_seconds)
+            }, synchronize_session=False)
+            if won:
+                claimed.append(memory_id)
+        db.commit()
+        if not claimed:
+            return []
+
+        batch = []
+        rows = db.query(
+            MentorMemory.id, MentorMemory.user_id, MentorMemory.context_key, MentorMemory.memory_value
+        ).filter(MentorMemory.id.in_(claimed)).order_by(MentorMemory.id)
+        for memory_id, user_id, context_key, memory_value in rows:
+            try:
+                payload = json.loads(memory_value)
+            except (TypeError, ValueError):
+                payload = {}
+            batch.append((memory_id, user_id, payload.get("content") or "", payload.get("category"), context_key))
+        return batch
+
+    def _save(self, batch: List[Tuple], vectors: List[List[float]], error: Optional[str]) -> List[Tuple]:
+        """Stores vectors / schedules retries. Returns the embedded rows plus their (blob, dtype)."""
+        now = datetime.utcnow()
+        done = []
+        with self.session_factory() as db:
+            for row, vector in zip(batch, vectors):
+                memory_id = row[0]
+                pending = db.query(MentorMemory).filter(
+                    MentorMemory.id == memory_id, MentorMemory.embedding_status == EMBEDDING_PENDING
+                )
+                if not row[2].strip():
+                    # Nothing to embed: settles the row instead of retrying it
+                    pending.update({
+                        MentorMemory.embedding_status: None, MentorMemory.embed_after: None
+                    }, synchronize_session=False)
+                    continue
+                if vector:
+                    blob, dtype = encode_embedding(vector, settings.MENTOR_EMBEDDING_DTYPE)
+                    if pending.update({
+                        MentorMemory.embedding: blob,
+                        MentorMemory.embedding_dtype: dtype,
+                        MentorMemory.embedding_status: None,
+                        MentorMemory.embed_after: None,
+                    }, synchronize_session=False):
+                        done.append(row + (blob, dtype))
+                    continue
+
+                memory = pending.first()
+                if memory is None:      # deleted meanwhile
+                    continue
+                memory.embedding_attempts = (memory.embedding_attempts or 0) + 1
+                if memory.embedding_attempts >= self.max_attempts:
+                    memory.embedding_status = EMBEDDING_FAILED
+                    memory.embed_after = None
+                    logger.error(f"[MemoryEmbedder] memory {memory_id} has no embedding: {error or 'empty vector'}")
+                else:
+                    memory.embed_after = now + timedelta(seconds=self.backoff_delay(memory.embedding_attempts))
+            db.commit()
+        return done
+
+    def backoff_delay(self, attempts: int) -> float:
+        return min(self.backoff_max, self.backoff_base * (2 ** max(attempts - 1, 0)))
+
+    # -----------------------------------------------------
+    # LOOP
+    # -----------------------------------------------------
+    async def run(self, stop: asyncio.Event):
+        """Embeds pending memories until `stop` is set; `wake()` skips the poll wait."""
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        logger.info("[MemoryEmbedder] started")
+        while not stop.is_set():
+            self._wake.clear()
+            try:
+                attempted = await asyncio.to_thread(self.run_once)
+            except Exception:
+                logger.exception("[MemoryEmbedder] batch crashed")
+                attempted = 0
+            if attempted >= self.batch_size:
+                continue        # backlog: next batch right away
+
+            waiters = {asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wake.wait())}
+            _, pending = await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+            for fut in pending:
+                fut.cancel()
+        self._loop = None
+        logger.info("[MemoryEmbedder] stopped")
+
+    def wake(self):
+        """Signals new pending memories. Safe from any thread; no-op when the loop is not running here."""
+        loop, event = self._loop, self._wake
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:    # loop closed
+            pass
+
+    def stats(self, db) -> Dict:
+        counts = dict(
+            db.query(MentorMemory.embedding_status, func.count(MentorMemory.id))
+            .filter(MentorMemory.embedding_status.isnot(None))
+            .group_by(MentorMemory.embedding_status)
+            .all()
+        )
+        oldest = db.query(func.min(MentorMemory.created_at)).filter(
+            MentorMemory.embedding_status == EMBEDDING_PENDING
+        ).scalar()
+        return {
+            "pending": counts.get(EMBEDDING_PENDING, 0),
+            "failed": counts.get(EMBEDDING_FAILED, 0),
+            "oldest_pending": oldest.isoformat() if oldest else None,
+        }
+
+
+# Singleton Instance
+memory_embedder = MemoryEmbedder()
@@ -1,12 +1,16 @@
 import logging
 import json
+from datetime import datetime
 from typing import List, Optional
 
 from sqlalchemy.orm import Session
 
-from app.db.models.mentor import MentorMemory
+from app.core.config import settings
+from app.db.models.mentor import MentorMemory, EMBEDDING_PENDING
 from app.db.models.user import User
-from app.services.embedding_service import embed_text
+from app.services.memory_compaction import content_hash, seen_again
+from app.services.memory_embedder import memory_embedder
+from app.services.vector_index import memory_index
 
 logger = logging.getLogger(__name__)
 
@@ -38,27 +42,35 @@ class MentorEngine:
         """
         Persiste uma memória do mentor.
 
-        O embedding é armazenado serializado dentro de `memory_value`
-        para manter compatibilidade com o schema atual.
+        Nenhuma chamada de embedding acontece aqui: com `with_embedding`, a
+        memória fica `embedding_status="pending"` e o app/services/memory_embedder.py
+        preenche a coluna `embedding` em lote, fora do request.
+
+        A mesma memória (categoria, chave e conteúdo) vista de novo dentro de
+        MENTOR_MEMORY_DEDUPE_WINDOW_SECONDS só incrementa `repeat_count` da
+        linha existente (os insights são regravados a cada render do dashboard).
         """
         try:
             final_key = context_key if context_key else category
+            digest = content_hash(category, final_key, content)
+
+            if seen_again(db, user.id, digest, settings.MENTOR_MEMORY_DEDUPE_WINDOW_SECONDS):
+                db.commit()
+                logger.debug(f"[MentorMemory] user={user.id} key={final_key} repetida")
+                return
 
             payload = {
                 "content": content,
                 "category": category
             }
 
-            if with_embedding:
-                try:
-                    payload["embedding"] = embed_text(content)
-                except Exception as e:
-                    logger.warning(f"[MentorMemory] embedding falhou: {e}")
-
             memory = MentorMemory(
                 user_id=user.id,
                 context_key=final_key,
-                memory_value=json.dumps(payload)
+                memory_value=json.dumps(payload),
+                embedding_status=EMBEDDING_PENDING if with_embedding else None,
+                content_hash=digest,
+                last_seen_at=datetime.utcnow()
             )
 
             db.add(memory)
@@ -68,6 +80,9 @@ class MentorEngine:
                 f"[MentorMemory] user={user.id} key={final_key} category={category}"
             )
 
+            if with_embedding:
+                memory_embedder.wake()
+
         except Exception as e:
             db.rollback()
             logger.error(f"[MentorMemory] erro ao salvar memória: {e}")
@@ -216,13 +231,20 @@ class MentorEngine:
         Salva contexto explícito do usuário (preferências, decisões, eventos).
         """
         try:
+            digest = content_hash("CONTEXT", key, value)
+            if seen_again(db, user.id, digest, settings.MENTOR_MEMORY_DEDUPE_WINDOW_SECONDS):
+                db.commit()
+                return
+
             memory = MentorMemory(
                 user_id=user.id,
                 context_key=key,
                 memory_value=json.dumps({
                     "content": value,
                     "category": "CONTEXT"
-                })
+                }),
+                content_hash=digest,
+                last_seen_at=datetime.utcnow()
             )
             db.add(memory)
             db.commit()
@@ -243,37 +265,73 @@ class MentorEngine:
         db: Session,
         user: User,
         query_embedding: List[float],
-        limit: int = 5
+        limit: int = 5,
+        category: Optional[str] = None,
+        context_key: Optional[str] = None
     ) -> List[str]:
         """
-        Recupera memórias semanticamente próximas usando cosine-like similarity.
+        Recupera memórias semanticamente próximas usando cosine-like similarity
+        (produto escalar, assumindo vetores normalizados), opcionalmente
+        filtradas por categoria e/ou context_key.
+
+        A busca roda no índice vetorial do usuário (app/services/vector_index.py);
+        só as memórias do top-k são lidas do banco.
         """
-        memories = (
-            db.query(MentorMemory)
-            .filter(MentorMemory.user_id == user.id)
-            .all()
-        )
+        if not query_embedding or limit <= 0:
+            return []
 
-        scored = []
+        snapshot = memory_index.sync(db, user.id)
+        if snapshot is None:
+            return []
 
-        for m in memories:
-            try:
-                payload = json.loads(m.memory_value)
-                emb = payload.get("embedding")
-                content = payload.get("content")
+        # Folga para memórias apagadas desde a indexação
+        hits = memory_index.search(snapshot, query_embedding, limit * 2, category, context_key)
+        contents = self._recall_contents(db, user, hits, category, context_key)
 
-                if not emb or not content:
-                    continue
+        if len(contents) < limit and len(hits) == limit * 2:
+            # Muitas linhas órfãs no topo: reconstrói o índice a partir do banco
+            snapshot = memory_index.rebuild(db, user.id)
+            if snapshot is None:
+                return []
+            hits = memory_index.search(snapshot, query_embedding, limit, category, context_key)
+            contents = self._recall_contents(db, user, hits, category, context_key)
 
-                # Cosine Similarity simplificado (assumindo vetores normalizados)
-                score = sum(a * b for a, b in zip(emb, query_embedding))
-                scored.append((score, content))
+        return contents[:limit]
 
+    def _recall_contents(
+        self,
+        db: Session,
+        user: User,
+        hits: List,
+        category: Optional[str],
+        context_key: Optional[str]
+    ) -> List[str]:
+        if not hits:
+            return []
+        rows = {
+            m.id: m for m in db.query(MentorMemory).filter(
+                MentorMemory.user_id == user.id,
+                MentorMemory.id.in_([memory_id for memory_id, _ in hits])
+            )
+        }
+
+        contents = []
+        for memory_id, _ in hits:
+            m = rows.get(memory_id)
+            if m is None:
+                continue
+            try:
+                payload = json.loads(m.memory_value)
             except Exception:
                 continue
-
-        scored.sort(key=lambda x: x[0], reverse=True)
-        return [content for _, content in scored[:limit]]
+            content = payload.get("content")
+            # Os filtros do índice usam hash; confirma no registro
+            if not content \
+                    or (category is not None and payload.get("category") != category) \
+                    or (context_key is not None and m.context_key != context_key):
+                continue
+            contents.append(content)
+        return contents
 
 
 # -------------------------------------------------
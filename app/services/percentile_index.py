@@ -0,0 +1,183 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.latest_risk import LatestRisk
+from app.services import latest_risk
+
+# Cohort dimensions: name -> latest_risk columns that define the cohort
+DIMENSIONS = {
+    "company_region": ("company", "region"),
+    "org_team": ("organization", "team"),
+}
+
+
+class _Cohort:
+    """Sorted latest scores of one cohort plus the member -> score map."""
+    __slots__ = ("scores", "members", "loaded_at")
+
+    def __init__(self, members: Dict[int, int]):
+        self.members = members
+        self.scores = sorted(members.values())
+        self.loaded_at = time.monotonic()
+
+    def remove(self, user_id: int):
+        score = self.members.pop(user_id)
+        del self.scores[bisect_left(self.scores, score)]
+
+    def add(self, user_id: int, score: int):
+        self.members[user_id] = score
+        insort(self.scores, score)
+
+
+class CohortPercentileIndex:
+    """
+    In-memory peer-percentile index over the latest_risk projection.
+
+    Each cohort (e.g. company/region) is loaded once into a sorted array of
+    its members' latest scores; a percentile lookup is then a bisect instead
+    of a full peer scan + sort per page view.
+
+    Committed snapshot inserts and profile changes mark users dirty; dirty users
+    are re-read in a single query on the next lookup and patched into the
+    loaded cohorts in O(log n). Cohorts older than the TTL are reloaded in
+    full, which picks up writes made by other processes.
+
+    Queries run outside the lock, which only guards the swap/patch of the
+    in-memory cohorts. Users marked dirty while a query is in flight are
+    marked again once its result lands, so a slow read never overwrites a
+    newer write.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = (
+            settings.PERCENTILE_INDEX_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._cohorts: Dict[Tuple[str, Tuple], _Cohort] = {}
+        self._dirty: Set[int] = set()
+        self._in_flight: List[Set[int]] = []   # users marked during each running query
+        self._lock = threading.RLock()
+        latest_risk.subscribe(self)
+
+    # -----------------------------------------------------
+    # LOOKUP
+    # -----------------------------------------------------
+    def percentile(
+        self, db: Session, dimension: str, values: Dict[str, Optional[str]], score: int
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Percent of the cohort with latest score <= `score`, and the cohort size.
+        Cohort fields set to None are not filtered on. Returns None for an
+        empty cohort.
+        """
+        key = (dimension, tuple(values.get(f) for f in DIMENSIONS[dimension]))
+
+        self._apply_dirty(db)
+        with self._lock:
+            cohort = self._cohorts.get(key)
+            stale = cohort is None or time.monotonic() - cohort.loaded_at > self.ttl_seconds
+        if stale:
+            cohort = self._load(db, key)
+
+        with self._lock:
+            if not cohort.scores:
+                return None
+            size = len(cohort.scores)
+            return int(bisect_right(cohort.scores, score) / size * 100), size
+
+    # -----------------------------------------------------
+    # MAINTENANCE
+    # -----------------------------------------------------
+    def mark_dirty(self, user_id: int):
+        with self._lock:
+            for marked in self._in_flight:
+                marked.add(user_id)
+            if self._cohorts:
+                self._dirty.add(user_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._cohorts.clear()
+            self._dirty.clear()
+
+    def _begin_query(self) -> Set[int]:
+        """Starts collecting the users marked dirty while a query runs (caller holds the lock)."""
+        marked: Set[int] = set()
+        self._in_flight.append(marked)
+        return marked
+
+    def _end_query(self, marked: Set[int]):
+        """Re-marks what changed during the query, for the next lookup (caller holds the lock)."""
+        self._in_flight = [m for m in self._in_flight if m is not marked]
+        self._dirty |= marked
+
+    def _load(self, db: Session, key) -> _Cohort:
+        dimension, values = key
+        with self._lock:
+            marked = self._begin_query()
+        try:
+            query = db.query(LatestRisk.user_id, LatestRisk.risk_score)
+            for field, value in zip(DIMENSIONS[dimension], values):
+                if value is not None:
+                    query = query.filter(getattr(LatestRisk, field) == value)
+            cohort = _Cohort({uid: score for uid, score in query.all()})
+        finally:
+            with self._lock:
+                self._end_query(marked)
+
+        with self._lock:
+            current = self._cohorts.get(key)
+            # A concurrent lookup may have swapped in a newer load meanwhile
+            if current is not None and current.loaded_at > cohort.loaded_at:
+                return current
+            self._cohorts[key] = cohort
+        return cohort
+
+    def _apply_dirty(self, db: Session):
+        with self._lock:
+            if not self._dirty:
+                return
+            dirty, self._dirty = self._dirty, set()
+            marked = self._begin_query()
+
+        try:
+            rows = {
+                row.user_id: row for row in (
+                    db.query(
+                        LatestRisk.user_id,
+                        LatestRisk.risk_score,
+                        LatestRisk.company,
+                        LatestRisk.region,
+                        LatestRisk.organization,
+                        LatestRisk.team
+                    )
+                    .filter(LatestRisk.user_id.in_(dirty))
+                    .all()
+                )
+            }
+        except Exception:
+            with self._lock:
+                self._end_query(marked)
+                self._dirty |= dirty    # retried on the next lookup
+            raise
+
+        with self._lock:
+            self._end_query(marked)
+            self._patch(dirty, rows)
+
+    def _patch(self, dirty: Set[int], rows: Dict):
+        """Moves the dirty users to their current cohorts (caller holds the lock)."""
+        for (dimension, values), cohort in self._cohorts.items():
+            fields = DIMENSIONS[dimension]
+            for user_id in dirty:
+                if user_id in cohort.members:
+                    cohort.remove(user_id)
+                row = rows.get(user_id)
+                if row is not None and all(
+                    v is None or getattr(row, f) == v for f, v in zip(fields, values)
+                ):
+                    cohort.add(user_id, row.risk_score)
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Past this many remembered results, expired ones are dropped
+_PRUNE_AT = 1024
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution.
+
+    The first caller starts `fn()` as a task; callers arriving while it runs
+    await the same task and get its result (or exception). A caller being
+    cancelled never cancels the shared work. A result accepted by `reuse` is
+    also served to calls made within `fresh_for` seconds after it finished.
+    """
+
+    def __init__(self, fresh_for: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.fresh_for = fresh_for
+        self.clock = clock
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._recent: Dict[Hashable, Tuple[float, Any]] = {}
+
+        self.executions = 0
+        self.coalesced = 0
+        self.fresh_hits = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        reuse: Callable[[Any], bool] = bool
+    ) -> Any:
+        recent = self._recent.get(key)
+        if recent is not None and self.clock() - recent[0] < self.fresh_for:
+            self.fresh_hits += 1
+            return recent[1]
+
+        task = self._inflight.get(key)
+        if task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop():
+            self.coalesced += 1
+        else:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finished(key, t, reuse))
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """Drops the remembered result, so the next call runs again."""
+        self._recent.pop(key, None)
+
+    def stats(self) -> Dict:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "fresh_hits": self.fresh_hits,
+            "in_flight": sum(1 for t in self._inflight.values() if not t.done()),
+        }
+
+    def _finished(self, key: Hashable, task: asyncio.Task, reuse: Callable[[Any], bool]):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled():
+            return
+        if task.exception() is not None:   # retrieved here too, in case every waiter left
+            return
+        result = task.result()
+        if self.fresh_for > 0 and reuse(result):
+            now = self.clock()
+            self._recent[key] = (now, result)
+            if len(self._recent) > _PRUNE_AT:
+                self._recent = {
+                    k: v for k, v in self._recent.items() if now - v[0] < self.fresh_for
+                }
@@ -0,0 +1,88 @@
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from app.db.models.analytics import RiskSnapshot
+from app.services.team_aggregates import TeamAggregate, team_aggregate_store
+
+
+class SnapshotRecord(NamedTuple):
+    """Plain, session-independent copy of a RiskSnapshot row."""
+    risk_score: int
+    risk_level: Optional[str]
+    recorded_at: Optional[datetime]
+    created_at: Optional[datetime]
+
+
+class RiskSnapshotContext:
+    """
+    Per-request view over RiskSnapshot data.
+
+    Loads the user's last `window` snapshots with a single query (newest first)
+    and, when the user belongs to a team, the team's TeamAggregate (latest
+    score per member, from the shared team_aggregate_store).
+    Every analytics engine reads from this object instead of issuing its own
+    ORDER BY/LIMIT variant, so a dashboard render costs a fixed number of
+    bounded queries regardless of snapshot history size.
+
+    Records are plain tuples and aggregates are never mutated in place, so a
+    context can be shared across the threads of the analysis stage graph.
+    """
+
+    # Largest window any consumer needs (risk timeline chart)
+    DEFAULT_WINDOW = 12
+
+    def __init__(
+        self,
+        user_id: int,
+        snapshots: List[SnapshotRecord],
+        team: Optional[TeamAggregate] = None
+    ):
+        self.user_id = user_id
+        self.snapshots = snapshots            # newest first
+        self.team = team or TeamAggregate()   # latest score per team member
+
+    @classmethod
+    def load(cls, db: Session, user, window: int = DEFAULT_WINDOW) -> "RiskSnapshotContext":
+        rows = (
+            db.query(
+                RiskSnapshot.risk_score,
+                RiskSnapshot.risk_level,
+                RiskSnapshot.recorded_at,
+                RiskSnapshot.created_at
+            )
+            .filter(RiskSnapshot.user_id == user.id)
+            .order_by(RiskSnapshot.recorded_at.desc(), RiskSnapshot.id.desc())
+            .limit(window)
+            .all()
+        )
+
+        team = None
+        profile = user.career_profile
+        if profile and profile.team:
+            team = team_aggregate_store.get(db, profile.team)
+
+        return cls(user.id, [SnapshotRecord(*r) for r in rows], team)
+
+    # -----------------------------------------------------
+    # USER WINDOW
+    # -----------------------------------------------------
+    @property
+    def latest(self) -> Optional[SnapshotRecord]:
+        return self.snapshots[0] if self.snapshots else None
+
+    def recent(self, limit: int) -> List[SnapshotRecord]:
+        """Most recent `limit` snapshots, newest first."""
+        return self.snapshots[:limit]
+
+    def risk_series(self, limit: int) -> List[int]:
+        """Most recent `limit` risk scores in chronological order (LSTM input)."""
+        return [s.risk_score for s in self.snapshots[:limit]][::-1]
+
+    # -----------------------------------------------------
+    # TEAM VIEW
+    # -----------------------------------------------------
+    def team_latest_scores(self) -> Dict[int, int]:
+        """Latest risk score per team member: {user_id: score}."""
+        return dict(self.team.members)
@@ -0,0 +1,168 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps bound parameters per statement
+_SQL_CHUNK = 500
+
+# A hit only rewrites last_used when the stored one is older than this:
+# LRU order at minute granularity, without a write per lookup
+TOUCH_INTERVAL_SECONDS = 60.0
+
+
+class SQLiteLRU:
+    """
+    Bounded key -> row table in a SQLite file shared by all workers, evicted
+    least-recently-used by entry count and total `size` bytes. Backs the
+    disk tier of GitHubResponseCache and EmbeddingCache.
+
+    The table is `(key TEXT PRIMARY KEY, <columns>, size INTEGER, last_used
+    REAL)`. Entry/byte totals are counted once per connection, then kept up
+    to date from this process's own writes (the old size of a replaced key
+    is read first): a full count would read every blob's overflow pages.
+    Calls are synchronous and serialized on one connection; callers run them
+    in worker threads and never hold their own locks around them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        columns: Sequence[Tuple[str, str]],
+        max_entries: int,
+        max_bytes: int,
+        touch_interval: float = TOUCH_INTERVAL_SECONDS,
+        log_name: str = "SQLiteLRU"
+    ):
+        self.path = path
+        self.table = table
+        self.columns = [name for name, _ in columns]
+        self._schema = ", ".join(f"{name} {kind}" for name, kind in columns)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self.log_name = log_name
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+        self.entries = 0
+        self.bytes = 0
+
+    # -----------------------------------------------------
+    # PUBLIC API
+    # -----------------------------------------------------
+    def get_many(self, keys: Iterable[str]) -> Dict[str, tuple]:
+        """Stored rows (values of `columns`) for the keys found."""
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, tuple] = {}
+        if not keys:
+            return found
+        cols = ", ".join(self.columns)
+        with self._lock:
+            try:
+                conn = self._connection()
+                now = time.time()
+                stale = []
+                for i in range(0, len(keys), _SQL_CHUNK):
+                    chunk = keys[i:i + _SQL_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    for row in conn.execute(
+                        f"SELECT key, {cols}, last_used FROM {self.table} WHERE key IN ({marks})", chunk
+                    ):
+                        found[row[0]] = tuple(row[1:-1])
+                        if (row[-1] or 0) <= now - self.touch_interval:
+                            stale.append((now, row[0]))
+                if stale:
+                    conn.executemany(f"UPDATE {self.table} SET last_used = ? WHERE key = ?", stale)
+                    conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[{self.log_name}] lookup failed: {e}")
+                return {}
+        return found
+
+    def put_many(self, rows: Dict[str, Tuple[tuple, int]]):
+        """Stores key -> (values of `columns`, size in bytes), then evicts down to the bounds."""
+        if not rows:
+            return
+        keys = list(rows)
+        cols = ", ".join(["key", *self.columns, "size", "last_used"])
+        marks = ",".join("?" * (len(self.columns) + 3))
+        with self._lock:
+            try:
+                conn = self._connection()
+                old_sizes = {}
+                for i in range(0, len(keys), _SQL_CHUNK):
+                    chunk = keys[i:i + _SQL_CHUNK]
+                    old_sizes.update(conn.execute(
+                        f"SELECT key, size FROM {self.table} WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall())
+                now = time.time()
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} ({cols}) VALUES ({marks})",
+                    [(key, *values, size, now) for key, (values, size) in rows.items()]
+                )
+                # Applies the difference instead of re-counting the table
+                self.entries += sum(1 for key in keys if key not in old_sizes)
+                self.bytes += sum(size for _, size in rows.values()) - sum(old_sizes.values())
+                self._evict()
+                conn.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"[{self.log_name}] store failed: {e}")
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f"DELETE FROM {self.table}")
+            conn.commit()
+            self.entries = self.bytes = 0
+
+    def refresh_totals(self):
+        """Re-counts entries/bytes from the table (once per connection; other processes write too)."""
+        with self._lock:
+            self._connection()
+            self._refresh_totals()
+
+    # -----------------------------------------------------
+    # INTERNALS (caller holds self._lock)
+    # -----------------------------------------------------
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                f" key TEXT PRIMARY KEY, {self._schema}, size INTEGER, last_used REAL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS ix_{self.table}_last_used ON {self.table} (last_used)")
+            conn.commit()
+            self._conn = conn
+            self._refresh_totals()
+        return self._conn
+
+    def _refresh_totals(self):
+        self.entries, self.bytes = self._conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+
+    def _evict(self):
+        """Drops least-recently-used entries until both bounds hold."""
+        conn = self._conn
+        while self.entries > self.max_entries or self.bytes > self.max_bytes:
+            rows = conn.execute(
+                f"SELECT key, size FROM {self.table} ORDER BY last_used, rowid LIMIT ?",
+                (max(self.entries - self.max_entries, 1),)
+            ).fetchall()
+            if not rows:
+                # Other processes emptied it meanwhile: the counts drifted
+                self._refresh_totals()
+                break
+            conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", [(key,) for key, _ in rows])
+            self.entries -= len(rows)
+            self.bytes -= sum(size for _, size in rows)
+            self.evictions += len(rows)
@@ -0,0 +1,171 @@
+import math
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.latest_risk import LatestRisk
+from app.services import latest_risk
+
+
+class TeamAggregate:
+    """
+    Running statistics over the latest score of each team member.
+
+    count/total/sumsq give mean and population stdev in O(1); min/second-min
+    give the exit simulation's anchor in O(1). Member scores are kept for the
+    ranking. Scores are integers, so the sums are exact.
+    """
+    __slots__ = ("members", "count", "total", "sumsq", "min_score", "second_min")
+
+    def __init__(self, members: Optional[Dict[int, int]] = None):
+        self.members: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.sumsq = 0
+        self.min_score: Optional[int] = None
+        self.second_min: Optional[int] = None
+        for user_id, score in (members or {}).items():
+            self.add(user_id, score)
+
+    def copy(self) -> "TeamAggregate":
+        clone = TeamAggregate.__new__(TeamAggregate)
+        clone.members = dict(self.members)
+        clone.count, clone.total, clone.sumsq = self.count, self.total, self.sumsq
+        clone.min_score, clone.second_min = self.min_score, self.second_min
+        return clone
+
+    # -----------------------------------------------------
+    # UPDATES
+    # -----------------------------------------------------
+    def add(self, user_id: int, score: int):
+        if user_id in self.members:
+            self.remove(user_id)
+        self.members[user_id] = score
+        self.count += 1
+        self.total += score
+        self.sumsq += score * score
+        if self.min_score is None or score < self.min_score:
+            self.min_score, self.second_min = score, self.min_score
+        elif self.second_min is None or score < self.second_min:
+            self.second_min = score
+
+    def remove(self, user_id: int):
+        score = self.members.pop(user_id, None)
+        if score is None:
+            return
+        self.count -= 1
+        self.total -= score
+        self.sumsq -= score * score
+        if score <= (self.second_min if self.second_min is not None else score):
+            # One of the two smallest left: rescan, O(team) and only on that path
+            lowest = sorted(self.members.values())[:2]
+            self.min_score = lowest[0] if lowest else None
+            self.second_min = lowest[1] if len(lowest) > 1 else None
+
+    # -----------------------------------------------------
+    # STATISTICS
+    # -----------------------------------------------------
+    @property
+    def mean(self) -> float:
+        return self.total / self.count
+
+    @property
+    def pstdev(self) -> float:
+        if self.count < 2:
+            return 0
+        return math.sqrt(max(0, self.count * self.sumsq - self.total ** 2)) / self.count
+
+    def mean_without_min(self) -> float:
+        return (self.total - self.min_score) / (self.count - 1)
+
+    def mean_with(self, score: int) -> float:
+        return (self.total + score) / (self.count + 1)
+
+
+class _Entry:
+    __slots__ = ("aggregate", "loaded_at")
+
+    def __init__(self, aggregate: TeamAggregate):
+        self.aggregate = aggregate
+        self.loaded_at = time.monotonic()
+
+
+class TeamAggregateStore:
+    """
+    Per-team TeamAggregate cache over the latest_risk projection.
+
+    A team is loaded once (one query on latest_risk); committed score or
+    team changes re-read only the touched users and patch the aggregate.
+    Aggregates are replaced, never mutated in place, so a request can keep
+    reading the one it got while another thread applies updates.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None):
+        self.ttl_seconds = (
+            settings.TEAM_AGGREGATE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._teams: Dict[str, _Entry] = {}
+        self._dirty: Set[int] = set()
+        self._lock = threading.RLock()
+        latest_risk.subscribe(self)
+
+    def get(self, db: Session, team: str) -> TeamAggregate:
+        with self._lock:
+            self._apply_dirty(db)
+            entry = self._teams.get(team)
+            if entry is None or time.monotonic() - entry.loaded_at > self.ttl_seconds:
+                members = {
+                    uid: score for uid, score in (
+                        db.query(LatestRisk.user_id, LatestRisk.risk_score)
+                        .filter(LatestRisk.team == team)
+                        .all()
+                    )
+                }
+                entry = _Entry(TeamAggregate(members))
+                self._teams[team] = entry
+            return entry.aggregate
+
+    def mark_dirty(self, user_id: int):
+        with self._lock:
+            if self._teams:
+                self._dirty.add(user_id)
+
+    def invalidate(self):
+        with self._lock:
+            self._teams.clear()
+            self._dirty.clear()
+
+    def _apply_dirty(self, db: Session):
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+
+        rows = {
+            uid: (score, team) for uid, score, team in (
+                db.query(LatestRisk.user_id, LatestRisk.risk_score, LatestRisk.team)
+                .filter(LatestRisk.user_id.in_(dirty))
+                .all()
+            )
+        }
+
+        for team, entry in self._teams.items():
+            touched = [
+                uid for uid in dirty
+                if uid in entry.aggregate.members or rows.get(uid, (None, None))[1] == team
+            ]
+            if not touched:
+                continue
+            updated = entry.aggregate.copy()
+            for uid in touched:
+                score, member_team = rows.get(uid, (None, None))
+                if member_team == team:
+                    updated.add(uid, score)
+                else:
+                    updated.remove(uid)
+            entry.aggregate = updated
+
+
+team_aggregate_store = TeamAggregateStore()
@@ -1,8 +1,7 @@
 from sqlalchemy.orm import Session
-from statistics import mean, pstdev
 from typing import Dict, Optional, List
-from app.db.models.analytics import RiskSnapshot
-from app.db.models.career import CareerProfile
+from app.services.snapshot_context import RiskSnapshotContext
+from app.services.team_aggregates import TeamAggregate
 
 class TeamHealthEngine:
     """
@@ -10,35 +9,61 @@ class TeamHealthEngine:
     1. High Average Risk (Systemic Stress)
     2. High Variance (Inequality/Isolation)
     And simulates the impact of key member exits.
+
+    Every metric is answered from the team's TeamAggregate (running count,
+    sum, sum of squares and two smallest scores), so mean/stdev/anchor are
+    O(1) and only the ranking walks the members.
     """
 
-    def team_burnout_risk(self, db: Session, user) -> Optional[Dict]:
+    def _team(
+        self, db: Session, user, snapshots: Optional[RiskSnapshotContext]
+    ) -> Optional[TeamAggregate]:
         profile = user.career_profile
         if not profile or not profile.team:
             return None
+        snapshots = snapshots or RiskSnapshotContext.load(db, user)
+        return snapshots.team
+
+    def team_metrics(
+        self,
+        db: Session,
+        user,
+        hypothetical_risk: int = 20,
+        snapshots: Optional[RiskSnapshotContext] = None
+    ) -> Dict:
+        """
+        Burnout, exit simulation, hire simulation and ranking from one
+        aggregate read (what the dashboard renders together).
+        """
+        team = self._team(db, user, snapshots)
+        if team is None:
+            return {
+                "team_burnout": None,
+                "exit_simulation": None,
+                "hire_simulation": None,
+                "ranking": []
+            }
+        return {
+            "team_burnout": self._burnout(team),
+            "exit_simulation": self._member_exit(team),
+            "hire_simulation": self._new_hire(team, hypothetical_risk),
+            "ranking": self._ranking(team, user.id)
+        }
 
-        # Query recent snapshots for all team members
-        # We join CareerProfile to ensure we only get peers from the same team
-        risks = (
-            db.query(RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-            .filter(CareerProfile.team == profile.team)
-            .order_by(RiskSnapshot.created_at.desc())
-            .limit(50)  # Limit to recent data sample
-            .all()
-        )
-
-        if not risks:
-            return None
-
-        scores = [r[0] for r in risks]
+    def team_burnout_risk(
+        self, db: Session, user, snapshots: Optional[RiskSnapshotContext] = None
+    ) -> Optional[Dict]:
+        team = self._team(db, user, snapshots)
+        return self._burnout(team) if team is not None else None
 
-        if not scores:
+    def _burnout(self, team: TeamAggregate) -> Optional[Dict]:
+        # Latest score of every team member
+        if not team.count:
             return None
 
-        avg_risk = mean(scores)
-        # Population standard deviation (requires at least one data point, but meaningful with >1)
-        variance = pstdev(scores) if len(scores) > 1 else 0
+        avg_risk = team.mean
+        # Population standard deviation (meaningful with >1 member)
+        variance = team.pstdev
 
         # Heuristic Formula: 60% weight on raw risk, 40% on variance (instability)
         burnout_score = int((avg_risk * 0.6) + (variance * 0.4))
@@ -59,52 +84,27 @@ class TeamHealthEngine:
             "variance": int(variance)
         }
 
-    def simulate_member_exit(self, db: Session, user) -> Optional[Dict]:
+    def simulate_member_exit(
+        self, db: Session, user, snapshots: Optional[RiskSnapshotContext] = None
+    ) -> Optional[Dict]:
         """
         Simulates the impact on Team Average Risk if the lowest-risk member (The Anchor) leaves.
         """
-        profile = user.career_profile
-        if not profile or not profile.team:
-            return None
-
-        # 1. Fetch raw data for the team (User ID + Risk Score)
-        # Ordered by newest first to facilitate deduplication
-        raw_data = (
-            db.query(RiskSnapshot.user_id, RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-            .filter(CareerProfile.team == profile.team)
-            .order_by(RiskSnapshot.recorded_at.desc())
-            .all()
-        )
-
-        if not raw_data:
-            return None
-
-        # 2. Deduplicate: Get only the latest score per user
-        team_scores = {}
-        for uid, score in raw_data:
-            if uid not in team_scores:
-                team_scores[uid] = score
+        team = self._team(db, user, snapshots)
+        return self._member_exit(team) if team is not None else None
 
+    def _member_exit(self, team: TeamAggregate) -> Optional[Dict]:
         # Need at least 2 members to simulate an exit
-        if len(team_scores) < 2:
+        if team.count < 2:
             return None
 
-        scores = list(team_scores.values())
-        current_avg = mean(scores)
+        current_avg = team.mean
 
-        # 3. Identify the "Anchor" (Member with LOWEST risk)
-        # Removing them usually causes the average risk to spike up.
-        anchor_score = min(scores)
-
-        # 4. Simulate the team without the Anchor
-        # We use remove() on a copy to ensure we only remove one instance, even if multiple
-        # members share the same lowest score (handling the duplicate anchor edge case correctly).
-        scores_copy = list(scores)
-        scores_copy.remove(anchor_score)
-        simulated_scores = scores_copy
-
-        new_avg = mean(simulated_scores)
+        # The "Anchor" is the member with the LOWEST risk; removing them usually
+        # causes the average risk to spike up. Only one instance is removed, even
+        # if multiple members share the lowest score (duplicate anchor edge case).
+        anchor_score = team.min_score
+        new_avg = team.mean_without_min()
         impact = new_avg - current_avg
 
         return {
@@ -114,44 +114,27 @@ class TeamHealthEngine:
             "anchor_score": int(anchor_score)
         }
 
-    def internal_health_ranking(self, db: Session, user) -> List[Dict]:
+    def internal_health_ranking(
+        self, db: Session, user, snapshots: Optional[RiskSnapshotContext] = None
+    ) -> List[Dict]:
         """
         Ranks team members by risk score and calculates their contribution to the team average.
         """
-        profile = user.career_profile
-        if not profile or not profile.team:
-            return []
-
-        # 1. Fetch raw data
-        raw_data = (
-            db.query(RiskSnapshot.user_id, RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-            .filter(CareerProfile.team == profile.team)
-            .order_by(RiskSnapshot.recorded_at.desc())
-            .all()
-        )
+        team = self._team(db, user, snapshots)
+        return self._ranking(team, user.id) if team is not None else []
 
-        if not raw_data:
+    def _ranking(self, team: TeamAggregate, user_id: int) -> List[Dict]:
+        if not team.count:
             return []
 
-        # 2. Deduplicate
-        team_scores = {}
-        for uid, score in raw_data:
-            if uid not in team_scores:
-                team_scores[uid] = score
-
-        scores = list(team_scores.values())
-        if not scores:
-            return []
-
-        team_avg = mean(scores)
+        team_avg = team.mean
 
         ranking = []
-        for uid, score in team_scores.items():
+        for uid, score in team.members.items():
             contribution = score - team_avg
             ranking.append({
                 "user_id": uid,
-                "is_current_user": (uid == user.id),
+                "is_current_user": (uid == user_id),
                 "risk": score,
                 "contribution": round(contribution, 1)
             })
@@ -161,34 +144,26 @@ class TeamHealthEngine:
 
         return ranking
 
-    def simulate_new_hire(self, db: Session, user, hypothetical_risk: int = 20) -> Optional[Dict]:
+    def simulate_new_hire(
+        self,
+        db: Session,
+        user,
+        hypothetical_risk: int = 20,
+        snapshots: Optional[RiskSnapshotContext] = None
+    ) -> Optional[Dict]:
         """
         Simulates the impact on Team Average Risk if a new Low-Risk Developer joins.
         Hypothetical Risk defaults to 20 (a stable senior dev).
         """
-        profile = user.career_profile
-        if not profile or not profile.team:
+        team = self._team(db, user, snapshots)
+        return self._new_hire(team, hypothetical_risk) if team is not None else None
+
+    def _new_hire(self, team: TeamAggregate, hypothetical_risk: int) -> Optional[Dict]:
+        if not team.count:
             return None
-        # 1. Fetch raw data
-        raw_data = (
-            db.query(RiskSnapshot.user_id, RiskSnapshot.risk_score)
-            .join(CareerProfile, CareerProfile.user_id == RiskSnapshot.user_id)
-            .filter(CareerProfile.team == profile.team)
-            .order_by(RiskSnapshot.recorded_at.desc())
-            .all()
-        )
-        if not raw_data: return None
-        # 2. Deduplicate
-        team_scores = {}
-        for uid, score in raw_data:
-            if uid not in team_scores:
-                team_scores[uid] = score
-        scores = list(team_scores.values())
-        current_avg = mean(scores)
-        # 3. Simulate Hire
-        # Add the hypothetical new hire to the list
-        scores.append(hypothetical_risk)
-        new_avg = mean(scores)
+        current_avg = team.mean
+        # Simulate Hire: the hypothetical new hire joins the current members
+        new_avg = team.mean_with(hypothetical_risk)
 
         # Impact is usually negative (Risk decreases), so we invert for clarity if needed
         # Here: Negative impact means Risk went DOWN (Good)
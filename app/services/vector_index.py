@@ -0,0 +1,301 @@
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.mentor import MentorMemory, EMBEDDING_PENDING
+from app.services.embedding_codec import decode as decode_embedding
+
+try:
+    import fcntl
+except ImportError:     # Windows: single-process dev setups only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"MVI2"
+# `settled_id`: every memory of the user with id <= it is indexed or has no
+# embedding to index (memories still waiting for the embedder hold it back)
+_HEADER = np.dtype([("magic", "S4"), ("dim", "<u4"), ("settled_id", "<i8")])
+HEADER_BYTES = _HEADER.itemsize
+
+# One row per indexed memory, aligned with the rows of the vector file.
+# Filters compare crc32 of category / context_key; the DB row re-checks them.
+META_DTYPE = np.dtype([("id", "<i8"), ("category", "<u4"), ("context_key", "<u4")])
+
+
+def _tag(value: Optional[str]) -> int:
+    return zlib.crc32(value.encode("utf-8")) if value else 0
+
+
+class _Snapshot(NamedTuple):
+    vectors: np.ndarray     # (rows, dim) float32, memory-mapped
+    meta: np.ndarray        # (rows,) META_DTYPE
+    settled_id: int
+    version: Tuple          # file sizes/mtime when mapped
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+
+class MemoryVectorIndex:
+    """
+    Per-user vector index over the embeddings of MentorMemory rows.
+
+    Each user has two append-only files under `root`: `<user>.f32` (a small
+    header, then one contiguous float32 row per memory) and `<user>.meta`
+    (memory id + category/context_key tags per row). Readers memory-map them,
+    so a recall is one matrix-vector product over the user's rows plus an
+    argpartition for the top k, instead of parsing every memory's JSON.
+
+    The DB stays the source of truth: the embedder appends rows as it fills
+    them in, and `sync` indexes whatever is embedded above the header's
+    `settled_id` (memories stored before the index existed, embedded on
+    another host, or a failed append). Deleted memories are dropped when
+    their rows are fetched back. Writes hold an exclusive flock per user, so
+    several workers can share the directory.
+    """
+
+    def __init__(self, root: str = settings.MENTOR_VECTOR_INDEX_DIR, max_open: int = 256):
+        self.root = root
+        self.max_open = max_open
+        self._snapshots: "OrderedDict[int, _Snapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    # -----------------------------------------------------
+    # WRITES
+    # -----------------------------------------------------
+    def add(
+        self,
+        user_id: int,
+        memory_id: int,
+        embedding: Sequence[float],
+        category: Optional[str] = None,
+        context_key: Optional[str] = None
+    ) -> bool:
+        """Appends one memory. False if it is already indexed or has another dimension."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.ndim != 1 or not len(vector):
+            return False
+        with self._file_lock(user_id, exclusive=True):
+            snapshot = self._open(user_id)
+            rows = self._unindexed(snapshot, [(memory_id, vector, category, context_key)])
+            settled_id = snapshot.settled_id if snapshot is not None else 0
+            return self._write(user_id, snapshot, rows, settled_id) == 1
+
+    def sync(self, db: Session, user_id: int) -> Optional[_Snapshot]:
+        """Indexes the user's embedded memories above `settled_id`, then returns the index."""
+        snapshot = self.snapshot(user_id)
+        settled_id = snapshot.settled_id if snapshot is not None else 0
+        if db.query(MentorMemory.id).filter(
+            MentorMemory.user_id == user_id, MentorMemory.id > settled_id
+        ).first() is None:
+            return snapshot
+
+        with self._file_lock(user_id, exclusive=True):
+            snapshot = self._open(user_id)      # another worker may have synced meanwhile
+            settled_id = snapshot.settled_id if snapshot is not None else 0
+            rows, new_settled_id = self._pending(db, user_id, settled_id)
+            rows = self._unindexed(snapshot, rows)
+            if rows or new_settled_id != settled_id or snapshot is None:
+                self._write(user_id, snapshot, rows, new_settled_id)
+        return self.snapshot(user_id)
+
+    def rebuild(self, db: Session, user_id: int) -> Optional[_Snapshot]:
+        """Rewrites the user's index from the DB (drops rows of deleted memories)."""
+        with self._file_lock(user_id, exclusive=True):
+            for path in self._paths(user_id):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._forget(user_id)
+            rows, settled_id = self._pending(db, user_id, 0)
+            self._write(user_id, None, rows, settled_id)
+        return self.snapshot(user_id)
+
+    def _pending(self, db: Session, user_id: int, after_id: int) -> Tuple[List[Tuple], int]:
+        """Embedded memories with id > after_id, and the new settled id."""
+        query = (
+            db.query(
+                MentorMemory.id, MentorMemory.context_key, MentorMemory.memory_value,
+                MentorMemory.embedding, MentorMemory.embedding_dtype, MentorMemory.embedding_status
+            )
+            .filter(MentorMemory.user_id == user_id, MentorMemory.id > after_id)
+            .order_by(MentorMemory.id)
+        )
+        rows, settled_id, waiting = [], after_id, False
+        for memory_id, context_key, memory_value, blob, dtype, status in query:
+            if status == EMBEDDING_PENDING:
+                waiting = True      # settled_id stops below the first row not embedded yet
+                continue
+            if not waiting:
+                settled_id = memory_id
+            # Rows written before the binary column still carry the JSON list
+            if blob is None and '"embedding"' not in (memory_value or ""):
+                continue
+            try:
+                payload = json.loads(memory_value)
+                embedding = decode_embedding(blob, dtype) if blob is not None else payload.get("embedding")
+            except (TypeError, ValueError):
+                continue
+            if embedding is not None and len(embedding):
+                rows.append((memory_id, embedding, payload.get("category"), context_key))
+        return rows, settled_id
+
+    @staticmethod
+    def _unindexed(snapshot: Optional[_Snapshot], rows: List[Tuple]) -> List[Tuple]:
+        if snapshot is None or not len(snapshot.meta) or not rows:
+            return rows
+        indexed = np.isin([row[0] for row in rows], snapshot.meta["id"])
+        return [row for row, seen in zip(rows, indexed) if not seen]
+
+    def _write(self, user_id: int, snapshot: Optional[_Snapshot], rows: List[Tuple], settled_id: int) -> int:
+        """Appends rows and stores `settled_id` (caller holds the exclusive lock). Returns rows written."""
+        vec_path, meta_path = self._paths(user_id)
+        dim = snapshot.dim if snapshot is not None and snapshot.dim else (len(rows[0][1]) if rows else 0)
+
+        vectors, meta = [], []
+        for memory_id, embedding, category, context_key in rows:
+            vector = np.asarray(embedding, dtype=np.float32)
+            if vector.shape != (dim,):
+                logger.warning(f"[VectorIndex] user={user_id} memory={memory_id}: dim {vector.shape} != {dim}")
+                continue
+            vectors.append(vector)
+            meta.append((memory_id, _tag(category), _tag(context_key)))
+
+        os.makedirs(self.root, exist_ok=True)
+        rows_indexed = len(snapshot.meta) if snapshot is not None else 0
+        with open(vec_path, "r+b" if snapshot is not None else "wb") as f:
+            # Drops a torn tail left by a crash between the writes below
+            f.truncate(HEADER_BYTES + rows_indexed * dim * 4)
+            if vectors:
+                f.seek(0, os.SEEK_END)
+                f.write(np.stack(vectors).tobytes())
+        # Meta after the vectors: a row only counts once both files have it
+        with open(meta_path, "r+b" if snapshot is not None else "wb") as f:
+            # Same for a meta tail whose vectors never made it
+            f.truncate(rows_indexed * META_DTYPE.itemsize)
+            if meta:
+                f.seek(0, os.SEEK_END)
+                f.write(np.array(meta, dtype=META_DTYPE).tobytes())
+        # Header last: a crash before it only makes the next sync re-read rows
+        with open(vec_path, "r+b") as f:
+            f.write(np.array([(_MAGIC, dim, settled_id)], dtype=_HEADER).tobytes())
+        self._forget(user_id)
+        return len(vectors)
+
+    # -----------------------------------------------------
+    # READS
+    # -----------------------------------------------------
+    def snapshot(self, user_id: int) -> Optional[_Snapshot]:
+        """The user's index as memory-mapped arrays, or None if it was never built."""
+        version = self._version(user_id)
+        if version is None:
+            return None
+        with self._lock:
+            cached = self._snapshots.get(user_id)
+            if cached is not None and cached.version == version:
+                self._snapshots.move_to_end(user_id)
+                return cached
+        with self._file_lock(user_id, exclusive=False):
+            return self._open(user_id)
+
+    def search(
+        self,
+        snapshot: _Snapshot,
+        query: Sequence[float],
+        k: int,
+        category: Optional[str] = None,
+        context_key: Optional[str] = None
+    ) -> List[Tuple[int, float]]:
+        """Top-k (memory_id, dot product) of the rows matching the filters, best first."""
+        q = np.asarray(query, dtype=np.float32)
+        if q.shape != (snapshot.dim,) or not len(snapshot.meta) or k <= 0:
+            return []
+
+        candidates = None
+        if category is not None or context_key is not None:
+            mask = np.ones(len(snapshot.meta), dtype=bool)
+            if category is not None:
+                mask &= snapshot.meta["category"] == _tag(category)
+            if context_key is not None:
+                mask &= snapshot.meta["context_key"] == _tag(context_key)
+            candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                return []
+            scores = snapshot.vectors[candidates] @ q
+        else:
+            scores = snapshot.vectors @ q
+
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        rows = candidates[top] if candidates is not None else top
+        return list(zip(snapshot.meta["id"][rows].tolist(), scores[top].tolist()))
+
+    def _open(self, user_id: int) -> Optional[_Snapshot]:
+        version = self._version(user_id)
+        if version is None:
+            return None
+        vec_path, meta_path = self._paths(user_id)
+        header = np.fromfile(vec_path, dtype=_HEADER, count=1)
+        if not len(header) or header[0]["magic"] != _MAGIC:
+            return None
+
+        dim, settled_id = int(header[0]["dim"]), int(header[0]["settled_id"])
+        vec_size, _, meta_size = version
+        rows = min(meta_size // META_DTYPE.itemsize, (vec_size - HEADER_BYTES) // (dim * 4)) if dim else 0
+        if rows:
+            vectors = np.memmap(vec_path, dtype=np.float32, mode="r", offset=HEADER_BYTES, shape=(rows, dim))
+            meta = np.memmap(meta_path, dtype=META_DTYPE, mode="r", shape=(rows,))
+        else:
+            vectors, meta = np.zeros((0, dim), dtype=np.float32), np.zeros(0, dtype=META_DTYPE)
+        snapshot = _Snapshot(vectors, meta, settled_id, version)
+
+        with self._lock:
+            self._snapshots[user_id] = snapshot
+            self._snapshots.move_to_end(user_id)
+            while len(self._snapshots) > self.max_open:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def _version(self, user_id: int) -> Optional[Tuple]:
+        vec_path, meta_path = self._paths(user_id)
+        try:
+            vec = os.stat(vec_path)
+            return vec.st_size, vec.st_mtime_ns, os.path.getsize(meta_path)
+        except OSError:
+            return None
+
+    def _forget(self, user_id: int):
+        with self._lock:
+            self._snapshots.pop(user_id, None)
+
+    def _paths(self, user_id: int) -> Tuple[str, str]:
+        base = os.path.join(self.root, str(int(user_id)))
+        return f"{base}.f32", f"{base}.meta"
+
+    @contextmanager
+    def _file_lock(self, user_id: int, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, f"{int(user_id)}.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# Singleton Instance
+memory_index = MemoryVectorIndex()
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.career import CareerProfile
+from app.db.models.analytics import RiskSnapshot
+from app.db.models.latest_risk import LatestRisk
+from app.db.models.ml_risk_log import MLRiskLog
+from app.db.models.job_checkpoint import JobCheckpoint
+from app.services.batch_scoring import BatchRiskScorer, JOB_NAME
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _scorer(chunk_size=2):
+    forecaster = MagicMock()
+    # ML says 40 for everyone
+    forecaster.predict_batch.side_effect = lambda conf, commits: (
+        np.full(len(conf), 40), "test-v1"
+    )
+    lstm = MagicMock()
+    lstm.predict_many.side_effect = lambda windows: [w[-1] for w in windows]
+    return BatchRiskScorer(chunk_size=chunk_size, forecaster=forecaster, lstm=lstm, seed=7)
+
+
+def _add_user(db, email, metrics, skills=None, team="Core"):
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.add(CareerProfile(
+        user_id=user.id,
+        team=team,
+        github_activity_metrics=metrics,
+        linkedin_alignment_data={"skills": skills or {}}
+    ))
+    db.commit()
+    return user
+
+
+def test_rule_risk_matches_engine_thresholds():
+    scorer = _scorer()
+    conf = scorer._avg_confidence(
+        [{"raw_languages": {"Python": 200_000, "Go": 10_000}}, {}],
+        [{"skills": {"Go": {}}}, {}]
+    )
+    # Python: 100, Go: int((0.1 + 0.2) * 100) = 30
+    assert conf.tolist() == [65.0, 0.0]
+
+
+def test_batch_writes_snapshots_logs_and_latest_risk(db_session):
+    strong = _add_user(db_session, "a@x.com", {
+        "raw_languages": {"Python": 500_000}, "commits_last_30_days": 50
+    })
+    weak = _add_user(db_session, "b@x.com", {
+        "raw_languages": {"Python": 1_000}, "commits_last_30_days": 2, "velocity_score": "Low"
+    })
+    no_metrics = _add_user(db_session, "c@x.com", None)
+
+    stats = _scorer().run(db_session)
+
+    assert stats["scored"] == 3
+    assert stats["chunks"] == 2
+    assert stats["status"] == "done"
+    assert db_session.query(RiskSnapshot).count() == 3
+    assert db_session.query(MLRiskLog).count() == 3
+
+    logs = {log.user_id: log for log in db_session.query(MLRiskLog)}
+    assert logs[strong.id].rule_risk == 0
+    assert logs[weak.id].rule_risk == 80
+    assert logs[no_metrics.id].rule_risk == 60
+    for log in logs.values():
+        expected = log.rule_risk if log.experiment_group == "A" else (log.rule_risk + 40) // 2
+        assert log.final_risk == expected
+        assert log.model_version == "test-v1"
+
+    latest = db_session.get(LatestRisk, weak.id)
+    assert latest.risk_score == logs[weak.id].final_risk
+    assert latest.team == "Core"
+    snapshot = db_session.get(RiskSnapshot, latest.snapshot_id)
+    assert snapshot.user_id == weak.id
+
+
+def test_lstm_smooths_users_with_full_history(db_session):
+    user = _add_user(db_session, "a@x.com", {
+        "raw_languages": {"Python": 500_000}, "commits_last_30_days": 50
+    })
+    for day in range(10):
+        db_session.add(RiskSnapshot(
+            user_id=user.id, risk_score=90, risk_level="HIGH",
+            recorded_at=datetime(2026, 1, 1) + timedelta(days=day)
+        ))
+    db_session.commit()
+
+    scorer = _scorer()
+    scorer.run(db_session)
+
+    log = db_session.query(MLRiskLog).one()
+    assert scorer.lstm.predict_many.call_args[0][0] == [[90] * 10]
+    before_lstm = 0 if log.experiment_group == "A" else 20
+    assert log.final_risk == (before_lstm + 90) // 2
+
+
+def test_resumes_from_checkpoint(db_session):
+    users = [_add_user(db_session, f"u{i}@x.com", {"commits_last_30_days": 50}) for i in range(5)]
+
+    first = _scorer().run(db_session, max_chunks=1)
+    assert first["scored"] == 2
+    checkpoint = db_session.get(JobCheckpoint, JOB_NAME)
+    assert checkpoint.cursor == users[1].id
+    assert checkpoint.status == "running"
+
+    second = _scorer().run(db_session)
+    assert second["scored"] == 3
+    assert db_session.query(RiskSnapshot).count() == 5
+    assert db_session.get(JobCheckpoint, JOB_NAME).processed == 5
+
+    # A finished job starts over on the next run
+    third = _scorer().run(db_session)
+    assert third["scored"] == 5
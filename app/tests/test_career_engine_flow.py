@@ -5,11 +5,6 @@ from app.db.models.user import User
 from app.db.models.career import CareerProfile
 from datetime import datetime
 
-class MockRiskSnapshot:
-    def __init__(self, risk_score, recorded_at):
-        self.risk_score = risk_score
-        self.recorded_at = recorded_at
-
 @pytest.mark.asyncio
 async def test_get_counterfactual_flow():
     # Mock dependencies
@@ -31,9 +26,10 @@ async def test_get_counterfactual_flow():
 
     # Mock DB Query for RiskSnapshot
     # db.query().filter().order_by().limit().all()
+    # Rows: (risk_score, risk_level, recorded_at, created_at)
     mock_snapshots = [
-        MockRiskSnapshot(risk_score=20, recorded_at=datetime.utcnow()),
-        MockRiskSnapshot(risk_score=50, recorded_at=datetime.utcnow())
+        (20, "LOW", datetime.utcnow(), datetime.utcnow()),
+        (50, "MEDIUM", datetime.utcnow(), datetime.utcnow())
     ]
 
     # Setup chain
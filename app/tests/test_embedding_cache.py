@@ -0,0 +1,110 @@
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+
+from app.services import embedding_service
+from app.services.embedding_cache import EmbeddingCache
+
+
+class _FakeOpenAI:
+    """Records `embeddings.create` inputs; the vector encodes the text length."""
+
+    def __init__(self):
+        self.inputs = []
+        self.embeddings = SimpleNamespace(create=self.create)
+
+    def create(self, model, input):
+        self.inputs.append(list(input))
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[float(len(text)), 0.5]) for i, text in enumerate(input)
+        ])
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    fake = _FakeOpenAI()
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.db"), memory_entries=2)
+    with patch.object(embedding_service, "client", fake), \
+         patch.object(embedding_service, "embedding_cache", cache):
+        yield fake, cache
+
+
+def test_only_misses_go_upstream(upstream):
+    fake, cache = upstream
+    template = "🚀 Accelerator Mode active. Focus on real PR delivery this week."
+
+    first = embedding_service.embed_many([template, "other", template, ""])
+    assert fake.inputs == [[template, "other"]]      # deduplicated, empty skipped
+    assert first[0] == first[2] == [float(len(template)), 0.5]
+    assert first[3] == []
+
+    # Whitespace variants are the same content
+    second = embedding_service.embed_many(["  Accelerator\nnew ", template, "other"])
+    assert fake.inputs[1:] == [["Accelerator new"]]
+    assert second[1:] == first[:2]
+    assert embedding_service.embed_text(template) == first[0]
+    assert len(fake.inputs) == 2
+
+
+def test_persistent_tier_is_shared_and_bounded(tmp_path):
+    path = str(tmp_path / "embeddings.db")
+    writer = EmbeddingCache(path=path, memory_entries=1, max_entries=3)
+    vectors = {writer.key("m", f"text {i}"): np.full(4, i, dtype=np.float32) for i in range(5)}
+    writer.put_many(vectors)
+    assert writer.stats()["entries"] == 3
+
+    # Another worker: empty LRU, same SQLite file
+    reader = EmbeddingCache(path=path, memory_entries=10)
+    found = reader.get_many(vectors)
+    assert sorted(int(v[0]) for v in found.values()) == [2, 3, 4]
+    assert reader.stats()["disk_hits"] == 3 and reader.stats()["misses"] == 2
+
+    reader.get_many(vectors)
+    assert reader.stats()["memory_hits"] == 3
+    assert not next(iter(found.values())).flags.writeable
+
+
+def test_keys_depend_on_model_and_normalized_text():
+    key = EmbeddingCache.key
+    assert key("m", "a  b\n") == key("m", "a b")
+    assert key("m", "a b") != key("other-model", "a b")
+    assert key("m", "A b") != key("m", "a b")
+
+
+def test_api_errors_propagate_without_caching(upstream):
+    fake, cache = upstream
+    fake.embeddings = SimpleNamespace(create=lambda **_: (_ for _ in ()).throw(RuntimeError("429")))
+
+    with pytest.raises(RuntimeError):
+        embedding_service.embed_many(["text"])
+    assert embedding_service.embed_text("text") == []
+    assert cache.stats()["entries"] == 0
+
+
+def test_memory_hits_do_not_wait_on_disk_io(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.db"), memory_entries=10)
+    key = cache.key("m", "hot")
+    cache.put_many({key: np.ones(4, dtype=np.float32)})
+
+    found = []
+    reader = threading.Thread(target=lambda: found.append(cache.get_many([key])))
+    # Another thread busy in the SQLite tier (holds its connection lock)
+    with cache._table._lock:
+        reader.start()
+        reader.join(timeout=2)
+        assert not reader.is_alive()
+    assert list(found[0]) == [key]
+
+
+def test_disk_totals_track_replaced_entries(tmp_path):
+    cache = EmbeddingCache(path=str(tmp_path / "embeddings.db"))
+    key = cache.key("m", "a")
+    cache.put_many({key: np.ones(4, dtype=np.float32)})
+    cache.put_many({key: np.ones(8, dtype=np.float32), cache.key("m", "b"): np.ones(2, dtype=np.float32)})
+
+    counted = (cache.stats()["entries"], cache.stats()["bytes"])
+    cache._table.refresh_totals()
+    assert counted == (cache.stats()["entries"], cache.stats()["bytes"]) == (2, 40)
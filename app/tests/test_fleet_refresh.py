@@ -0,0 +1,117 @@
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.career import CareerProfile
+from app.db.models.harvest_job import HarvestJob
+from app.db.models.user import User
+from app.services.fleet_refresh import FleetRefresher, shard_of
+from app.services.job_queue import JobQueue, GITHUB_SYNC, PRIORITY_LOW
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+NOW = datetime.utcnow()
+
+
+def _user(db, user_id, hours_ago=None, commits=0, token="gh"):
+    db.add(User(id=user_id, email=f"u{user_id}@example.com", hashed_password="x", github_token=token))
+    metrics = {"commits_last_30_days": commits}
+    if hours_ago is not None:
+        metrics["synced_at"] = (NOW - timedelta(hours=hours_ago)).isoformat()
+    db.add(CareerProfile(user_id=user_id, github_activity_metrics=metrics))
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    _user(session, 1, hours_ago=30, commits=5)      # active, overdue
+    _user(session, 2, hours_ago=30, commits=0)      # idle: not due for 7 days
+    _user(session, 3)                               # never synced
+    _user(session, 4, hours_ago=200, commits=0)     # idle, overdue
+    _user(session, 5, hours_ago=2, commits=50)      # fresh
+    _user(session, 6, hours_ago=90, token=None)     # disconnected
+    session.commit()
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _refresher(**kwargs):
+    options = dict(interval_seconds=24 * 3600, idle_multiplier=7, cycle_seconds=3600,
+                   requests_per_hour=1000, requests_per_sync=10)
+    options.update(kwargs)
+    return FleetRefresher(queue=JobQueue(), **options)
+
+
+def test_shards_partition_users_evenly():
+    counts = Counter(shard_of(user_id, 4) for user_id in range(1, 10_001))
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > 2300
+
+
+def test_shard_filter_matches_python_hash(db):
+    refresher = _refresher()
+    by_shard = {
+        shard: sorted(user_id for user_id, _ in refresher._connected(db, shard, 3))
+        for shard in range(3)
+    }
+    assert sorted(sum(by_shard.values(), [])) == [1, 2, 3, 4, 5]
+    for shard, user_ids in by_shard.items():
+        assert all(shard_of(user_id, 3) == shard for user_id in user_ids)
+
+
+def test_plan_orders_by_staleness_and_skips_pending(db):
+    refresher = _refresher()
+    assert [c.user_id for c in refresher.plan(db, now=NOW)] == [3, 1, 4]
+
+    JobQueue().enqueue(db, GITHUB_SYNC, 1)
+    assert [c.user_id for c in refresher.plan(db, now=NOW)] == [3, 4]
+
+
+def test_failing_users_wait_an_interval_after_each_attempt(db):
+    refresher = _refresher()
+    queue = JobQueue()
+    for user_id in (1, 3):      # user 3 has never synced: its sync always fails
+        job = queue.enqueue(db, GITHUB_SYNC, user_id)
+        queue.fail(db, job, "GitHub API error", retry=False)
+        job.finished_at = NOW - timedelta(hours=2)
+    db.commit()
+
+    assert [c.user_id for c in refresher.plan(db, now=NOW)] == [4]
+    # Due again one interval after the failed attempt (idle users: seven)
+    assert [c.user_id for c in refresher.plan(db, now=NOW + timedelta(hours=23))] == [4, 5, 1]
+    assert 3 not in [c.user_id for c in refresher.plan(db, now=NOW + timedelta(days=6))]
+    assert 3 in [c.user_id for c in refresher.plan(db, now=NOW + timedelta(days=7))]
+
+
+def test_cycle_is_capped_by_budget_and_backlog(db):
+    refresher = _refresher(requests_per_hour=20)   # 2 syncs per cycle
+
+    stats = refresher.run_cycle(db)
+    assert stats["enqueued"] == 2 and stats["deferred"] == 1
+    jobs = db.query(HarvestJob).all()
+    assert sorted(job.user_id for job in jobs) == [1, 3]
+    assert all(job.priority == PRIORITY_LOW for job in jobs)
+
+    # The workers have not drained them yet: nothing more is queued
+    stats = refresher.run_cycle(db)
+    assert stats["enqueued"] == 0 and stats["backlog"] == 2
+
+
+def test_freshness_percentiles(db):
+    report = _refresher().freshness(db, now=NOW)
+
+    assert report["connected_users"] == 5
+    assert report["never_synced"] == 1
+    assert report["overdue"] == 2
+    assert report["age_hours_p50"] == pytest.approx(30)
+    assert report["age_hours_max"] == pytest.approx(200)
@@ -0,0 +1,143 @@
+import httpx
+import pytest
+
+from app.services.github_cache import GitHubResponseCache
+
+
+class _FakeGitHub:
+    """Serves JSON with an ETag per URL and honours If-None-Match like GitHub."""
+
+    def __init__(self):
+        self.versions = {}
+        self.calls = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        version = self.versions.get(path, 1)
+        etag = f'"{path}-v{version}"'
+        self.calls.append((path, request.headers.get("If-None-Match")))
+        remaining = str(5000 - len(self.calls))
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag, "X-RateLimit-Remaining": remaining})
+        return httpx.Response(
+            200,
+            json={"path": path, "version": version},
+            headers={"ETag": etag, "X-RateLimit-Remaining": remaining}
+        )
+
+
+@pytest.fixture
+def github():
+    fake = _FakeGitHub()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    yield fake, client
+
+
+HEADERS = {"Authorization": "Bearer token-a", "Accept": "application/vnd.github.v3+json"}
+
+
+@pytest.mark.asyncio
+async def test_repeat_request_is_served_from_304(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:")
+
+    first = await cache.get(client, "https://api.github.com/user", HEADERS)
+    second = await cache.get(client, "https://api.github.com/user", HEADERS)
+
+    assert first.json() == second.json() == {"path": "/user", "version": 1}
+    assert second.status_code == 200
+    # Validator replayed and fresh rate-limit header surfaced
+    assert fake.calls[1] == ("/user", '"/user-v1"')
+    assert second.headers["X-RateLimit-Remaining"] == "4998"
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_changed_resource_is_refetched(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:")
+
+    await cache.get(client, "https://api.github.com/user/repos", HEADERS)
+    fake.versions["/user/repos"] = 2
+    resp = await cache.get(client, "https://api.github.com/user/repos", HEADERS)
+
+    assert resp.json()["version"] == 2
+    assert cache.stats()["misses"] == 2
+    resp = await cache.get(client, "https://api.github.com/user/repos", HEADERS)
+    assert resp.json()["version"] == 2
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_are_scoped_to_the_token(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:")
+
+    await cache.get(client, "https://api.github.com/user", HEADERS)
+    await cache.get(client, "https://api.github.com/user", {**HEADERS, "Authorization": "Bearer token-b"})
+
+    assert fake.calls[1] == ("/user", None)
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_entry_count(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:", max_entries=2, touch_interval=0)
+
+    await cache.get(client, "https://api.github.com/a", HEADERS)
+    await cache.get(client, "https://api.github.com/b", HEADERS)
+    await cache.get(client, "https://api.github.com/a", HEADERS)   # touch a
+    await cache.get(client, "https://api.github.com/c", HEADERS)   # evicts b
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+
+    fake.calls.clear()
+    await cache.get(client, "https://api.github.com/a", HEADERS)
+    await cache.get(client, "https://api.github.com/b", HEADERS)
+    assert fake.calls == [("/a", '"/a-v1"'), ("/b", None)]
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_bytes(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:", max_bytes=60)
+
+    for path in ("a", "b", "c"):
+        await cache.get(client, f"https://api.github.com/{path}", HEADERS)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 60
+    assert stats["evictions"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_passes_through(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:", enabled=False)
+
+    await cache.get(client, "https://api.github.com/user", HEADERS)
+    await cache.get(client, "https://api.github.com/user", HEADERS)
+
+    assert fake.calls == [("/user", None), ("/user", None)]
+    assert cache.stats()["misses"] == 0
+
+
+@pytest.mark.asyncio
+async def test_totals_follow_replaced_entries(github):
+    fake, client = github
+    cache = GitHubResponseCache(path=":memory:")
+
+    await cache.get(client, "https://api.github.com/a", HEADERS)
+    await cache.get(client, "https://api.github.com/b", HEADERS)
+    # Same key stored again (new body): one entry, its new size counted once
+    cache._store(cache._key("https://api.github.com/a", HEADERS), "https://api.github.com/a",
+                 '"x"', None, {}, b"x" * 100)
+
+    counted = (cache._table.entries, cache._table.bytes)
+    cache._table.refresh_totals()
+    assert counted == (cache._table.entries, cache._table.bytes)
+    assert counted[0] == 2 and counted[1] >= 100
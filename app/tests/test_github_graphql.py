@@ -0,0 +1,113 @@
+import json
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.github_repo_state import GitHubRepoState
+from app.services import github_graphql
+from app.services.social_harvester import SocialHarvester
+
+FIXTURES = Path(__file__).parent / "fixtures" / "github_graphql"
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _fixture(name):
+    return json.loads((FIXTURES / name).read_text())
+
+
+class _RecordedGraphQL:
+    """Replays recorded responses, keyed by the pagination cursor sent."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        assert request.method == "POST" and request.url.path == "/graphql"
+        body = json.loads(request.content)
+        self.requests.append(body)
+        return httpx.Response(200, json=self.pages[body["variables"]["after"]])
+
+
+@pytest.fixture
+def graphql(monkeypatch):
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add(User(id=1, email="me@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+
+    page1 = _fixture("repositories_page1.json")
+    cursor = page1["data"]["viewer"]["repositories"]["pageInfo"]["endCursor"]
+    recorded = _RecordedGraphQL({None: page1, cursor: _fixture("repositories_page2.json")})
+
+    monkeypatch.setattr(settings, "GITHUB_HARVEST_BACKEND", "graphql")
+    monkeypatch.setattr(settings, "GITHUB_GRAPHQL_PAGE_SIZE", 2)
+    pool = MagicMock()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(recorded.handler))
+    with patch("app.services.social_harvester.SessionLocal", TestingSessionLocal), \
+         patch("app.services.social_harvester.http_pool", pool):
+        yield recorded
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_matches_rest_contract(graphql):
+    langs, metrics = await SocialHarvester()._harvest_github_raw("token", user_id=1)
+
+    assert len(graphql.requests) == 2   # 3 repos, pages of 2
+    assert graphql.requests[1]["variables"]["after"] is not None
+    assert langs == {"Python": 1000, "TypeScript": 500}
+    assert metrics["top_repo"] == "api"
+    assert sorted(metrics["detected_frameworks"]) == ["fastapi", "numpy", "react"]
+    assert metrics["commits_last_30_days"] == 37
+    assert metrics["velocity_score"] == "Medium"
+    assert set(metrics) == {"commits_last_30_days", "top_repo", "velocity_score", "detected_frameworks"}
+
+
+@pytest.mark.asyncio
+async def test_graphql_backend_checkpoints_repo_states(graphql):
+    await SocialHarvester()._harvest_github_raw("token", user_id=1)
+
+    db = TestingSessionLocal()
+    states = {s.repo_full_name: s for s in db.query(GitHubRepoState).all()}
+    db.close()
+    # Repos never pushed have nothing to checkpoint
+    assert set(states) == {"me/api", "me/web"}
+    assert states["me/api"].pushed_at == "2026-01-01T00:00:00Z"
+    assert states["me/api"].languages == {"Python": 1000}
+    assert sorted(states["me/api"].frameworks) == ["fastapi", "numpy"]
+
+
+@pytest.mark.asyncio
+async def test_graphql_error_returns_empty_harvest(graphql):
+    graphql.pages[None] = _fixture("error.json")
+
+    langs, metrics = await SocialHarvester()._harvest_github_raw("token", user_id=1)
+
+    assert langs == {}
+    assert metrics["commits_last_30_days"] == 0
+    assert metrics["top_repo"] == "N/A"
+
+
+def test_query_requests_each_dependency_file():
+    filenames = list(SocialHarvester.HARVEST_RAW_FILES)
+    query = github_graphql.build_repositories_query(filenames)
+
+    for name in filenames:
+        assert f'{github_graphql.blob_alias(name)}: object(expression: "HEAD:{name}")' in query
+    variables = github_graphql.query_variables(500, None, datetime(2026, 1, 1))
+    assert variables == {"first": 100, "after": None, "since": "2026-01-01T00:00:00Z"}
@@ -0,0 +1,204 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.harvest_scheduler import (
+    HarvestScheduler, harvest_priority, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+)
+
+HEADERS = {"Authorization": "Bearer token-a"}
+URL = "https://api.github.com/user/repos"
+
+
+def _response(status=200, **headers):
+    return httpx.Response(status, headers={k.replace("_", "-"): str(v) for k, v in headers.items()})
+
+
+@pytest.mark.asyncio
+async def test_concurrency_follows_remaining_budget():
+    scheduler = HarvestScheduler(max_concurrency=8)
+    running, peak = 0, 0
+
+    async def send():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        # 25 calls left -> 2 slots
+        return _response(X_RateLimit_Remaining=25, X_RateLimit_Limit=5000)
+
+    await scheduler.get(HEADERS, URL, send)   # learns the budget
+    peak = 0
+    await asyncio.gather(*(scheduler.get(HEADERS, URL, send) for _ in range(10)))
+
+    assert peak == 2
+    budget = next(iter(scheduler.stats()["budgets"].values()))
+    assert budget["concurrency"] == 2
+    assert budget["remaining"] == 25
+
+
+@pytest.mark.asyncio
+async def test_budgets_are_per_token_and_host():
+    scheduler = HarvestScheduler(max_concurrency=1)
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+        return _response()
+
+    hold = asyncio.create_task(scheduler.get(HEADERS, URL, blocked))
+    await asyncio.sleep(0)
+
+    # Other token and other host are not queued behind the held slot
+    other_token = await asyncio.wait_for(
+        scheduler.get({"Authorization": "Bearer token-b"}, URL, lambda: asyncio.sleep(0, _response())), 1
+    )
+    other_host = await asyncio.wait_for(
+        scheduler.get(HEADERS, "https://raw.githubusercontent.com/x", lambda: asyncio.sleep(0, _response())), 1
+    )
+    assert other_token.status_code == other_host.status_code == 200
+    assert len(scheduler.stats()["budgets"]) == 3
+
+    release.set()
+    await hold
+
+
+@pytest.mark.asyncio
+async def test_interactive_requests_jump_the_queue():
+    scheduler = HarvestScheduler(max_concurrency=1)
+    release = asyncio.Event()
+    order = []
+
+    async def held():
+        await release.wait()
+        return _response()
+
+    def job(name):
+        async def send():
+            order.append(name)
+            return _response()
+        return send
+
+    hold = asyncio.create_task(scheduler.get(HEADERS, URL, held))
+    await asyncio.sleep(0)
+
+    with harvest_priority(PRIORITY_BACKGROUND):
+        background = [asyncio.create_task(scheduler.get(HEADERS, URL, job(f"bg{i}"))) for i in range(3)]
+    await asyncio.sleep(0)
+    with harvest_priority(PRIORITY_INTERACTIVE):
+        interactive = asyncio.create_task(scheduler.get(HEADERS, URL, job("verify_task")))
+    await asyncio.sleep(0)
+
+    assert scheduler.stats()["queue_depth"] == 4
+    release.set()
+    await asyncio.gather(hold, interactive, *background)
+
+    assert order == ["verify_task", "bg0", "bg1", "bg2"]
+    waits = scheduler.stats()["wait_ms"]
+    assert waits["background"]["count"] == 3
+    assert waits["interactive"]["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_background_requests_leave_the_reserve_to_interactive_ones():
+    scheduler = HarvestScheduler(background_reserve=0.1)
+    reset_at = time.time() + 0.3
+    order = []
+
+    def job(name, remaining):
+        async def send():
+            order.append(name)
+            return _response(X_RateLimit_Remaining=remaining, X_RateLimit_Limit=5000, X_RateLimit_Reset=reset_at)
+        return send
+
+    with harvest_priority(PRIORITY_BACKGROUND):
+        await scheduler.get(HEADERS, URL, job("bg0", 499))     # another process used the rest
+        started = time.monotonic()
+        background = asyncio.create_task(scheduler.get(HEADERS, URL, job("bg1", 4999)))
+    await asyncio.sleep(0.05)
+    with harvest_priority(PRIORITY_INTERACTIVE):
+        await scheduler.get(HEADERS, URL, job("verify_task", 498))
+    await background
+
+    assert order == ["bg0", "verify_task", "bg1"]
+    assert time.monotonic() - started >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_backs_off_and_retries():
+    scheduler = HarvestScheduler()
+    responses = [_response(429, Retry_After=0.2), _response(200)]
+    calls = []
+
+    async def send():
+        calls.append(time.monotonic())
+        return responses.pop(0)
+
+    resp = await scheduler.get(HEADERS, URL, send)
+
+    assert resp.status_code == 200
+    assert calls[1] - calls[0] >= 0.19
+    stats = scheduler.stats()
+    assert stats["throttled"] == 1
+    assert stats["retries"] == 1
+
+
+@pytest.mark.asyncio
+async def test_exhausted_budget_waits_for_reset():
+    scheduler = HarvestScheduler()
+    reset_at = time.time() + 0.2
+
+    async def exhausted():
+        return _response(200, X_RateLimit_Remaining=0, X_RateLimit_Reset=reset_at)
+
+    await scheduler.get(HEADERS, URL, exhausted)
+
+    started = time.monotonic()
+    await scheduler.get(HEADERS, URL, lambda: asyncio.sleep(0, _response()))
+    assert time.monotonic() - started >= 0.15
+
+
+@pytest.mark.asyncio
+async def test_primary_limit_403_is_retried_after_reset():
+    scheduler = HarvestScheduler()
+    reset_at = time.time() + 0.2
+    responses = [
+        _response(403, X_RateLimit_Remaining=0, X_RateLimit_Reset=reset_at),
+        _response(200, X_RateLimit_Remaining=4999, X_RateLimit_Reset=reset_at + 3600),
+    ]
+
+    resp = await scheduler.get(HEADERS, URL, lambda: asyncio.sleep(0, responses.pop(0)))
+
+    assert resp.status_code == 200
+    assert time.time() >= reset_at
+
+
+@pytest.mark.asyncio
+async def test_idle_budgets_are_pruned():
+    now = [1000.0]
+    scheduler = HarvestScheduler(clock=lambda: now[0])
+    release = asyncio.Event()
+
+    async def blocked():
+        await release.wait()
+        return _response()
+
+    hold = asyncio.create_task(scheduler.get({"Authorization": "Bearer busy"}, URL, blocked))
+    await asyncio.sleep(0)
+    for i in range(50):
+        token = {"Authorization": f"Bearer user-{i}"}
+        reset = now[0] + 3600 if i == 0 else now[0] + 30
+        await scheduler.get(token, URL, lambda: asyncio.sleep(0, _response(
+            X_RateLimit_Remaining=4000, X_RateLimit_Reset=reset
+        )))
+    assert len(scheduler.stats()["budgets"]) == 51
+
+    now[0] += 120
+    # Kept: the in-flight one and the one whose window has not reset yet
+    assert len(scheduler.stats()["budgets"]) == 2
+
+    release.set()
+    await hold
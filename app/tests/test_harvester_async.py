@@ -28,7 +28,7 @@ async def test_harvest_linkedin_data_uses_to_thread():
             assert calls[1][0][0] == social_harvester._save_linkedin_data_sync
 
 @pytest.mark.asyncio
-async def test_harvest_github_data_uses_to_thread():
+async def test_sync_profile_uses_to_thread():
     # calls sync_profile
     with patch("asyncio.to_thread", new_callable=AsyncMock) as mock_to_thread:
         with patch.object(social_harvester, "_harvest_github_raw", new_callable=AsyncMock) as mock_harvest_raw:
@@ -39,7 +39,7 @@ async def test_harvest_github_data_uses_to_thread():
             # 2. _save_github_data_sync -> None
             mock_to_thread.side_effect = [("Senior Developer", None), None]
 
-            await social_harvester.harvest_github_data(1, "token")
+            await social_harvester.sync_profile(1, "token")
 
             assert mock_to_thread.call_count == 2
             calls = mock_to_thread.call_args_list
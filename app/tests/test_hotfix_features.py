@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import MagicMock, patch
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy import create_engine, StaticPool
 from sqlalchemy.orm import sessionmaker
@@ -96,8 +96,7 @@ async def test_kanban_complete_endpoint(client, db_session):
     session_proxy.close = MagicMock() # Prevent middleware from closing the shared session
 
     # Mock background tasks to verify call
-    with patch("app.services.social_harvester.social_harvester.harvest_github_data", new_callable=AsyncMock) as mock_harvest, \
-         patch("app.middleware.auth.SessionLocal", return_value=session_proxy):
+    with patch("app.middleware.auth.SessionLocal", return_value=session_proxy):
 
         response = await client.post("/api/dashboard/tasks/101/complete")
 
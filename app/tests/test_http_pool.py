@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.core.http_client import HTTPClientPool
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    connections = 0
+
+    def setup(self):
+        super().setup()
+        type(self).connections += 1
+
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(0.5)
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    _StubHandler.connections = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests_reuse_one_connection(stub_server):
+    pool = HTTPClientPool(host_timeouts={})
+    try:
+        for _ in range(20):
+            resp = await pool.client.get(f"{stub_server}/")
+            assert resp.text == "ok"
+
+        stats = pool.stats()
+        assert _StubHandler.connections == 1
+        assert stats["requests"] == 20
+        assert stats["hosts"]["127.0.0.1"] == {
+            "requests": 20, "connections_opened": 1, "tls_handshakes": 0
+        }
+        assert stats["reuse_ratio"] == 0.95
+        assert stats["pool"] == {"open": 1, "idle": 1}
+    finally:
+        await pool.aclose()
+
+    assert pool.stats()["started"] is False
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_by_pool_limits(stub_server):
+    pool = HTTPClientPool(max_connections=3, max_keepalive_connections=3, host_timeouts={})
+    try:
+        await asyncio.gather(*(pool.client.get(f"{stub_server}/") for _ in range(15)))
+        assert _StubHandler.connections <= 3
+        assert pool.stats()["connections_opened"] == _StubHandler.connections
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_host_timeout_applies_unless_caller_overrides(stub_server):
+    pool = HTTPClientPool(timeout=5.0, host_timeouts={"127.0.0.1": 0.1})
+    try:
+        with pytest.raises(httpx.ReadTimeout):
+            await pool.client.get(f"{stub_server}/slow")
+
+        resp = await pool.client.get(f"{stub_server}/slow", timeout=2.0)
+        assert resp.status_code == 200
+    finally:
+        await pool.aclose()
+
+
+def test_new_event_loop_gets_a_fresh_client(stub_server):
+    pool = HTTPClientPool(host_timeouts={})
+
+    async def fetch():
+        return (await pool.client.get(f"{stub_server}/")).status_code
+
+    assert asyncio.run(fetch()) == 200
+    assert asyncio.run(fetch()) == 200
+    assert pool.clients_created == 2
@@ -0,0 +1,143 @@
+import httpx
+import pytest
+from unittest.mock import MagicMock, patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.github_repo_state import GitHubRepoState
+from app.services.github_cache import GitHubResponseCache
+from app.services.social_harvester import SocialHarvester
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class _FakeGitHub:
+    def __init__(self):
+        self.repos = {"api": "2026-01-01T00:00:00Z", "web": "2026-01-02T00:00:00Z"}
+        self.languages = {"api": {"Python": 1000}, "web": {"TypeScript": 500}}
+        self.files = {"api": b"fastapi\nnumpy\n", "web": b'{"dependencies": {"react": "18"}}'}
+        self.failing = set()
+        self.paths = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.paths.append(path)
+        if path == "/user/repos":
+            return httpx.Response(200, json=[
+                {
+                    "name": name,
+                    "full_name": f"me/{name}",
+                    "owner": {"login": "me"},
+                    "pushed_at": pushed_at,
+                    "languages_url": f"https://api.github.com/repos/me/{name}/languages",
+                    "contents_url": f"https://api.github.com/repos/me/{name}/contents/{{+path}}",
+                }
+                for name, pushed_at in self.repos.items()
+            ])
+        if path.endswith("/languages"):
+            name = path.split("/")[3]
+            if name in self.failing:
+                return httpx.Response(500)
+            return httpx.Response(200, json=self.languages[name])
+        if "/contents/" in path:
+            name = path.split("/")[3]
+            manifest = "requirements.txt" if name == "api" else "package.json"
+            return httpx.Response(200, json=[{
+                "name": manifest,
+                "download_url": f"https://raw.githubusercontent.com/me/{name}/main/{manifest}"
+            }])
+        if request.url.host == "raw.githubusercontent.com":
+            return httpx.Response(200, content=self.files[path.split("/")[2]])
+        if path == "/users/me/events":
+            return httpx.Response(200, json=[])
+        return httpx.Response(404)
+
+
+@pytest.fixture
+def github():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    db.add(User(id=1, email="me@example.com", hashed_password="x"))
+    db.commit()
+    db.close()
+
+    fake = _FakeGitHub()
+    pool = MagicMock()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handler))
+    with patch("app.services.social_harvester.SessionLocal", TestingSessionLocal), \
+         patch("app.services.social_harvester.http_pool", pool), \
+         patch("app.services.social_harvester.github_cache", GitHubResponseCache(enabled=False)):
+        yield fake
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.mark.asyncio
+async def test_unchanged_account_costs_two_requests(github):
+    harvester = SocialHarvester()
+
+    langs, metrics = await harvester._harvest_github_raw("token", user_id=1)
+    assert len(github.paths) == 8  # repos + 2 x (languages, contents, file) + events
+
+    github.paths.clear()
+    langs_again, metrics_again = await harvester._harvest_github_raw("token", user_id=1)
+
+    assert github.paths == ["/user/repos", "/users/me/events"]
+    assert langs_again == langs == {"Python": 1000, "TypeScript": 500}
+    assert sorted(metrics_again["detected_frameworks"]) == ["fastapi", "numpy", "react"]
+    assert metrics_again["top_repo"] == "api"
+
+
+@pytest.mark.asyncio
+async def test_only_pushed_repos_are_refetched(github):
+    harvester = SocialHarvester()
+    await harvester._harvest_github_raw("token", user_id=1)
+
+    github.repos["web"] = "2026-02-01T00:00:00Z"
+    github.languages["web"] = {"TypeScript": 5000}
+    github.paths.clear()
+
+    langs, _ = await harvester._harvest_github_raw("token", user_id=1)
+
+    assert not any("/repos/me/api" in p for p in github.paths)
+    assert "/repos/me/web/languages" in github.paths
+    assert langs == {"Python": 1000, "TypeScript": 5000}
+
+    db = TestingSessionLocal()
+    state = db.query(GitHubRepoState).filter_by(user_id=1, repo_full_name="me/web").one()
+    assert state.pushed_at == "2026-02-01T00:00:00Z"
+    db.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_repo_is_not_checkpointed(github):
+    harvester = SocialHarvester()
+    github.failing.add("web")
+    await harvester._harvest_github_raw("token", user_id=1)
+
+    github.failing.clear()
+    github.paths.clear()
+    langs, _ = await harvester._harvest_github_raw("token", user_id=1)
+
+    assert "/repos/me/web/languages" in github.paths
+    assert "/repos/me/api/languages" not in github.paths
+    assert langs["TypeScript"] == 500
+
+
+@pytest.mark.asyncio
+async def test_dependency_scan_reuses_stored_skills(github):
+    harvester = SocialHarvester()
+
+    first = await harvester.scan_user_dependencies(1, "token")
+    github.paths.clear()
+    second = await harvester.scan_user_dependencies(1, "token")
+
+    assert github.paths == ["/user/repos"]
+    assert second == first
+    assert first["Fastapi"] == ["api"]
+    assert first["React"] == ["web"]
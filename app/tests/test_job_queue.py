@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.harvest_job import HarvestJob
+from app.db.models.user import User
+from app.jobs.harvest_worker import HarvestWorker
+from app.services.job_queue import JobQueue, GITHUB_SYNC, LINKEDIN_SYNC, PRIORITY_HIGH
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _seed(session):
+    session.add_all([
+        User(id=1, email="a@example.com", hashed_password="x", github_token="gh-a"),
+        User(id=2, email="b@example.com", hashed_password="x", linkedin_token="li-b"),
+    ])
+    session.commit()
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    _seed(session)
+    yield session
+    session.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def file_sessions(tmp_path):
+    """Session factory on a file database: the worker's threads each get their own connection."""
+    file_engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False, "timeout": 10}
+    )
+    Base.metadata.create_all(bind=file_engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=file_engine)
+    with factory() as session:
+        _seed(session)
+    yield factory
+    file_engine.dispose()
+
+
+def test_enqueue_dedupes_pending_job_per_user(db):
+    queue = JobQueue()
+    first = queue.enqueue(db, GITHUB_SYNC, 1)
+    second = queue.enqueue(db, GITHUB_SYNC, 1, priority=PRIORITY_HIGH)
+    other_kind = queue.enqueue(db, LINKEDIN_SYNC, 1)
+
+    assert second.id == first.id
+    assert second.priority == PRIORITY_HIGH
+    assert other_kind.id != first.id
+    assert db.query(HarvestJob).count() == 2
+
+    # Once running, a new trigger queues a fresh job
+    queue.claim(db, "w1", limit=5)
+    assert queue.enqueue(db, GITHUB_SYNC, 1).id != first.id
+
+
+def test_claim_orders_by_priority_and_never_double_claims(db):
+    queue = JobQueue()
+    low = queue.enqueue(db, GITHUB_SYNC, 1)
+    high = queue.enqueue(db, LINKEDIN_SYNC, 2, priority=PRIORITY_HIGH)
+    queue.enqueue(db, GITHUB_SYNC, 2, delay_seconds=3600)   # not due yet
+
+    claimed = queue.claim(db, "w1", limit=1)
+    assert [job.id for job in claimed] == [high.id]
+    assert claimed[0].status == "running" and claimed[0].attempts == 1
+
+    assert [job.id for job in queue.claim(db, "w2", limit=5)] == [low.id]
+    assert queue.claim(db, "w3", limit=5) == []
+
+
+def test_failures_back_off_then_give_up(db):
+    queue = JobQueue(max_attempts=2, backoff_base=30, backoff_max=60)
+    queue.enqueue(db, GITHUB_SYNC, 1)
+
+    job = queue.claim(db, "w1")[0]
+    queue.fail(db, job, "boom")
+    assert job.status == "queued"
+    assert job.run_after > datetime.utcnow() + timedelta(seconds=20)
+    assert queue.claim(db, "w1") == []
+
+    job.run_after = datetime.utcnow()
+    db.commit()
+    job = queue.claim(db, "w1")[0]
+    queue.fail(db, job, "boom again")
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert job.last_error == "boom again"
+
+
+def test_expired_lease_is_requeued(db):
+    queue = JobQueue(lease_seconds=60, backoff_base=0)
+    queue.enqueue(db, GITHUB_SYNC, 1)
+    job = queue.claim(db, "dead-worker")[0]
+    job.locked_at = datetime.utcnow() - timedelta(seconds=120)
+    db.commit()
+
+    reclaimed = queue.claim(db, "w2")
+    assert [j.id for j in reclaimed] == [job.id]
+    assert reclaimed[0].locked_by == "w2"
+    assert reclaimed[0].attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_worker_runs_handlers_with_user_tokens(file_sessions):
+    db = file_sessions()
+    queue = JobQueue(backoff_base=0)
+    calls = []
+
+    async def github(user_id, token):
+        calls.append((GITHUB_SYNC, user_id, token))
+        return True
+
+    async def linkedin(user_id, token):
+        calls.append((LINKEDIN_SYNC, user_id, token))
+        return False
+
+    queue.enqueue(db, GITHUB_SYNC, 1)
+    queue.enqueue(db, LINKEDIN_SYNC, 2)
+    queue.enqueue(db, LINKEDIN_SYNC, 1)    # user 1 has no LinkedIn token
+
+    worker = HarvestWorker(
+        queue=queue,
+        concurrency=4,
+        handlers={GITHUB_SYNC: ("github_token", github), LINKEDIN_SYNC: ("linkedin_token", linkedin)},
+        session_factory=file_sessions
+    )
+    assert await worker.run_once() == 3
+
+    assert sorted(calls) == [(GITHUB_SYNC, 1, "gh-a"), (LINKEDIN_SYNC, 2, "li-b")]
+    db.expire_all()
+    status = queue.status_for_user(db, 1)
+    assert {kind: job["status"] for kind, job in status.items()} == {
+        GITHUB_SYNC: "done", LINKEDIN_SYNC: "failed"
+    }
+    statuses = {(j.kind, j.user_id): (j.status, j.last_error) for j in db.query(HarvestJob)}
+    assert statuses[(GITHUB_SYNC, 1)] == ("done", None)
+    assert statuses[(LINKEDIN_SYNC, 2)] == ("queued", "handler reported failure")
+    assert statuses[(LINKEDIN_SYNC, 1)] == ("failed", "user has no linkedin_token")
+    db.close()
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from app.services.keyword_matcher import KeywordMatcher, matcher_for
+from app.services.social_harvester import SocialHarvester
+
+
+async def _chunks(data: bytes, sizes):
+    pos = 0
+    for size in sizes:
+        if pos >= len(data):
+            break
+        yield data[pos:pos + size]
+        pos += size
+    if pos < len(data):
+        yield data[pos:]
+
+
+def _naive(content: bytes, keyword_map):
+    lowered = content.lower()
+    return [original for kw, original in keyword_map.items() if kw in lowered]
+
+
+def _all_keywords():
+    harvester = SocialHarvester()
+    return {kw: original for m in harvester.scan_deps_map_bytes.values() for kw, original in m.items()}
+
+
+@pytest.mark.asyncio
+async def test_matches_naive_scan_for_any_chunking():
+    keyword_map = _all_keywords()
+    rng = random.Random(7)
+    vocabulary = list(keyword_map) + [b"lodash", b"web", b"reac", b"spr", b"\n", b"  ", b"ToKiO", b"RAILS"]
+
+    for _ in range(200):
+        content = b" ".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 30)))
+        expected = _naive(content, keyword_map)
+        sizes = [rng.randint(1, 12) for _ in range(len(content) + 1)]
+
+        assert matcher_for(keyword_map).find(content) == expected
+        assert sorted(await matcher_for(keyword_map).find_in_stream(_chunks(content, sizes))) == sorted(expected)
+
+
+@pytest.mark.asyncio
+async def test_stops_reading_once_everything_is_found():
+    matcher = KeywordMatcher({b"react": "react", b"vue": "vue"})
+    consumed = []
+
+    async def stream():
+        for chunk in (b"vue + re", b"act", b"x" * 100, b"y" * 100):
+            consumed.append(chunk)
+            yield chunk
+
+    assert await matcher.find_in_stream(stream()) == ["react", "vue"]
+    assert len(consumed) == 2
+
+
+def test_colliding_trigrams_and_short_keywords():
+    # 16-bit trigram hashes collide; only real substrings count
+    keyword_map = {b"go": "go", b"gin": "gin", b"gorm": "gorm", b"fiber": "fiber", b"echo": "echo", b"ginkgo": "ginkgo"}
+    matcher = KeywordMatcher(keyword_map)
+
+    assert matcher.find(b"module x\nrequire GIN v1\n") == ["gin"]
+    assert matcher.find(b"uses Ginkgo and GoRM") == ["go", "gin", "gorm", "ginkgo"]
+    assert matcher.find(b"") == []
+
+
+def test_compiled_matcher_is_shared_per_keyword_set():
+    keyword_map = {b"react": "react"}
+    assert matcher_for(keyword_map) is matcher_for(dict(keyword_map))
+    assert matcher_for(keyword_map) is not matcher_for({b"vue": "vue"})
@@ -0,0 +1,90 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.career import CareerProfile
+from app.db.models.analytics import RiskSnapshot
+from app.db.models.latest_risk import LatestRisk
+from app.services.latest_risk import rebuild_latest_risk
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _add_user(db, email, team):
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.add(CareerProfile(user_id=user.id, team=team, company="Acme"))
+    db.commit()
+    return user
+
+
+def _snapshot(db, user, score, day):
+    db.add(RiskSnapshot(
+        user_id=user.id,
+        risk_score=score,
+        risk_level="HIGH" if score >= 60 else "LOW",
+        recorded_at=datetime(2026, 1, 1) + timedelta(days=day)
+    ))
+    db.commit()
+
+
+def test_snapshot_insert_keeps_latest_row(db_session):
+    user = _add_user(db_session, "me@example.com", "Core")
+
+    _snapshot(db_session, user, 40, day=1)
+    _snapshot(db_session, user, 80, day=3)
+    # Late-arriving older snapshot must not move the projection backwards
+    _snapshot(db_session, user, 10, day=2)
+
+    row = db_session.get(LatestRisk, user.id)
+    assert row.risk_score == 80
+    assert row.risk_level == "HIGH"
+    assert row.team == "Core"
+    assert row.company == "Acme"
+    assert db_session.query(LatestRisk).count() == 1
+
+
+def test_profile_cohort_change_propagates(db_session):
+    user = _add_user(db_session, "me@example.com", "Core")
+    _snapshot(db_session, user, 55, day=1)
+
+    profile = db_session.query(CareerProfile).filter_by(user_id=user.id).one()
+    profile.team = "Infra"
+    db_session.commit()
+
+    db_session.expire_all()
+    row = db_session.get(LatestRisk, user.id)
+    assert row.team == "Infra"
+    assert row.risk_score == 55
+
+
+def test_rebuild_restores_projection_from_history(db_session):
+    users = [_add_user(db_session, f"u{i}@example.com", "Core") for i in range(5)]
+    for i, user in enumerate(users):
+        _snapshot(db_session, user, 10 * i, day=1)
+        _snapshot(db_session, user, 10 * i + 5, day=2)
+
+    db_session.query(LatestRisk).delete()
+    db_session.commit()
+
+    written = rebuild_latest_risk(db_session, batch_size=2)
+
+    assert written == 5
+    scores = dict(db_session.query(LatestRisk.user_id, LatestRisk.risk_score).all())
+    assert scores == {u.id: 10 * i + 5 for i, u in enumerate(users)}
@@ -0,0 +1,81 @@
+import threading
+from unittest.mock import patch
+
+from app.ml import lstm_risk_production
+from app.ml.lstm_risk_production import LSTMRiskProductionModel, WINDOW_SIZE
+from app.ml.model_registry import ModelRegistry
+
+
+class MeanModel:
+    """Stand-in for the Keras model: predicts the window mean."""
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.lock = threading.Lock()
+
+    def predict_on_batch(self, X):
+        with self.lock:
+            self.batch_sizes.append(len(X))
+        return X.mean(axis=1)
+
+
+def _registry_with(model):
+    registry = ModelRegistry(check_interval=60)
+    registry.get = lambda name, path, loader=None, version=None: model
+    return registry
+
+
+def test_predict_many_scores_all_windows_in_one_pass():
+    model = MeanModel()
+    windows = [[i] * WINDOW_SIZE for i in range(0, 100, 10)]
+
+    with patch.object(lstm_risk_production, "model_registry", _registry_with(model)):
+        preds = LSTMRiskProductionModel().predict_many(windows)
+
+    assert preds == list(range(0, 100, 10))
+    assert model.batch_sizes == [len(windows)]
+
+
+def test_concurrent_predictions_share_a_micro_batch():
+    model = MeanModel()
+    lstm = LSTMRiskProductionModel()
+    lstm._batcher.wait_s = 0.2
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def call(i):
+        barrier.wait()
+        results[i] = lstm.predict([i * 10] * WINDOW_SIZE)
+
+    with patch.object(lstm_risk_production, "model_registry", _registry_with(model)):
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+    assert results == {i: i * 10 for i in range(8)}
+    assert sum(model.batch_sizes) == 8
+    assert len(model.batch_sizes) < 8
+
+
+def test_missing_artifact_falls_back_to_last_value(tmp_path):
+    registry = ModelRegistry(check_interval=60)
+    with patch.object(lstm_risk_production, "MODEL_PATH", str(tmp_path / "none.h5")), \
+         patch.object(lstm_risk_production, "model_registry", registry):
+        assert LSTMRiskProductionModel().predict(list(range(WINDOW_SIZE))) == WINDOW_SIZE - 1
+
+
+def test_dead_worker_falls_back_to_direct_prediction():
+    model = MeanModel()
+    lstm = LSTMRiskProductionModel()
+    batcher = lstm._batcher
+    # A worker that dies without answering (e.g. killed by a BaseException)
+    batcher._worker = lambda: None
+
+    with patch.object(lstm_risk_production, "model_registry", _registry_with(model)), \
+         patch.object(lstm_risk_production, "LIVENESS_POLL_S", 0.05):
+        assert lstm.predict([40] * WINDOW_SIZE) == 40
+
+    assert batcher.fallbacks == 1
+    assert model.batch_sizes == [1]
@@ -0,0 +1,248 @@
+import pytest
+
+from app.services.manifest_parsers import (
+    Dependency, ManifestParseError, match_keywords, parse_manifest, parse_manifest_stream
+)
+from app.services.social_harvester import SocialHarvester
+
+PACKAGE_JSON = b"""{
+  "name": "web",
+  "description": "uses next-gen react-native-foo {tricky: \\"quoted\\"}",
+  "scripts": {"build": "next build", "deps": {"nested": "1"}},
+  "dependencies": {
+    "react": "^18.2.0",
+    "react-native-foo": "1.0.0",
+    "@nestjs/core": "10.0.0"
+  },
+  "devDependencies": {"TypeScript": "~5.4.0"},
+  "peerDependencies": {},
+  "optionalDependencies": {"fsevents": "*"},
+  "files": ["dist"]
+}
+"""
+
+REQUIREMENTS = b"""# web stack
+FastAPI==0.110.0
+scikit_learn>=1.4 ; python_version >= "3.9"
+numpy
+-r base.txt
+--index-url https://pypi.example.com/simple
+git+https://github.com/psf/requests.git#egg=requests
+pandas-stubs==2.0  # not pandas
+"""
+
+GO_MOD = b"""module github.com/me/api
+
+go 1.22
+
+require github.com/gin-gonic/gin v1.9.1
+
+require (
+\tgorm.io/gorm v1.25.7
+\tgithub.com/gofiber/fiber/v2 v2.52.0
+\tgithub.com/labstack/echo/v4 v4.11.4 // indirect
+)
+"""
+
+CARGO_TOML = b"""[package]
+name = "api"
+version = "0.1.0"
+
+[dependencies]
+tokio = { version = "1.36", features = ["full"] }
+serde = "1.0"
+actix_web = "4"
+rocket-lint = { path = "../lint" }
+
+[dependencies.axum]
+version = "0.7"
+
+[target.'cfg(unix)'.dependencies]
+nix = "0.28"
+"""
+
+POM_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<project xmlns="http://maven.apache.org/POM/4.0.0">
+  <parent>
+    <groupId>org.springframework.boot</groupId>
+    <artifactId>spring-boot-starter-parent</artifactId>
+    <version>3.2.3</version>
+  </parent>
+  <dependencyManagement>
+    <dependencies>
+      <dependency><groupId>jakarta.platform</groupId><artifactId>jakarta.jakartaee-bom</artifactId></dependency>
+    </dependencies>
+  </dependencyManagement>
+  <dependencies>
+    <dependency>
+      <groupId>org.hibernate.orm</groupId>
+      <artifactId>hibernate-core</artifactId>
+      <version>${hibernate.version}</version>
+    </dependency>
+  </dependencies>
+  <build><plugins><plugin><artifactId>junit-plugin</artifactId></plugin></plugins></build>
+</project>
+"""
+
+BUILD_GRADLE = b"""plugins {
+    id 'org.springframework.boot' version '3.2.3'
+    kotlin("jvm") version "1.9.22"
+}
+
+dependencies {
+    implementation 'org.hibernate:hibernate-core:6.4.4.Final'
+    testImplementation group: 'org.junit.jupiter', name: 'junit-jupiter', version: '5.10.2'
+    implementation("com.squareup.okhttp3:okhttp:4.12.0") {
+        exclude group: 'org.kotlin', module: 'stdlib'
+    }
+}
+
+task hello { doLast { println 'jakarta:ee' } }
+"""
+
+GEMFILE = b"""source "https://rubygems.org"
+
+gem "rails", "~> 7.1.3"
+gem 'sinatra'
+group :test do
+  gem "rspec-rails", "6.1.0"
+end
+"""
+
+
+async def _stream(data: bytes, size: int, consumed=None):
+    for i in range(0, len(data), size):
+        if consumed is not None:
+            consumed.append(i)
+        yield data[i:i + size]
+
+
+def test_package_json_dependencies():
+    deps = parse_manifest("package.json", PACKAGE_JSON)
+    assert deps == [
+        Dependency("react", "^18.2.0"),
+        Dependency("react-native-foo", "1.0.0"),
+        Dependency("@nestjs/core", "10.0.0"),
+        Dependency("typescript", "~5.4.0"),
+        Dependency("fsevents", "*"),
+    ]
+    keywords = ["react", "next", "nestjs", "typescript", "vue"]
+    # "next" only appears in text, react-native-foo is not react
+    assert match_keywords("package.json", deps, keywords) == ["react", "nestjs", "typescript"]
+    assert match_keywords("package.json", [Dependency("react-native-foo", "1")], ["react"]) == []
+
+
+def test_line_based_manifests():
+    assert parse_manifest("requirements.txt", REQUIREMENTS) == [
+        Dependency("fastapi", "0.110.0"),
+        Dependency("scikit-learn", ">=1.4"),
+        Dependency("numpy", None),
+        Dependency("requests", None),
+        Dependency("pandas-stubs", "2.0"),
+    ]
+    assert parse_manifest("go.mod", GO_MOD) == [
+        Dependency("github.com/gin-gonic/gin", "v1.9.1"),
+        Dependency("gorm.io/gorm", "v1.25.7"),
+        Dependency("github.com/gofiber/fiber/v2", "v2.52.0"),
+    ]
+    assert parse_manifest("Cargo.toml", CARGO_TOML) == [
+        Dependency("tokio", "1.36"),
+        Dependency("serde", "1.0"),
+        Dependency("actix-web", "4"),
+        Dependency("rocket-lint", None),
+        Dependency("axum", "0.7"),
+        Dependency("nix", "0.28"),
+    ]
+    assert parse_manifest("Gemfile", GEMFILE) == [
+        Dependency("rails", "~> 7.1.3"),
+        Dependency("sinatra", None),
+        Dependency("rspec-rails", "6.1.0"),
+    ]
+
+
+def test_jvm_manifests():
+    assert parse_manifest("pom.xml", POM_XML) == [
+        Dependency("org.springframework.boot:spring-boot-starter-parent", "3.2.3"),
+        Dependency("org.hibernate.orm:hibernate-core", "${hibernate.version}"),
+    ]
+    gradle = parse_manifest("build.gradle", BUILD_GRADLE)
+    assert gradle == [
+        Dependency("org.springframework.boot", "3.2.3"),
+        Dependency("org.jetbrains.kotlin.jvm", "1.9.22"),
+        Dependency("org.hibernate:hibernate-core", "6.4.4.Final"),
+        Dependency("org.junit.jupiter:junit-jupiter", "5.10.2"),
+        Dependency("com.squareup.okhttp3:okhttp", "4.12.0"),
+    ]
+    assert match_keywords("build.gradle", gradle, ["spring", "hibernate", "kotlin", "jakarta"]) == \
+        ["spring", "hibernate", "kotlin"]
+
+
+def test_keyword_matching_per_ecosystem():
+    harvester = SocialHarvester()
+    cases = {
+        "requirements.txt": REQUIREMENTS, "go.mod": GO_MOD, "Cargo.toml": CARGO_TOML,
+        "pom.xml": POM_XML, "Gemfile": GEMFILE,
+    }
+    found = {
+        name: match_keywords(name, parse_manifest(name, content), harvester.SCAN_DEPS_FILES[name])
+        for name, content in cases.items()
+    }
+    assert found == {
+        "requirements.txt": ["fastapi", "numpy", "scikit-learn", "requests"],   # not pandas
+        "go.mod": ["gin", "gorm", "fiber"],                                      # echo is indirect
+        "Cargo.toml": ["tokio", "serde", "actix", "axum", "rocket"],
+        "pom.xml": ["spring", "hibernate"],                                       # not the BOM, not plugins
+        "Gemfile": ["rails", "sinatra", "rspec"],
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("filename, content", [
+    ("package.json", PACKAGE_JSON), ("requirements.txt", REQUIREMENTS), ("go.mod", GO_MOD),
+    ("Cargo.toml", CARGO_TOML), ("pom.xml", POM_XML), ("build.gradle", BUILD_GRADLE), ("Gemfile", GEMFILE),
+])
+async def test_streaming_matches_whole_file(filename, content):
+    expected = parse_manifest(filename, content)
+    for size in (1, 3, 7, 64):
+        assert await parse_manifest_stream(filename, _stream(content, size)) == expected
+
+
+@pytest.mark.asyncio
+async def test_stops_reading_after_dependency_sections():
+    consumed = []
+    filler = b'"x' + b"y" * 50_000 + b'": "z"'
+    content = b'{"dependencies": {"react": "18"}, "devDependencies": {}, "peerDependencies": {},' \
+              b' "optionalDependencies": {}, ' + filler + b"}"
+    deps = await parse_manifest_stream("package.json", _stream(content, 1024, consumed))
+
+    assert deps == [Dependency("react", "18")]
+    assert len(consumed) == 1
+
+    consumed.clear()
+    pom = POM_XML + b"<!--" + b"x" * 50_000 + b"-->"
+    await parse_manifest_stream("pom.xml", _stream(pom, 1024, consumed))
+    assert len(consumed) < 3
+
+
+@pytest.mark.asyncio
+async def test_byte_cap_returns_partial_result():
+    content = b'{"dependencies": {"react": "18", ' + b'"pkg": "1", ' * 10_000 + b'"vue": "3"}}'
+    deps = await parse_manifest_stream("package.json", _stream(content, 1024), max_bytes=4096)
+    assert deps[0] == Dependency("react", "18")
+    assert Dependency("vue", "3") not in deps
+
+
+@pytest.mark.asyncio
+async def test_malformed_manifest_falls_back_to_keyword_scan():
+    with pytest.raises(ManifestParseError):
+        parse_manifest("package.json", b'{"dependencies": {"react": "18"')
+
+    harvester = SocialHarvester()
+    keyword_map = harvester.scan_deps_map_bytes["package.json"]
+    found = await harvester._detect_dependencies(
+        "package.json", _stream(b'{"dependencies": {"react": "18"', 4), keyword_map
+    )
+    assert found == ["react"]
+    assert await harvester._detect_dependencies(
+        "package.json", _stream(PACKAGE_JSON, 16), keyword_map
+    ) == ["react", "nestjs", "typescript"]
@@ -0,0 +1,154 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.mentor import MentorMemory
+from app.db.models.user import User
+from app.jobs.cleanup_memories import cleanup_old_memories
+from app.services.embedding_codec import encode
+from app.services.memory_compaction import MemoryCompactor, content_hash
+from app.services.mentor_engine import MentorEngine
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def setup():
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    user = User(id=1, email="me@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    yield db, user
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _legacy(db, user, category, content, created_at, embedding=None):
+    """A row written before de-duplication: no content_hash / last_seen_at."""
+    blob, dtype = encode(embedding) if embedding else (None, None)
+    memory = MentorMemory(
+        user_id=user.id, context_key=category, created_at=created_at,
+        memory_value=json.dumps({"content": content, "category": category}),
+        embedding=blob, embedding_dtype=dtype
+    )
+    db.add(memory)
+    db.commit()
+    return memory
+
+
+def test_repeats_within_window_bump_the_existing_row(setup):
+    db, user = setup
+    mentor = MentorEngine()
+    career = {"career_forecast": {"risk_level": "HIGH"}, "weekly_plan": {}}
+    for _ in range(3):
+        mentor.proactive_insights(db, user, career)
+    mentor.store(db, user, "ALERT", "⚠️ High career risk detected. Immediate skill execution recommended.")
+    mentor.store(db, user, "PROACTIVE", "  ⚠️ High career risk   detected. Immediate skill execution recommended.\n")
+
+    rows = db.query(MentorMemory).order_by(MentorMemory.id).all()
+    assert [(m.context_key, m.repeat_count) for m in rows] == [("PROACTIVE", 4), ("ALERT", 1)]
+    assert rows[0].content_hash == content_hash(
+        "PROACTIVE", "PROACTIVE", "⚠️ High career risk detected. Immediate skill execution recommended."
+    )
+
+
+def test_repeats_outside_window_insert(setup):
+    db, user = setup
+    mentor = MentorEngine()
+    mentor.store(db, user, "ADVICE", "ship it")
+    db.query(MentorMemory).update({"last_seen_at": datetime.utcnow() - timedelta(days=2)})
+    db.commit()
+    mentor.store(db, user, "ADVICE", "ship it")
+
+    with patch("app.services.mentor_engine.settings.MENTOR_MEMORY_DEDUPE_WINDOW_SECONDS", 0):
+        mentor.store(db, user, "ADVICE", "ship it")
+
+    assert db.query(MentorMemory).count() == 3
+
+
+def test_compaction_collapses_repeats_in_bounded_batches(setup):
+    db, user = setup
+    start = datetime(2026, 1, 1)
+    _legacy(db, user, "PROACTIVE", "focus", start)
+    for day in range(1, 6):
+        _legacy(db, user, "PROACTIVE", "focus", start + timedelta(days=day), embedding=[1.0, 0.0])
+    _legacy(db, user, "PROACTIVE", "other", start)
+    _legacy(db, user, "PROACTIVE", "other", start + timedelta(days=1))
+    _legacy(db, user, "ADVICE", "focus", start)
+    db.add(MentorMemory(user_id=user.id, context_key="raw", memory_value="not json"))
+    db.commit()
+
+    compactor = MemoryCompactor(batch_size=2, pause_seconds=0, session_factory=TestingSessionLocal)
+    with patch.object(compactor, "_compact_batch", wraps=compactor._compact_batch) as batch:
+        stats = compactor.run()
+
+    assert stats["hashed"] == 9 and stats["groups"] == 2 and stats["merged"] == 6
+    assert batch.call_count > 3       # the group of 6 took several transactions
+    db.expire_all()
+    rows = db.query(MentorMemory).order_by(MentorMemory.id).all()
+    summary = [(json.loads(m.memory_value)["content"], m.context_key, m.repeat_count) for m in rows[:-1]]
+    assert summary == [("focus", "PROACTIVE", 6), ("other", "PROACTIVE", 2), ("focus", "ADVICE", 1)]
+    assert rows[0].last_seen_at == start + timedelta(days=5)
+    assert rows[0].embedding is not None        # taken from a merged row
+    assert rows[-1].content_hash is None
+
+    # Compacted rows keep absorbing new repeats
+    db.query(MentorMemory).update({"last_seen_at": datetime.utcnow()})
+    db.commit()
+    MentorEngine().store(db, user, "PROACTIVE", "focus")
+    assert db.query(MentorMemory).count() == 4
+    assert MemoryCompactor(session_factory=TestingSessionLocal, pause_seconds=0).run()["merged"] == 0
+
+
+def test_groups_gone_before_their_rows_are_read_are_skipped(setup):
+    db, user = setup
+    start = datetime(2026, 1, 1)
+    for content in ("focus", "other"):
+        for day in range(2):
+            _legacy(db, user, "PROACTIVE", content, start + timedelta(days=day))
+    compactor = MemoryCompactor(pause_seconds=0, session_factory=TestingSessionLocal)
+    compactor.backfill_hashes()
+
+    focus = content_hash("PROACTIVE", "PROACTIVE", "focus")
+    first = db.query(MentorMemory).filter(MentorMemory.content_hash == focus).order_by(MentorMemory.id).first()
+    real_query = db.query
+
+    def query(*entities):
+        if entities[0] is MentorMemory.id:
+            # Another run merged "focus" and a user deleted "other" after the keys were read
+            real_query(MentorMemory).filter(MentorMemory.content_hash != focus).delete()
+            real_query(MentorMemory).filter(MentorMemory.id != first.id, MentorMemory.content_hash == focus).delete()
+        return real_query(*entities)
+
+    with patch.object(db, "query", side_effect=query):
+        finished, deleted, cursor = compactor._compact_batch(db, None)
+
+    assert (finished, deleted) == (0, 0)
+    assert cursor is not None
+    assert compactor._compact_batch(db, cursor) == (0, 0, None)
+    assert [m.id for m in db.query(MentorMemory)] == [first.id]
+
+
+def test_cleanup_deletes_by_last_seen(setup):
+    db, user = setup
+    old = datetime.utcnow() - timedelta(days=400)
+    _legacy(db, user, "ADVICE", "stale", old)
+    kept = _legacy(db, user, "ADVICE", "repeating", old)
+    kept.last_seen_at = datetime.utcnow()
+    db.commit()
+    for i in range(3):
+        _legacy(db, user, "ADVICE", f"stale {i}", old)
+
+    assert cleanup_old_memories(days=180, batch_size=2, pause_seconds=0, session_factory=TestingSessionLocal) == 4
+    db.expire_all()
+    assert [m.id for m in db.query(MentorMemory)] == [kept.id]
@@ -0,0 +1,146 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.mentor import MentorMemory, EMBEDDING_PENDING, EMBEDDING_FAILED
+from app.db.models.user import User
+from app.services.embedding_codec import encode
+from app.services.memory_embedder import MemoryEmbedder
+from app.services.mentor_engine import MentorEngine
+from app.services.vector_index import MemoryVectorIndex
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class _FakeEmbeddings:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        if self.fail:
+            raise RuntimeError("upstream 500")
+        return [[float(len(t)), 1.0, 0.0] for t in texts]
+
+
+@pytest.fixture
+def setup(tmp_path):
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    user = User(id=1, email="me@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    index = MemoryVectorIndex(str(tmp_path / "index"))
+    with patch("app.services.mentor_engine.memory_index", index):
+        yield db, user, index
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _embedder(index, embed, **kwargs):
+    return MemoryEmbedder(embed=embed, session_factory=TestingSessionLocal, index=index, **kwargs)
+
+
+def test_store_makes_no_embedding_call(setup):
+    db, user, _ = setup
+    with patch("app.services.embedding_service.client") as client:
+        MentorEngine().proactive_insights(db, user, {
+            "career_forecast": {"risk_level": "HIGH"}, "weekly_plan": {"mode": "ACCELERATOR"}
+        })
+        MentorEngine().remember_context(db, user, "lang", "pt-BR")
+
+    client.embeddings.create.assert_not_called()
+    rows = db.query(MentorMemory).order_by(MentorMemory.id).all()
+    assert [m.embedding_status for m in rows] == [EMBEDDING_PENDING, EMBEDDING_PENDING, None]
+    assert all(m.embedding is None for m in rows)
+
+
+def test_pending_memories_are_embedded_in_batches(setup):
+    db, user, index = setup
+    mentor = MentorEngine()
+    for i in range(5):
+        mentor.store(db, user, "ADVICE", f"advice {'x' * i}")
+    fake = _FakeEmbeddings()
+
+    assert _embedder(index, fake, batch_size=2).drain() == 5
+
+    assert [len(call) for call in fake.calls] == [2, 2, 1]
+    db.expire_all()
+    rows = db.query(MentorMemory).order_by(MentorMemory.id).all()
+    assert all(m.embedding_status is None and m.embedding_dtype == "float32" for m in rows)
+    assert index.snapshot(user.id).meta["id"].tolist() == [1, 2, 3, 4, 5]
+    assert mentor.recall_semantic(db, user, [1.0, 0.0, 0.0], limit=1) == ["advice xxxx"]
+
+
+def test_failures_back_off_then_give_up(setup):
+    db, user, index = setup
+    MentorEngine().store(db, user, "ADVICE", "advice")
+    embedder = _embedder(index, _FakeEmbeddings(fail=True), max_attempts=2, backoff_base=60)
+
+    assert embedder.run_once() == 1
+    memory = db.query(MentorMemory).one()
+    assert memory.embedding_status == EMBEDDING_PENDING and memory.embedding_attempts == 1
+    assert memory.embed_after > datetime.utcnow() + timedelta(seconds=50)
+    assert embedder.run_once() == 0          # not due yet
+
+    memory.embed_after = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    assert embedder.run_once() == 1
+    db.expire_all()
+    assert memory.embedding_status == EMBEDDING_FAILED and memory.embedding_attempts == 2
+
+
+def test_index_waits_for_memories_embedded_out_of_order(setup):
+    db, user, index = setup
+    mentor = MentorEngine()
+    for content in ("first", "second", "third"):
+        mentor.store(db, user, "ADVICE", content)
+
+    def embed_elsewhere(memory_id, vector):
+        # Another host's embedder: the local index only learns it from the DB
+        blob, dtype = encode(vector)
+        db.query(MentorMemory).filter(MentorMemory.id == memory_id).update(
+            {"embedding": blob, "embedding_dtype": dtype, "embedding_status": None}
+        )
+        db.commit()
+
+    embed_elsewhere(1, [1.0, 0.0])
+    embed_elsewhere(3, [0.0, 1.0])
+    assert mentor.recall_semantic(db, user, [1.0, 1.0], limit=3) == ["first", "third"]
+    assert index.snapshot(user.id).settled_id == 1       # memory 2 still pending
+
+    embed_elsewhere(2, [0.6, 0.8])
+    assert mentor.recall_semantic(db, user, [1.0, 1.0], limit=3) == ["second", "first", "third"]
+    assert index.snapshot(user.id).settled_id == 3
+    assert sorted(index.snapshot(user.id).meta["id"].tolist()) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_wake_skips_the_poll_wait(setup):
+    db, user, index = setup
+    fake = _FakeEmbeddings()
+    embedder = _embedder(index, fake, poll_interval=60)
+    stop = asyncio.Event()
+    task = asyncio.create_task(embedder.run(stop))
+    await asyncio.sleep(0.05)
+
+    MentorEngine().store(db, user, "ADVICE", "late advice")
+    embedder.wake()
+    for _ in range(100):
+        if fake.calls:
+            break
+        await asyncio.sleep(0.01)
+
+    stop.set()
+    await asyncio.wait_for(task, timeout=5)
+    assert fake.calls == [["late advice"]]
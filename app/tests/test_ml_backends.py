@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+from app.ml import backends
+from app.ml.backends import LazyModule, import_report
+
+
+def _write_module(tmp_path, name):
+    (tmp_path / f"{name}.py").write_text("VALUE = 42\n")
+    sys.path.insert(0, str(tmp_path))
+
+
+def test_lazy_module_imports_on_first_attribute_access(tmp_path):
+    _write_module(tmp_path, "lazy_probe_mod")
+    try:
+        proxy = LazyModule("lazy_probe_mod")
+        assert "lazy_probe_mod" not in sys.modules
+        assert import_report()["backends"]["lazy_probe_mod"]["loaded"] is False
+
+        assert proxy.VALUE == 42
+        assert "lazy_probe_mod" in sys.modules
+        entry = import_report()["backends"]["lazy_probe_mod"]
+        assert entry["loaded"] is True
+        assert entry["trigger"] == "on_demand"
+        assert entry["import_ms"] >= 0
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("lazy_probe_mod", None)
+
+
+def test_warm_up_imports_in_background(tmp_path, monkeypatch):
+    _write_module(tmp_path, "lazy_warm_mod")
+    try:
+        proxy = LazyModule("lazy_warm_mod")
+        monkeypatch.setitem(backends.BACKENDS, "lazy_warm_mod", proxy)
+
+        backends.warm_up(["lazy_warm_mod"]).join(timeout=10)
+
+        entry = import_report()["backends"]["lazy_warm_mod"]
+        assert entry["loaded"] is True
+        assert entry["trigger"] == "warmup"
+        assert entry["thread"] == "ml-backend-warmup"
+    finally:
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("lazy_warm_mod", None)
+
+
+def test_career_engine_import_does_not_load_heavy_backends(tmp_path):
+    code = textwrap.dedent("""
+        import sys
+        import app.services.career_engine
+        heavy = [m for m in ("tensorflow", "shap", "mlflow") if m in sys.modules]
+        assert not heavy, heavy
+    """)
+    env = dict(os.environ)
+    env["DATABASE_URL"] = f"sqlite:///{tmp_path / 'backends.db'}"
+    env.setdefault("OPENAI_API_KEY", "test")
+    result = subprocess.run(
+        [sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=300
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
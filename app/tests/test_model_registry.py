@@ -0,0 +1,82 @@
+import os
+import joblib
+from unittest.mock import patch
+
+from app.ml.model_registry import ModelRegistry
+from app.ml import risk_forecast_model
+from app.ml.risk_forecast_model import RiskForecastModel
+
+
+class ConstantModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, X):
+        return [self.value for _ in X]
+
+
+def _dump(path, value, mtime):
+    joblib.dump(ConstantModel(value), path)
+    os.utime(path, (mtime, mtime))
+
+
+def test_artifact_is_loaded_once_and_served_from_memory(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    _dump(path, 10, 1_000_000)
+    registry = ModelRegistry(check_interval=60)
+
+    with patch("joblib.load", wraps=joblib.load) as load:
+        models = [registry.get("m", path, loader=load, version="1") for _ in range(5)]
+
+    assert load.call_count == 1
+    assert all(m is models[0] for m in models)
+    stats = registry.stats()["m"]
+    assert stats["hits"] == 5
+    assert stats["loads"] == 1
+    assert stats["version"] == "1"
+    assert stats["loaded_at"] is not None
+
+
+def test_newer_artifact_is_swapped_in(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    _dump(path, 10, 1_000_000)
+    registry = ModelRegistry(check_interval=0)
+
+    first = registry.get("m", path)
+    _dump(path, 20, 1_000_100)
+    second = registry.get("m", path)
+
+    assert first.value == 10
+    assert second.value == 20
+    assert registry.stats()["m"]["loads"] == 2
+
+
+def test_broken_artifact_keeps_serving_previous_model(tmp_path):
+    path = str(tmp_path / "model.joblib")
+    _dump(path, 10, 1_000_000)
+    registry = ModelRegistry(check_interval=0)
+    registry.get("m", path)
+
+    with open(path, "wb") as f:
+        f.write(b"partial write")
+
+    assert registry.get("m", path).value == 10
+
+
+def test_missing_artifact_returns_none(tmp_path):
+    registry = ModelRegistry(check_interval=0)
+    assert registry.get("m", str(tmp_path / "missing.joblib")) is None
+
+
+def test_forecast_predict_uses_registry(tmp_path):
+    versioned = str(tmp_path / "risk_model_v1.joblib")
+    _dump(versioned, 42, 1_000_000)
+    registry = ModelRegistry(check_interval=60)
+
+    with patch.object(risk_forecast_model, "VERSIONED_MODEL_PATH", versioned), \
+         patch.object(risk_forecast_model, "model_registry", registry):
+        model = RiskForecastModel()
+        results = [model.predict(50, 3) for _ in range(3)]
+
+    assert all(r["ml_risk"] == 42 and r["mode"] == "advanced" for r in results)
+    assert registry.stats()["risk_model"]["hits"] == 3
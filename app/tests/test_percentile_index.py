@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.career import CareerProfile
+from app.db.models.analytics import RiskSnapshot
+from app.db.models.latest_risk import LatestRisk
+from app.services.percentile_index import CohortPercentileIndex
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _add_user(db, email, company, region, score):
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.add(CareerProfile(user_id=user.id, company=company, region=region))
+    db.commit()
+    _snapshot(db, user, score, day=0)
+    return user
+
+
+def _snapshot(db, user, score, day):
+    db.add(RiskSnapshot(
+        user_id=user.id,
+        risk_score=score,
+        recorded_at=datetime(2026, 1, 1) + timedelta(days=day)
+    ))
+    db.commit()
+
+
+def _naive(scores, mine):
+    return int(sum(1 for s in scores if s <= mine) / len(scores) * 100)
+
+
+def test_lookup_matches_linear_scan(db_session):
+    scores = [5, 10, 10, 40, 75, 90]
+    for i, s in enumerate(scores):
+        _add_user(db_session, f"u{i}@example.com", "Acme", "EU", s)
+    _add_user(db_session, "other@example.com", "Other", "EU", 0)
+
+    index = CohortPercentileIndex()
+    values = {"company": "Acme", "region": "EU"}
+
+    for mine in (0, 10, 41, 90):
+        percentile, size = index.percentile(db_session, "company_region", values, mine)
+        assert size == len(scores)
+        assert percentile == _naive(scores, mine)
+
+    # Unfiltered fields widen the cohort
+    _, size = index.percentile(db_session, "company_region", {"region": "EU"}, 50)
+    assert size == len(scores) + 1
+
+
+def test_committed_writes_patch_loaded_cohorts(db_session):
+    a = _add_user(db_session, "a@example.com", "Acme", None, 20)
+    b = _add_user(db_session, "b@example.com", "Acme", None, 60)
+
+    index = CohortPercentileIndex()
+    values = {"company": "Acme"}
+    assert index.percentile(db_session, "company_region", values, 20) == (50, 2)
+
+    # New latest score for b replaces the old one instead of adding a peer
+    _snapshot(db_session, b, 10, day=1)
+    assert index.percentile(db_session, "company_region", values, 20) == (100, 2)
+
+    # Cohort change moves a out of Acme
+    profile = db_session.query(CareerProfile).filter_by(user_id=a.id).one()
+    profile.company = "Initech"
+    db_session.commit()
+    assert index.percentile(db_session, "company_region", values, 20) == (100, 1)
+
+    # Newcomer is picked up without a reload
+    _add_user(db_session, "c@example.com", "Acme", None, 99)
+    assert index.percentile(db_session, "company_region", values, 20) == (50, 2)
+
+
+def test_failed_refresh_keeps_users_dirty(db_session):
+    _add_user(db_session, "a@example.com", "Acme", None, 20)
+    b = _add_user(db_session, "b@example.com", "Acme", None, 60)
+
+    index = CohortPercentileIndex()
+    values = {"company": "Acme"}
+    assert index.percentile(db_session, "company_region", values, 20) == (50, 2)
+
+    _snapshot(db_session, b, 10, day=1)
+    with patch.object(db_session, "query", side_effect=RuntimeError("database is locked")):
+        with pytest.raises(RuntimeError):
+            index.percentile(db_session, "company_region", values, 20)
+
+    # The next lookup still patches b in
+    assert index.percentile(db_session, "company_region", values, 20) == (100, 2)
+
+
+class _CommitsBeforeResults:
+    """Query wrapper that runs `write` once, after the load's rows were read."""
+
+    def __init__(self, query, write):
+        self._query, self._write = query, write
+
+    def filter(self, *criteria):
+        return _CommitsBeforeResults(self._query.filter(*criteria), self._write)
+
+    def all(self):
+        rows = self._query.all()
+        write, self._write = self._write, None
+        if write:
+            write()
+        return rows
+
+
+def test_writes_during_a_load_are_applied_afterwards(db_session):
+    _add_user(db_session, "a@example.com", "Acme", None, 20)
+    b = _add_user(db_session, "b@example.com", "Acme", None, 60)
+
+    index = CohortPercentileIndex()
+    values = {"company": "Acme"}
+    query = db_session.query
+    racing = _CommitsBeforeResults(query(LatestRisk.user_id, LatestRisk.risk_score),
+                                   lambda: _snapshot(db_session, b, 10, day=1))
+
+    with patch.object(db_session, "query", side_effect=[racing]):
+        # The load read b's old score; its new one committed before the swap
+        assert index.percentile(db_session, "company_region", values, 20) == (50, 2)
+    assert index.percentile(db_session, "company_region", values, 20) == (100, 2)
+
+
+def test_empty_cohort_returns_none(db_session):
+    index = CohortPercentileIndex()
+    assert index.percentile(db_session, "org_team", {"team": "Ghost"}, 50) is None
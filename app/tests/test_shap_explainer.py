@@ -78,5 +78,37 @@ class TestShapExplainer(unittest.TestCase):
         self.assertEqual(result["features"]["avg_confidence"], 0.5)
         self.assertEqual(result["features"]["commit_velocity"], 0.0)
 
+    @patch("app.ml.shap_explainer.os.path.exists")
+    @patch("app.ml.shap_explainer.joblib.load")
+    @patch("app.ml.shap_explainer.shap.Explainer")
+    def test_linear_model_uses_closed_form(self, mock_shap_explainer_cls, mock_joblib_load, mock_exists):
+        """Linear models with stored means are attributed as coef * (x - mean), without SHAP."""
+        from sklearn.linear_model import LinearRegression
+        import shap
+
+        rng = np.random.default_rng(0)
+        X_train = rng.uniform(0, 100, size=(100, 2))
+        y = 90 - 0.6 * X_train[:, 0] - 1.5 * X_train[:, 1] + rng.normal(0, 1, 100)
+        model = LinearRegression().fit(X_train, y)
+        model.feature_means_ = X_train.mean(axis=0)
+
+        mock_exists.return_value = True
+        mock_joblib_load.return_value = model
+
+        rows = np.array([[80, 10], [20, 3], [55, 40]])
+        contributions = self.explainer.attribute(rows)
+
+        mock_shap_explainer_cls.assert_not_called()
+        expected = shap.LinearExplainer(model, X_train)(rows).values
+        self.assertTrue(np.allclose(contributions, expected))
+
+        # Both payloads come from the same computation
+        both = self.explainer.explain_all(80, 10)
+        self.assertAlmostEqual(both["features"]["avg_confidence"], contributions[0][0])
+        self.assertEqual(
+            both["visual"]["values"],
+            [both["features"]["avg_confidence"], both["features"]["commit_velocity"]]
+        )
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.db.advisory_lock import advisory_lock, lock_id
+from app.services.single_flight import SingleFlight
+from app.services.social_harvester import SocialHarvester
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    release = asyncio.Event()
+    runs = 0
+
+    async def work():
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return "result"
+
+    callers = [asyncio.create_task(flight.do(1, work)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*callers) == ["result"] * 5
+    assert runs == 1
+    assert flight.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_fresh_result_is_reused_until_window_expires():
+    clock = _Clock()
+    flight = SingleFlight(fresh_for=30, clock=clock)
+    work = AsyncMock(side_effect=[True, False, True])
+
+    assert await flight.do(1, work) is True
+    clock.now = 29
+    assert await flight.do(1, work) is True
+    assert work.await_count == 1
+
+    clock.now = 31
+    assert await flight.do(1, work) is False      # failures are not remembered
+    assert await flight.do(1, work) is True
+    assert work.await_count == 3
+    assert await flight.do(2, AsyncMock(return_value=True)) is True   # per key
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def work():
+        await release.wait()
+        return 42
+
+    first = asyncio.create_task(flight.do(1, work))
+    second = asyncio.create_task(flight.do(1, work))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+
+    assert await second == 42
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_waiter():
+    flight = SingleFlight(fresh_for=30)
+
+    async def work():
+        await asyncio.sleep(0)
+        raise RuntimeError("github down")
+
+    results = await asyncio.gather(flight.do(1, work), flight.do(1, work), return_exceptions=True)
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert flight.stats()["executions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_profile_coalesces_per_user():
+    harvester = SocialHarvester()
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_sync(user_id, token):
+        started.set()
+        await release.wait()
+        return True
+
+    with patch.object(harvester, "_sync_profile", side_effect=slow_sync) as inner:
+        calls = [asyncio.create_task(harvester.sync_profile(7, "token")) for _ in range(3)]
+        await started.wait()
+        release.set()
+        assert await asyncio.gather(*calls) == [True, True, True]
+        # Seconds later: served from the freshness window
+        assert await harvester.sync_profile(7, "token") is True
+
+    assert inner.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_sync_profile_skips_harvest_synced_by_another_worker():
+    harvester = SocialHarvester()
+    recent = (datetime.utcnow() - timedelta(seconds=5)).isoformat()
+
+    with patch("asyncio.to_thread", new_callable=AsyncMock, return_value=("Backend", recent)), \
+         patch.object(harvester, "_harvest_github_raw", new_callable=AsyncMock) as harvest:
+        assert await harvester.sync_profile(1, "token") is True
+
+    harvest.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_advisory_lock_is_a_no_op_without_postgres():
+    assert lock_id("sync_profile:1") == lock_id("sync_profile:1") != lock_id("sync_profile:2")
+    async with advisory_lock("sync_profile:1") as held:
+        assert held is False
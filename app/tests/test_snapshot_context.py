@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.db.models.user import User
+from app.db.models.career import CareerProfile
+from app.db.models.analytics import RiskSnapshot
+from app.services.snapshot_context import RiskSnapshotContext
+from app.services.benchmark_engine import benchmark_engine
+from app.services.team_health_engine import team_health_engine
+from app.services.alert_engine import alert_engine
+from app.services.team_aggregates import team_aggregate_store
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.create_all(bind=engine)
+    team_aggregate_store.invalidate()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+
+
+def _add_user(db, email, team, scores):
+    user = User(email=email, hashed_password="x")
+    db.add(user)
+    db.commit()
+    db.add(CareerProfile(user_id=user.id, team=team))
+    base = datetime(2026, 1, 1)
+    for i, score in enumerate(scores):
+        db.add(RiskSnapshot(
+            user_id=user.id,
+            risk_score=score,
+            risk_level="HIGH" if score >= 60 else "LOW",
+            recorded_at=base + timedelta(days=i)
+        ))
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def test_load_window_is_newest_first(db_session):
+    user = _add_user(db_session, "me@example.com", None, list(range(20)))
+
+    ctx = RiskSnapshotContext.load(db_session, user)
+
+    assert len(ctx.snapshots) == RiskSnapshotContext.DEFAULT_WINDOW
+    assert ctx.latest.risk_score == 19
+    assert [s.risk_score for s in ctx.recent(3)] == [19, 18, 17]
+    # Chronological order for the LSTM window
+    assert ctx.risk_series(4) == [16, 17, 18, 19]
+    assert ctx.team_latest_scores() == {}
+
+
+def test_team_view_keeps_latest_score_per_member(db_session):
+    me = _add_user(db_session, "me@example.com", "Core", [70, 30])
+    _add_user(db_session, "peer@example.com", "Core", [90, 50])
+    _add_user(db_session, "other@example.com", "Infra", [10])
+
+    ctx = RiskSnapshotContext.load(db_session, me)
+
+    assert sorted(ctx.team_latest_scores().values()) == [30, 50]
+    assert ctx.team.count == 2
+    assert ctx.team.total == 80
+
+
+def test_team_aggregate_follows_committed_scores(db_session):
+    me = _add_user(db_session, "me@example.com", "Core", [70])
+    peer = _add_user(db_session, "peer@example.com", "Core", [50])
+
+    first = RiskSnapshotContext.load(db_session, me).team
+    assert first.min_score == 50
+
+    db_session.add(RiskSnapshot(
+        user_id=peer.id, risk_score=90, recorded_at=datetime(2026, 2, 1)
+    ))
+    db_session.commit()
+
+    second = RiskSnapshotContext.load(db_session, me).team
+    assert second.members == {me.id: 70, peer.id: 90}
+    assert (second.min_score, second.second_min) == (70, 90)
+    # Aggregates handed out earlier are never mutated
+    assert first.members == {me.id: 70, peer.id: 50}
+
+
+def test_engines_share_one_load_per_request(db_session):
+    me = _add_user(db_session, "me@example.com", "Core", [70, 30])
+    _add_user(db_session, "peer@example.com", "Core", [50])
+
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        if "risk_snapshots" in statement or "latest_risk" in statement:
+            statements.append(statement)
+
+    ctx = RiskSnapshotContext.load(db_session, me)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        history = benchmark_engine.get_user_history(db_session, me, snapshots=ctx)
+        health = benchmark_engine.compute_team_health(db_session, me, snapshots=ctx)
+        burnout = team_health_engine.team_burnout_risk(db_session, me, snapshots=ctx)
+        exit_sim = team_health_engine.simulate_member_exit(db_session, me, snapshots=ctx)
+        hire_sim = team_health_engine.simulate_new_hire(db_session, me, snapshots=ctx)
+        changed = alert_engine.detect_state_change(db_session, me, "LOW", snapshots=ctx)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert statements == []
+    assert history["values"] == [70, 30]
+    assert health["member_count"] == 2
+    # Burnout reads each member's latest score: (30 + 50) / 2
+    assert burnout["avg_risk"] == 40
+    assert exit_sim["anchor_score"] == 30
+    assert hire_sim["current_avg"] == 40
+    assert changed is False
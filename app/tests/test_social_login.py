@@ -94,13 +94,13 @@ async def test_linkedin_callback_success(client, db_session):
     # Patch fetch_access_token (Bypassing authorize_access_token wrapper)
     # AND userinfo
     # AND hash_password to avoid bcrypt issues
-    # AND social_harvester to avoid DB access in background task
+    # AND job_queue to avoid queueing the harvest jobs
     # AND settings to ensure DOMAIN matches test expectation
     with patch('app.routes.social.oauth.linkedin.fetch_access_token', new_callable=AsyncMock) as mock_fetch, \
          patch('app.routes.social.oauth.linkedin.userinfo', new_callable=AsyncMock) as mock_userinfo, \
          patch('app.routes.social.hash_password', return_value="mock_hashed_pwd") as mock_hash, \
          patch('app.routes.social.SessionLocal', mock_session_cls), \
-         patch('app.routes.social.social_harvester') as mock_harvester, \
+         patch('app.routes.social.job_queue') as mock_queue, \
          patch('app.routes.social.settings') as mock_settings:
 
         # Configure Mock Settings
@@ -233,11 +233,11 @@ async def test_github_connect_existing_user(client, db_session):
     session_proxy = MagicMock(wraps=db_session)
     session_proxy.close = MagicMock()
 
-    # Need to patch social_harvester to avoid DB issues in background task
+    # Need to patch job_queue to avoid queueing the harvest jobs
     with patch('app.routes.social.oauth.github.fetch_access_token', new_callable=AsyncMock) as mock_fetch, \
          patch('app.routes.social.oauth.github.get', new_callable=AsyncMock) as mock_get, \
          patch("app.middleware.auth.SessionLocal", return_value=session_proxy), \
-         patch('app.routes.social.social_harvester') as mock_harvester:
+         patch('app.routes.social.job_queue') as mock_queue:
 
         mock_fetch.return_value = mock_token
 
@@ -0,0 +1,114 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.stage_graph import Stage, StageGraph
+from app.db.base import Base
+from app.db.models.user import User
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'stages.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_stages_receive_their_declared_inputs_in_order():
+    calls = []
+
+    def record(name, value):
+        calls.append(name)
+        return value
+
+    graph = StageGraph([
+        Stage("b", lambda db, a: record("b", a + 1), ("a",)),
+        Stage("c", lambda db, b: record("c", b * 10), ("b",)),
+        Stage("d", lambda db, x: record("d", x), ("x",), after=("c",)),
+    ])
+
+    run = graph.run(MagicMock(), {"a": 1, "x": "seed"})
+
+    assert run.results["b"] == 2
+    assert run.results["c"] == 20
+    assert run.results["d"] == "seed"
+    assert calls == ["b", "c", "d"]
+    assert set(run.timings) == {"b", "c", "d"}
+
+
+def test_unresolvable_dependencies_raise():
+    graph = StageGraph([Stage("b", lambda db, missing: missing, ("missing",))])
+
+    with pytest.raises(ValueError, match="missing"):
+        graph.run(MagicMock(), {})
+
+
+def test_duplicate_stage_names_are_rejected():
+    with pytest.raises(ValueError):
+        StageGraph([
+            Stage("a", lambda db: 1),
+            Stage("a", lambda db: 2),
+        ])
+
+
+def test_isolated_stages_run_inline_for_mock_sessions():
+    db = MagicMock()
+    seen = []
+    graph = StageGraph([
+        Stage("slow", lambda db: seen.append(db) or "ok", isolated=True),
+    ])
+
+    run = graph.run(db, {})
+
+    assert run.results["slow"] == "ok"
+    assert seen == [db]
+
+
+def test_isolated_stages_run_concurrently_with_own_sessions(file_db):
+    user = User(email="stages@example.com", hashed_password="x")
+    file_db.add(user)
+    file_db.commit()
+
+    sessions = []
+
+    def slow_read(db, user):
+        sessions.append(db)
+        time.sleep(0.2)
+        return user.email
+
+    graph = StageGraph(
+        [Stage(f"read_{i}", slow_read, ("user",), isolated=True) for i in range(4)],
+        max_workers=4
+    )
+
+    started = time.perf_counter()
+    run = graph.run(file_db, {"user": user})
+    elapsed = time.perf_counter() - started
+
+    # Four 200ms stages finish in roughly the time of one
+    assert elapsed < 0.6
+    assert all(run.results[f"read_{i}"] == "stages@example.com" for i in range(4))
+    assert all(run.timings[f"read_{i}"] >= 200 for i in range(4))
+    # Each isolated stage got its own session, never the request session
+    assert len({id(s) for s in sessions}) == 4
+    assert file_db not in sessions
+
+
+def test_isolated_stage_errors_propagate(file_db):
+    def boom(db):
+        raise RuntimeError("stage failed")
+
+    graph = StageGraph([Stage("boom", boom, isolated=True)])
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        graph.run(file_db, {})
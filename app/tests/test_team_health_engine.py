@@ -9,6 +9,13 @@ from app.db.models.analytics import RiskSnapshot
 
 # Import the service
 from app.services.team_health_engine import team_health_engine
+from app.services.snapshot_context import RiskSnapshotContext
+from app.services.team_aggregates import TeamAggregate
+
+
+def make_team(raw_data):
+    """Snapshot context whose team aggregate holds the given (user_id, score) rows."""
+    return RiskSnapshotContext(user_id=1, snapshots=[], team=TeamAggregate(dict(raw_data)))
 
 def test_team_burnout_risk():
     db = MagicMock()
@@ -23,18 +30,13 @@ def test_team_burnout_risk():
 
     scores = [20, 30, 40, 80, 90]
 
-    # Mocking the query chain
-    # db.query().join().filter().order_by().limit().all()
-    mock_query = db.query.return_value
-    mock_join = mock_query.join.return_value
-    mock_filter = mock_join.filter.return_value
-    mock_order = mock_filter.order_by.return_value
-    mock_limit = mock_order.limit.return_value
+    # Latest score per member comes from the team aggregate: (user_id, risk_score)
+    snapshots = make_team(enumerate(scores))
 
-    # Return list of tuples (risk_score,)
-    mock_limit.all.return_value = [(s,) for s in scores]
+    result = team_health_engine.team_burnout_risk(db, user, snapshots=snapshots)
 
-    result = team_health_engine.team_burnout_risk(db, user)
+    # No extra query is issued when the context is provided
+    db.query.assert_not_called()
 
     assert result is not None
     assert result['avg_risk'] == 52
@@ -62,14 +64,7 @@ def test_simulate_member_exit():
         (3, 60)
     ]
 
-    # Mock query chain
-    mock_query = db.query.return_value
-    mock_join = mock_query.join.return_value
-    mock_filter = mock_join.filter.return_value
-    mock_order = mock_filter.order_by.return_value
-    mock_order.all.return_value = raw_data
-
-    result = team_health_engine.simulate_member_exit(db, user)
+    result = team_health_engine.simulate_member_exit(db, user, snapshots=make_team(raw_data))
 
     assert result is not None
     assert result['current_avg'] == 40
@@ -97,16 +92,41 @@ def test_simulate_member_exit_duplicate_anchor():
         (3, 70)
     ]
 
-    mock_query = db.query.return_value
-    mock_join = mock_query.join.return_value
-    mock_filter = mock_join.filter.return_value
-    mock_order = mock_filter.order_by.return_value
-    mock_order.all.return_value = raw_data
-
-    result = team_health_engine.simulate_member_exit(db, user)
+    result = team_health_engine.simulate_member_exit(db, user, snapshots=make_team(raw_data))
 
     assert result is not None
     assert result['current_avg'] == 30
     assert result['new_avg_if_exit'] == 40
     assert result['impact'] == 10
     assert result['anchor_score'] == 10
+
+
+def test_team_metrics_share_one_aggregate():
+    db = MagicMock()
+    user = MagicMock()
+    user.id = 2
+    user.career_profile.team = "Engineering"
+    snapshots = make_team([(1, 10), (2, 50), (3, 60)])
+
+    metrics = team_health_engine.team_metrics(db, user, snapshots=snapshots)
+
+    db.query.assert_not_called()
+    assert metrics["team_burnout"] == team_health_engine.team_burnout_risk(db, user, snapshots=snapshots)
+    assert metrics["exit_simulation"]["new_avg_if_exit"] == 55
+    assert metrics["hire_simulation"]["new_avg_with_hire"] == 35
+    assert [r["user_id"] for r in metrics["ranking"]] == [1, 2, 3]
+    assert metrics["ranking"][1]["is_current_user"] is True
+
+
+def test_team_aggregate_tracks_two_smallest_on_updates():
+    team = TeamAggregate({1: 10, 2: 10, 3: 70})
+    assert (team.min_score, team.second_min) == (10, 10)
+
+    team.add(1, 80)   # member's new latest score replaces the old one
+    assert team.count == 3
+    assert (team.min_score, team.second_min) == (10, 70)
+
+    team.remove(2)
+    assert (team.min_score, team.second_min) == (70, 80)
+    assert team.mean == 75
+    assert team.pstdev == pstdev([70, 80])
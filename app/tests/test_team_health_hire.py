@@ -8,6 +8,13 @@ from app.db.models.analytics import RiskSnapshot
 
 # Import the service
 from app.services.team_health_engine import team_health_engine
+from app.services.snapshot_context import RiskSnapshotContext
+from app.services.team_aggregates import TeamAggregate
+
+
+def make_team(raw_data):
+    """Snapshot context whose team aggregate holds the given (user_id, score) rows."""
+    return RiskSnapshotContext(user_id=1, snapshots=[], team=TeamAggregate(dict(raw_data)))
 
 def test_simulate_new_hire():
     db = MagicMock()
@@ -26,13 +33,9 @@ def test_simulate_new_hire():
         (2, 60)
     ]
 
-    mock_query = db.query.return_value
-    mock_join = mock_query.join.return_value
-    mock_filter = mock_join.filter.return_value
-    mock_order = mock_filter.order_by.return_value
-    mock_order.all.return_value = raw_data
-
-    result = team_health_engine.simulate_new_hire(db, user, hypothetical_risk=20)
+    result = team_health_engine.simulate_new_hire(
+        db, user, hypothetical_risk=20, snapshots=make_team(raw_data)
+    )
 
     assert result is not None
     assert result['current_avg'] == 55
@@ -46,14 +49,8 @@ def test_simulate_new_hire_empty_team():
     user = MagicMock()
     user.career_profile.team = "Engineering"
 
-    # Return empty list
-    mock_query = db.query.return_value
-    mock_join = mock_query.join.return_value
-    mock_filter = mock_join.filter.return_value
-    mock_order = mock_filter.order_by.return_value
-    mock_order.all.return_value = []
-
-    result = team_health_engine.simulate_new_hire(db, user)
+    # Empty team
+    result = team_health_engine.simulate_new_hire(db, user, snapshots=make_team([]))
 
     assert result is None
 
@@ -71,13 +68,9 @@ def test_simulate_new_hire_single_user():
         (1, 80)
     ]
 
-    mock_query = db.query.return_value
-    mock_join = mock_query.join.return_value
-    mock_filter = mock_join.filter.return_value
-    mock_order = mock_filter.order_by.return_value
-    mock_order.all.return_value = raw_data
-
-    result = team_health_engine.simulate_new_hire(db, user, hypothetical_risk=20)
+    result = team_health_engine.simulate_new_hire(
+        db, user, hypothetical_risk=20, snapshots=make_team(raw_data)
+    )
 
     assert result is not None
     assert result['current_avg'] == 80
@@ -0,0 +1,166 @@
+import json
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.db.models.mentor import MentorMemory
+from app.db.models.user import User
+from app.services.embedding_codec import decode
+from app.services.memory_embedder import MemoryEmbedder
+from app.services.mentor_engine import MentorEngine
+from app.services.vector_index import MemoryVectorIndex
+
+engine = create_engine(
+    "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+DIM = 16
+
+
+def _unit(rng):
+    v = rng.standard_normal(DIM)
+    return (v / np.linalg.norm(v)).tolist()
+
+
+@pytest.fixture
+def setup(tmp_path):
+    Base.metadata.create_all(bind=engine)
+    db = TestingSessionLocal()
+    user = User(id=1, email="me@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    index = MemoryVectorIndex(str(tmp_path))
+    with patch("app.services.mentor_engine.memory_index", index):
+        yield db, user, index
+    db.close()
+    Base.metadata.drop_all(bind=engine)
+
+
+def _store_all(db, user, index, vectors, categories):
+    mentor = MentorEngine()
+    by_content = {}
+    for i, (vector, category) in enumerate(zip(vectors, categories)):
+        mentor.store(db, user, category, f"memory {i}", context_key=f"key{i % 3}")
+        by_content[f"memory {i}"] = vector
+    # Embeddings are filled in by the background embedder
+    embedder = MemoryEmbedder(
+        embed=lambda texts: [by_content[t] for t in texts],
+        session_factory=TestingSessionLocal,
+        index=index
+    )
+    embedder.drain()
+    return mentor
+
+
+def test_recall_matches_brute_force_with_filters(setup):
+    db, user, index = setup
+    rng = np.random.default_rng(3)
+    vectors = [_unit(rng) for _ in range(40)]
+    categories = ["PROACTIVE" if i % 2 else "ADVICE" for i in range(40)]
+    mentor = _store_all(db, user, index, vectors, categories)
+    query = _unit(rng)
+
+    scores = np.array(vectors) @ np.array(query)
+    expected = [f"memory {i}" for i in np.argsort(-scores)[:5]]
+    assert mentor.recall_semantic(db, user, query, limit=5) == expected
+
+    advice = [i for i in np.argsort(-scores) if categories[i] == "ADVICE" and i % 3 == 1][:3]
+    assert mentor.recall_semantic(db, user, query, limit=3, category="ADVICE", context_key="key1") == \
+        [f"memory {i}" for i in advice]
+    assert mentor.recall_semantic(db, user, query, category="MISSING") == []
+    assert len(index.snapshot(user.id).meta) == 40
+
+
+def test_sync_indexes_memories_written_without_the_index(setup):
+    db, user, index = setup
+    rng = np.random.default_rng(5)
+    vectors = [_unit(rng) for _ in range(3)]
+    # Pre-existing rows (legacy JSON payloads) and a context memory without embedding
+    for i, vector in enumerate(vectors):
+        db.add(MentorMemory(user_id=user.id, context_key="PROACTIVE", memory_value=json.dumps(
+            {"content": f"old {i}", "category": "PROACTIVE", "embedding": vector}
+        )))
+    db.add(MentorMemory(user_id=user.id, context_key="lang", memory_value=json.dumps(
+        {"content": "pt-BR", "category": "CONTEXT"}
+    )))
+    db.commit()
+
+    assert MentorEngine().recall_semantic(db, user, vectors[2], limit=1) == ["old 2"]
+    snapshot = index.snapshot(user.id)
+    assert snapshot.meta["id"].tolist() == [1, 2, 3]
+    assert index.sync(db, user.id) is snapshot     # nothing new: no rescan, no remap
+
+
+def test_deleted_memories_are_dropped_and_index_rebuilt(setup):
+    db, user, index = setup
+    rng = np.random.default_rng(9)
+    vectors = [_unit(rng) for _ in range(6)]
+    mentor = _store_all(db, user, index, vectors, ["ADVICE"] * 6)
+    query = vectors[0]
+
+    best = np.argsort(-(np.array(vectors) @ np.array(query)))
+    doomed = [int(i) + 1 for i in best[:4]]
+    db.query(MentorMemory).filter(MentorMemory.id.in_(doomed)).delete(synchronize_session=False)
+    db.commit()
+
+    assert mentor.recall_semantic(db, user, query, limit=2) == [f"memory {i}" for i in best[4:6]]
+    assert sorted(index.snapshot(user.id).meta["id"].tolist()) == sorted(int(i) + 1 for i in best[4:6])
+
+
+def test_torn_append_is_discarded(setup):
+    _, _, index = setup
+    rng = np.random.default_rng(1)
+    index.add(1, 10, _unit(rng), "A")
+    vec_path, _ = index._paths(1)
+    with open(vec_path, "ab") as f:
+        f.write(b"\x00" * 7)                        # crash between the two writes
+    last = _unit(rng)
+    assert index.add(1, 11, last, "A")
+    assert not index.add(1, 11, last, "A")          # already indexed
+
+    snapshot = index.snapshot(1)
+    assert snapshot.meta["id"].tolist() == [10, 11]
+    np.testing.assert_allclose(snapshot.vectors[1], last, rtol=1e-6)
+    assert index.search(snapshot, last, 1) == [(11, pytest.approx(1.0, rel=1e-5))]
+
+
+def test_torn_meta_append_is_discarded(setup):
+    _, _, index = setup
+    rng = np.random.default_rng(2)
+    index.add(1, 10, _unit(rng), "A")
+    _, meta_path = index._paths(1)
+    with open(meta_path, "ab") as f:
+        f.write(b"\x00" * 5)                        # crash mid-way through the meta write
+    assert index.add(1, 11, _unit(rng), "B")
+
+    snapshot = index.snapshot(1)
+    assert snapshot.meta["id"].tolist() == [10, 11]
+    assert index.search(snapshot, snapshot.vectors[1], 1, category="B")[0][0] == 11
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 0), ("float16", 1e-3), ("int8", 1e-2)])
+def test_embeddings_are_stored_as_binary(setup, dtype, tolerance):
+    db, user, index = setup
+    rng = np.random.default_rng(11)
+    vectors = [_unit(rng) for _ in range(8)]
+    with patch("app.services.memory_embedder.settings.MENTOR_EMBEDDING_DTYPE", dtype):
+        mentor = _store_all(db, user, index, vectors, ["ADVICE"] * 8)
+
+    row = db.query(MentorMemory).first()
+    assert "embedding" not in json.loads(row.memory_value)
+    assert row.embedding_dtype == dtype
+    stored = decode(row.embedding, row.embedding_dtype)
+    np.testing.assert_allclose(stored, vectors[0], atol=tolerance)
+    if dtype != "int8":
+        assert not stored.flags.owndata          # view over the column bytes
+
+    assert mentor.recall_semantic(db, user, vectors[5], limit=1) == ["memory 5"]
+    # A rebuilt index reads the same vectors back from the column
+    index.rebuild(db, user.id)
+    assert mentor.recall_semantic(db, user, vectors[5], limit=1) == ["memory 5"]
@@ -11,6 +11,7 @@ os.environ["GITHUB_CLIENT_ID"] = "dummy-client-id"
 os.environ["GITHUB_CLIENT_SECRET"] = "dummy-client-secret"
 os.environ["LINKEDIN_CLIENT_ID"] = "dummy-li-client-id"
 os.environ["LINKEDIN_CLIENT_SECRET"] = "dummy-li-client-secret"
+os.environ["GITHUB_CACHE_PATH"] = ":memory:"
 
 # Add the project root to the python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
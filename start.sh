@@ -3,5 +3,10 @@
 # Run migrations
 alembic upgrade head
 
+# Harvest queue consumer (GitHub/LinkedIn syncs queued by the OAuth callbacks),
+# restarted if it exits; the app workers then leave the queue to it
+export HARVEST_WORKER_EMBEDDED=false
+(while true; do python -m app.jobs.harvest_worker; echo "harvest worker exited, restarting"; sleep 5; done) &
+
 # Start Uvicorn
 exec uvicorn app.main:app --host 0.0.0.0 --port ${PORT:-8080} --workers 4
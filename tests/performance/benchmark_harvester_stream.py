@@ -40,35 +40,65 @@ async def generate_stream(size_mb: int, keywords: list):
         yield chunk
         generated += len(chunk)
 
-async def benchmark_stream():
-    harvester = SocialHarvester()
-    filename = "package.json"
-    keyword_map = harvester.scan_deps_map_bytes[filename]
-
-    content_size = 50
-    test_keywords = ["react", "vue", "next"]
-
-    logger.info("Running optimization: _check_keywords_in_stream (Streaming)")
-
-    start_mem = tracemalloc.get_traced_memory()[1]
-
-    t0 = time.time()
+async def legacy_check_keywords_in_stream(stream, keyword_map):
+    """Previous implementation: buffer + chunk copy and one `in` scan per keyword."""
+    found = set()
+    max_len = max(len(k) for k in keyword_map.keys())
+    overlap_size = max_len - 1
+    buffer = b""
+    async for chunk in stream:
+        data = buffer + chunk
+        content_lower = data.lower()
+        for kw_bytes, original_kw in keyword_map.items():
+            if kw_bytes in content_lower:
+                found.add(original_kw)
+        buffer = data[-overlap_size:] if len(data) > overlap_size else data
+    return list(found)
+
+async def generate_manifest_stream(size_mb: int, keywords: list):
+    """Manifest-like text (package names, versions) with the keywords near the end."""
+    chunk_size = 64 * 1024
+    total_bytes = size_mb * 1024 * 1024
+    words = [b'"lodash": "^4.17.21"', b'"webpack": "5.0"', b"babel-core", b"eslint", b"jest", b"Mocha", b"AXIOS"]
+    line = b",\n  ".join(words) + b",\n  "
+    base_chunk = (line * (chunk_size // len(line) + 1))[:chunk_size]
+    generated = 0
+    while generated < total_bytes:
+        chunk = base_chunk
+        if generated + chunk_size >= total_bytes:
+            chunk = base_chunk[:-200] + b" ".join(k.encode("utf-8") for k in keywords).ljust(200)
+        yield chunk
+        generated += len(chunk)
 
-    # We measure memory *during* the process
-    # But tracemalloc tracks peak since start.
+async def measure(label, scan, stream, keyword_map):
     tracemalloc.reset_peak()
-
-    stream = generate_stream(content_size, test_keywords)
-    found = await harvester._check_keywords_in_stream(stream, keyword_map)
-
+    t0 = time.time()
+    found = await scan(stream, keyword_map)
     duration = time.time() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    logger.info(f"  {label:<10} Time: {duration:.4f}s  Peak Memory: {peak / 1024 / 1024:.2f} MB  Found: {sorted(found)}")
+    return duration
 
-    current, peak = tracemalloc.get_traced_memory()
+async def benchmark_stream():
+    harvester = SocialHarvester()
+    content_size = 50
 
-    logger.info(f"Stream Results:")
-    logger.info(f"  Time: {duration:.4f}s")
-    logger.info(f"  Peak Memory: {peak / 1024 / 1024:.2f} MB")
-    logger.info(f"  Found: {len(found)} keywords")
+    # Every manifest of SCAN_DEPS_FILES, plus all their keywords at once
+    # (the cost of the old scan grows with the keyword count)
+    keyword_maps = dict(harvester.scan_deps_map_bytes)
+    keyword_maps["all manifests"] = {
+        kw: original for file_map in harvester.scan_deps_map_bytes.values() for kw, original in file_map.items()
+    }
+
+    for filename, keyword_map in keyword_maps.items():
+        test_keywords = list(keyword_map.values())[:3]
+        for input_name, generator in (("synthetic", generate_stream), ("manifest", generate_manifest_stream)):
+            logger.info(f"{filename} ({len(keyword_map)} keywords), {content_size}MB {input_name} input:")
+            legacy = await measure("legacy", legacy_check_keywords_in_stream,
+                                   generator(content_size, test_keywords), keyword_map)
+            matcher = await measure("matcher", harvester._check_keywords_in_stream,
+                                    generator(content_size, test_keywords), keyword_map)
+            logger.info(f"  speedup: {legacy / matcher:.1f}x")
 
 if __name__ == "__main__":
     tracemalloc.start()
@@ -2,7 +2,7 @@ import asyncio
 import time
 import sys
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Set required environment variables before importing app modules
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
@@ -53,13 +53,12 @@ async def run_benchmark():
     print(">>> Calling diagnostics() endpoint logic...")
     start_time = time.time()
 
-    # We need to patch 'app.routes.monitoring.httpx.AsyncClient' to avoid real network calls
+    # We need to patch 'app.routes.monitoring.http_pool' to avoid real network calls
     # AND patch 'app.routes.monitoring.SessionLocal' to use our mock
-    with patch("app.routes.monitoring.httpx.AsyncClient") as mock_client_cls, \
+    with patch("app.routes.monitoring.http_pool") as mock_pool, \
          patch("app.routes.monitoring.SessionLocal", return_value=mock_db_session):
 
-        mock_client = mock_client_cls.return_value.__aenter__.return_value
-        mock_client.get.return_value.status_code = 200
+        mock_pool.client.get = AsyncMock(return_value=MagicMock(status_code=200))
 
         # Run the endpoint
         # No arguments needed now as we removed Depends(get_db)
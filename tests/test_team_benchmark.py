@@ -1,8 +1,16 @@
 import unittest
 from unittest.mock import MagicMock
 from app.services.benchmark_engine import BenchmarkEngine
-from app.db.models.career import CareerProfile
-from app.db.models.analytics import RiskSnapshot
+from app.services.snapshot_context import RiskSnapshotContext, SnapshotRecord
+
+
+def make_snapshots(*scores):
+    """Per-request snapshot context with the given user scores (newest first)."""
+    return RiskSnapshotContext(
+        user_id=1,
+        snapshots=[SnapshotRecord(s, None, None, None) for s in scores]
+    )
+
 
 class TestTeamBenchmark(unittest.TestCase):
     def setUp(self):
@@ -23,37 +31,20 @@ class TestTeamBenchmark(unittest.TestCase):
         self.mock_profile.organization = "OrgA"
         self.mock_profile.team = "TeamA"
 
-        def query_side_effect(*args):
-            if args[0] is RiskSnapshot:
-                mock_q = MagicMock()
-                mock_q.filter.return_value.order_by.return_value.first.return_value = None
-                return mock_q
-            return MagicMock()
-
-        self.mock_db.query.side_effect = query_side_effect
-
-        result = self.engine.compute_team_org(self.mock_db, self.mock_user)
+        result = self.engine.compute_team_org(
+            self.mock_db, self.mock_user, snapshots=make_snapshots()
+        )
         self.assertIsNone(result)
+        self.mock_db.query.assert_not_called()
 
     def test_compute_team_org_no_team_no_org(self):
         # Setup: User has no team/org
         self.mock_profile.organization = None
         self.mock_profile.team = None
 
-        # Mock snapshot
-        latest_snapshot = MagicMock()
-        latest_snapshot.risk_score = 50
-
-        def query_side_effect(*args):
-            if args[0] is RiskSnapshot:
-                mock_q = MagicMock()
-                mock_q.filter.return_value.order_by.return_value.first.return_value = latest_snapshot
-                return mock_q
-            return MagicMock()
-
-        self.mock_db.query.side_effect = query_side_effect
-
-        result = self.engine.compute_team_org(self.mock_db, self.mock_user)
+        result = self.engine.compute_team_org(
+            self.mock_db, self.mock_user, snapshots=make_snapshots(50)
+        )
         self.assertIsNone(result)
 
     def test_compute_team_org_success(self):
@@ -61,25 +52,17 @@ class TestTeamBenchmark(unittest.TestCase):
         self.mock_profile.organization = "OrgA"
         self.mock_profile.team = "TeamA"
 
-        # Mock snapshot (My risk = 30)
-        latest_snapshot = MagicMock()
-        latest_snapshot.risk_score = 30
-
-        def query_side_effect(*args):
-            if args[0] is RiskSnapshot:
-                mock_q = MagicMock()
-                mock_q.filter.return_value.order_by.return_value.first.return_value = latest_snapshot
-                return mock_q
-            else:
-                 mock_q = MagicMock()
-                 mock_q.join.return_value.filter.return_value.filter.return_value.all.return_value = [
-                     (10,), (30,), (80,)
-                 ]
-                 return mock_q
-
-        self.mock_db.query.side_effect = query_side_effect
+        # Cohort load from latest_risk: (user_id, risk_score)
+        mock_q = MagicMock()
+        mock_q.filter.return_value.filter.return_value.all.return_value = [
+            (1, 30), (2, 10), (3, 80)
+        ]
+        self.mock_db.query.return_value = mock_q
 
-        result = self.engine.compute_team_org(self.mock_db, self.mock_user)
+        # My risk = 30
+        result = self.engine.compute_team_org(
+            self.mock_db, self.mock_user, snapshots=make_snapshots(30)
+        )
 
         self.assertIsNotNone(result)
         self.assertEqual(result['percentile'], 66)
@@ -91,25 +74,16 @@ class TestTeamBenchmark(unittest.TestCase):
         self.mock_profile.organization = "OrgB"
         self.mock_profile.team = "TeamB"
 
-        latest_snapshot = MagicMock()
-        latest_snapshot.risk_score = 50
-
-        def query_side_effect(*args):
-            if args[0] is RiskSnapshot:
-                mock_q = MagicMock()
-                mock_q.filter.return_value.order_by.return_value.first.return_value = latest_snapshot
-                return mock_q
-            else:
-                 mock_q = MagicMock()
-                 # Only me
-                 mock_q.join.return_value.filter.return_value.filter.return_value.all.return_value = [
-                     (50,)
-                 ]
-                 return mock_q
+        mock_q = MagicMock()
+        # Only me
+        mock_q.filter.return_value.filter.return_value.all.return_value = [
+            (1, 50)
+        ]
+        self.mock_db.query.return_value = mock_q
 
-        self.mock_db.query.side_effect = query_side_effect
-
-        result = self.engine.compute_team_org(self.mock_db, self.mock_user)
+        result = self.engine.compute_team_org(
+            self.mock_db, self.mock_user, snapshots=make_snapshots(50)
+        )
         self.assertEqual(result['percentile'], 100)
 
 if __name__ == '__main__':